@@ -0,0 +1,86 @@
+"""
+Candidate search latency over a synthetic pool of analysed resumes.
+
+Bulk-loads N resumes (default 1,000,000) with 5-15 skills each, drawn with a
+skewed popularity from COMMON_SKILLS, into an in-memory CandidateIndex, then
+times boolean queries, incremental inserts and deletes.
+
+Run from backend/:  python -m benchmarks.bench_candidate_index [--docs N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from utils.candidate_index import CandidateIndex
+from utils.nlp_utils import COMMON_SKILLS
+
+QUERIES = [
+    "python",
+    "python AND docker AND kubernetes",
+    "(react OR angular OR vue) AND NOT php",
+    '"machine learning" AND (pytorch OR tensorflow) AND NOT java',
+    "sql OR mysql OR postgresql OR mongodb",
+]
+
+
+def synthetic_pool(n_docs: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    n_skills = len(COMMON_SKILLS)
+    popularity = 1.0 / np.arange(1, n_skills + 1) ** 0.8
+    popularity /= popularity.sum()
+
+    per_doc = rng.integers(5, 16, size=n_docs)
+    docs = np.repeat(np.arange(n_docs, dtype=np.uint32), per_doc)
+    skill_ids = rng.choice(n_skills, size=len(docs), p=popularity)
+    # drop duplicate (doc, skill) pairs
+    pairs = np.sort(docs.astype(np.int64) * n_skills + skill_ids)
+    pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+    docs = (pairs // n_skills).astype(np.uint32)
+    skills = np.array(COMMON_SKILLS, dtype=object)[pairs % n_skills]
+    confs = rng.integers(40, 101, size=len(pairs))
+    ats = rng.integers(20, 100, size=n_docs)
+    return docs, skills, confs, ats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    docs, skills, confs, ats = synthetic_pool(args.docs)
+    index = CandidateIndex(db_path=None)
+    index.load_arrays(
+        [f"r{i}" for i in range(args.docs)],
+        [(f"r{i}.pdf", None, None) for i in range(args.docs)],
+        ats, skills, docs, confs,
+    )
+    print(f"loaded {args.docs:,} resumes / {len(docs):,} postings in {time.perf_counter() - t0:.1f}s")
+
+    print(f"{'query':<72} {'matches':>9} {'best ms':>8}")
+    for query in QUERIES:
+        for rank in ("confidence", "ats"):
+            best = float("inf")
+            for _ in range(args.repeats):
+                t0 = time.perf_counter()
+                result = index.search(query, rank=rank, top_k=20)
+                best = min(best, time.perf_counter() - t0)
+            label = f"{query} [{rank}]"
+            print(f"{label:<72} {result['total_matches']:>9,} {best * 1000:>8.1f}")
+
+    t0 = time.perf_counter()
+    for i in range(10_000):
+        index.add(f"new{i}", "new.pdf", [{"skill": "python", "confidence": 80}, {"skill": "docker", "confidence": 60}], {}, 70)
+    print(f"insert: {(time.perf_counter() - t0) / 10_000 * 1e6:.1f} us/resume")
+
+    t0 = time.perf_counter()
+    for i in range(10_000):
+        index.delete(f"r{i}")
+    print(f"delete: {(time.perf_counter() - t0) / 10_000 * 1e6:.1f} us/resume")
+
+
+if __name__ == "__main__":
+    main()
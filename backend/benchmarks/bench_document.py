@@ -0,0 +1,104 @@
+"""
+End-to-end feature extraction: repeated string scans vs one AnalysedDocument.
+
+"legacy" reproduces the previous flow (normalize_text, four entity findalls,
+a fresh lowercase for skills, four education searches, formatting re.sub +
+splitlines + non-ASCII findall). "document" runs the same extractors on a
+shared AnalysedDocument. Job matching is excluded; it is identical in both.
+
+Run from backend/:  python -m benchmarks.bench_document
+"""
+
+import argparse
+import re
+import time
+
+from utils.document import AnalysedDocument
+from utils.nlp_utils import SKILL_MATCHER, normalize_text, extract_basic_entities, extract_skills
+from utils.ats_scoring import calculate_ats_score
+
+
+def _legacy_entities(text):
+    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    phones = re.findall(r'\+?\d[\d\s\-]{8,}\d', text)
+    persons = re.findall(r'\b[A-Z][a-z]+\s[A-Z][a-z]+\b', text)
+    organizations = [w for w in re.findall(r'\b[A-Z][A-Z]+\b', text) if len(w) > 2]
+    dedupe = lambda lst: list(dict.fromkeys(lst))
+    return {"persons": dedupe(persons), "organizations": dedupe(organizations),
+            "emails": dedupe(emails), "phones": dedupe(phones)}
+
+
+def _legacy_skills(text):
+    found = SKILL_MATCHER.scan(text.lower())
+    return [{"skill": k, "confidence": 40, "count": v["count"]} for k, v in found.items()]
+
+
+def _legacy_education(text):
+    t = text.lower()
+    if re.search(r'\b(phd|doctorate)\b', t):
+        return 1.0
+    if re.search(r'\b(master|msc|m\.sc|mtech|m\.tech|mba)\b', t):
+        return 1.0
+    if re.search(r'\b(bachelor|bsc|b\.sc|btech|b\.tech|bachelor of technology|bachelor of science)\b', t):
+        return 1.0
+    if re.search(r'\b(diploma|associate|certificate)\b', t):
+        return 0.6
+    return 0.0
+
+
+def _legacy_formatting(text):
+    clean = re.sub(r'\s+', ' ', text).strip()
+    words_count = len(clean.split())
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    short_lines = sum(1 for ln in lines if len(ln.split()) <= 3)
+    nonprintables = len(re.findall(r'[^\x00-\x7F]', text))
+    return words_count, short_lines, nonprintables
+
+
+def legacy_pipeline(raw):
+    text = normalize_text(raw)
+    entities = _legacy_entities(text)
+    skills = _legacy_skills(text)
+    _legacy_education(text)
+    _legacy_formatting(text)
+    return entities, skills
+
+
+def document_pipeline(raw):
+    doc = AnalysedDocument(raw)
+    entities = extract_basic_entities(doc)
+    skills = extract_skills(doc)
+    calculate_ats_score(skills, doc, entities)
+    return entities, skills
+
+
+def sample_resume(repeat: int) -> str:
+    with open("dummy_resume.txt", encoding="utf-8") as f:
+        base = f.read()
+    return "\n\n".join([base] * repeat)
+
+
+def cpu_ms(fn, raw, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.process_time()
+        fn(raw)
+        best = min(best, time.process_time() - t0)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'chars':>9} {'legacy ms':>10} {'document ms':>12} {'reduction':>10}")
+    for repeat in (10, 100, 1000):
+        raw = sample_resume(repeat)
+        legacy = cpu_ms(legacy_pipeline, raw, args.repeats)
+        fused = cpu_ms(document_pipeline, raw, args.repeats)
+        print(f"{len(raw):>9} {legacy:>10.2f} {fused:>12.2f} {1 - fused / legacy:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
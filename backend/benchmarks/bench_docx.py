@@ -0,0 +1,162 @@
+"""
+DOCX extraction: python-docx `Document` paragraphs vs the streaming zip/XML reader.
+
+Times both extractors (best-of-N CPU time and tracemalloc peak) on plain
+synthetic resumes of growing size, then compares what each recovers from
+template-heavy layouts - contact details in the page header, a two-column
+sidebar table, a skills grid and a text box - by counting the resume's own
+skills and e-mail address found in the extracted text.
+
+Run from backend/:  python -m benchmarks.bench_docx [--repeats N]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from docx import Document
+from docx.oxml import parse_xml
+
+from benchmarks.corpus import generate_resume
+from utils.nlp_utils import SKILL_MATCHER
+from utils.text_extraction import extract_text_from_docx
+
+_TEXT_BOX = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>{paragraphs}</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>
+    <mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>{paragraphs}</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+
+def legacy_extract(data: bytes) -> str:
+    """The previous extractor: body paragraphs of the python-docx object graph."""
+    doc = Document(io.BytesIO(data))
+    return "\n".join(p.text for p in doc.paragraphs if p.text).strip()
+
+
+def _save(doc) -> bytes:
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def _split(resume):
+    """(contact lines, summary lines, body lines, skills line) of a synthetic resume."""
+    lines = resume.text.splitlines()
+    return lines[:2], lines[2:4], lines[4:-1], lines[-1]
+
+
+def template_header(resume) -> bytes:
+    contact, summary, body, skills = _split(resume)
+    doc = Document()
+    header = doc.sections[0].header
+    for line in contact:
+        header.add_paragraph(line)
+    doc.sections[0].footer.add_paragraph("References available on request")
+    for line in summary + body + [skills]:
+        doc.add_paragraph(line)
+    return _save(doc)
+
+
+def template_sidebar(resume) -> bytes:
+    contact, summary, body, skills = _split(resume)
+    doc = Document()
+    table = doc.add_table(rows=1, cols=2)
+    left, right = table.rows[0].cells
+    left.text = "\n".join(contact)
+    left.add_paragraph("Skills")
+    for skill in skills.split(", "):
+        left.add_paragraph(skill)
+    right.text = "\n".join(summary)
+    for line in body:
+        right.add_paragraph(line)
+    return _save(doc)
+
+
+def template_skills_grid(resume) -> bytes:
+    contact, summary, body, skills = _split(resume)
+    doc = Document()
+    for line in contact + summary + body:
+        doc.add_paragraph(line)
+    names = skills.split(", ")
+    grid = doc.add_table(rows=(len(names) + 3) // 4, cols=4)
+    for i, skill in enumerate(names):
+        grid.cell(i // 4, i % 4).text = skill
+    return _save(doc)
+
+
+def template_text_box(resume) -> bytes:
+    contact, summary, body, skills = _split(resume)
+    doc = Document()
+    boxed = contact + summary + ["Skills", skills]
+    paragraphs = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in boxed)
+    anchor = doc.add_paragraph()
+    anchor._p.append(parse_xml(_TEXT_BOX.format(paragraphs=paragraphs)))
+    for line in body:
+        doc.add_paragraph(line)
+    return _save(doc)
+
+
+TEMPLATES = {
+    "plain": lambda resume: resume.docx(),
+    "header-contact": template_header,
+    "sidebar-table": template_sidebar,
+    "skills-grid": template_skills_grid,
+    "text-box": template_text_box,
+}
+
+
+def measure(fn, data: bytes, repeats: int):
+    """(best CPU ms, peak traced KiB) for one extractor on one document."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.process_time()
+        fn(data)
+        best = min(best, time.process_time() - t0)
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000.0, peak / 1024.0
+
+
+def recovery(text: str, resume) -> tuple:
+    """(share of the resume's skills found, e-mail found) in extracted text."""
+    expected = set(SKILL_MATCHER.scan(resume.text.lower()))
+    found = set(SKILL_MATCHER.scan(text.lower())) & expected
+    email = resume.text.splitlines()[1].split(" | ")[0]
+    return len(found) / max(1, len(expected)), email in text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'words':>7} {'KiB':>6} {'legacy ms':>10} {'stream ms':>10} {'speedup':>8} {'legacy peak':>12} {'stream peak':>12}")
+    for words in (500, 5000, 50000):
+        data = generate_resume(words, 0.03, seed=words).docx()
+        legacy_ms, legacy_peak = measure(legacy_extract, data, args.repeats)
+        stream_ms, stream_peak = measure(extract_text_from_docx, data, args.repeats)
+        print(f"{words:>7} {len(data) / 1024:>6.0f} {legacy_ms:>10.2f} {stream_ms:>10.2f} {legacy_ms / stream_ms:>7.1f}x"
+              f" {legacy_peak:>9.0f} KiB {stream_peak:>9.0f} KiB")
+
+    print()
+    print(f"{'template':<16} {'legacy skills':>13} {'stream skills':>13} {'legacy email':>12} {'stream email':>12}")
+    for name, build in TEMPLATES.items():
+        resume = generate_resume(600, 0.05, seed=7, name=name)
+        data = build(resume)
+        legacy_skills, legacy_email = recovery(legacy_extract(data), resume)
+        stream_skills, stream_email = recovery(extract_text_from_docx(data), resume)
+        print(f"{name:<16} {legacy_skills:>13.0%} {stream_skills:>13.0%} {str(legacy_email):>12} {str(stream_email):>12}")
+
+
+if __name__ == "__main__":
+    main()
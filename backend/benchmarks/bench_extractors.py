@@ -0,0 +1,89 @@
+"""
+Extractor registry: rejection latency for unsupported uploads, and
+sequential vs parallel page extraction for a large PDF.
+
+"legacy" is the old extension-based dispatch, where anything that is not
+.docx/.doc/.txt went to the PDF parser. Parallel extraction splits the pages
+over a process pool of --workers; it only pays off with several CPUs and
+pages that are expensive to extract.
+
+Run from backend/:  python -m benchmarks.bench_extractors [--workers N]
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import generate_resume
+from utils.formats import UnsupportedFormatError
+from utils.text_extraction import (
+    UNLIMITED,
+    extract_document,
+    extract_pdf_parallel,
+    extract_pdf_with_budget,
+    extract_text_from_docx,
+)
+
+
+def legacy_dispatch(data: bytes, filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".docx", ".doc"):
+        return extract_text_from_docx(data)
+    return extract_pdf_with_budget(data, UNLIMITED).text
+
+
+def unsupported_samples() -> dict:
+    rng = random.Random(0)
+    noise = bytes(rng.getrandbits(8) for _ in range(2 * 1024 * 1024))
+    return {
+        "legacy .doc (OLE2)": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + noise, "cv.doc"),
+        "scanned .png": (b"\x89PNG\r\n\x1a\n" + noise, "cv.png"),
+        "unknown binary": (noise, "cv.bin"),
+    }
+
+
+def best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--words", type=int, default=60000, help="size of the large PDF")
+    args = parser.parse_args()
+
+    def sniffed(data, filename):
+        try:
+            extract_document(data, filename)
+        except UnsupportedFormatError:
+            pass
+
+    print(f"{'unsupported upload':<20} {'legacy ms':>10} {'sniffed ms':>11}")
+    for name, (data, filename) in unsupported_samples().items():
+        legacy = best_ms(lambda: legacy_dispatch(data, filename), args.repeats)
+        fast = best_ms(lambda: sniffed(data, filename), args.repeats)
+        print(f"{name:<20} {legacy:>10.2f} {fast:>11.3f}")
+
+    big = generate_resume(args.words, 0.03).pdf()
+    sequential = extract_pdf_with_budget(big, UNLIMITED)
+    print()
+    print(f"large PDF: {sequential.pages_total} pages, {len(big) / 1024:.0f} KiB, {args.workers} workers")
+    seq_ms = best_ms(lambda: extract_pdf_with_budget(big, UNLIMITED), args.repeats)
+    with ProcessPoolExecutor(args.workers) as pool:
+        list(pool.map(abs, range(args.workers)))  # start the workers outside the timing
+        parallel = extract_pdf_parallel(big, pool, UNLIMITED, tasks=args.workers)
+        par_ms = best_ms(lambda: extract_pdf_parallel(big, pool, UNLIMITED, tasks=args.workers), args.repeats)
+    print(f"sequential {seq_ms:9.1f} ms")
+    print(f"parallel   {par_ms:9.1f} ms  ({seq_ms / par_ms:.2f}x, identical text: {parallel.text == sequential.text})")
+
+
+if __name__ == "__main__":
+    main()
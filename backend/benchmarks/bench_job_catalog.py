@@ -0,0 +1,83 @@
+"""
+Job matching against a large posting catalog.
+
+Builds a throwaway LSA catalog from synthetic postings (brute force, and with
+an IVF index), then times matching resumes against it:
+
+  roles     the previous TF-IDF role index (8 titles), for reference
+  brute     one mat-vec over the memory-mapped embeddings + argpartition
+  ivf/N     only the N nearest clusters are scanned (sqrt(postings) clusters)
+
+Query time includes embedding the resume's term counts. recall@10 is the
+share of the brute-force top 10 that the IVF search also returns.
+
+Run from backend/:  python -m benchmarks.bench_job_catalog [--postings N] [--dims D]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.corpus import generate_postings, generate_resume
+from utils.job_catalog import build_catalog
+from utils.nlp_utils import get_role_index
+
+
+def timed_ms(fn, queries) -> np.ndarray:
+    samples = []
+    for query in queries:
+        t0 = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return np.array(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--dims", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    started = time.perf_counter()
+    brute = build_catalog(generate_postings(args.postings), os.path.join(workdir, "brute"), args.dims)
+    print(f"built brute catalog in {time.perf_counter() - started:.1f} s: {brute.manifest}")
+    lists = int(args.postings ** 0.5)
+    started = time.perf_counter()
+    ivf = build_catalog(generate_postings(args.postings), os.path.join(workdir, "ivf"), args.dims, lists)
+    print(f"built IVF catalog ({lists} lists) in {time.perf_counter() - started:.1f} s")
+    size_mb = os.path.getsize(os.path.join(workdir, "brute", "embeddings.npy")) / 2 ** 20
+    print(f"embeddings on disk: {size_mb:.1f} MiB (memory-mapped, shared by every worker)")
+
+    resumes = [generate_resume(800, 0.05, seed=i).text for i in range(args.queries)]
+    index = get_role_index()
+    role_counts = [index.term_counts(text) for text in resumes]
+    catalog_counts = [brute.term_counts(text) for text in resumes]
+
+    exact = [{brute.ids[row] for row, _ in brute.search(brute.embed_counts(c), 10, nprobe=0)} for c in catalog_counts]
+
+    def recall(nprobe):
+        found = [{ivf.ids[row] for row, _ in ivf.search(ivf.embed_counts(c), 10, nprobe)} for c in catalog_counts]
+        return np.mean([len(e & f) / len(e) for e, f in zip(exact, found)])
+
+    print(f"\n{'path':<8} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall@10':>10}")
+    rows = [
+        ("roles", timed_ms(lambda c: index.rank(index.similarities_from_counts(c), 5), role_counts), None),
+        ("brute", timed_ms(lambda c: brute.search(brute.embed_counts(c), 10, nprobe=0), catalog_counts), 1.0),
+    ]
+    for nprobe in (8, 32, 64):
+        samples = timed_ms(lambda c: ivf.search(ivf.embed_counts(c), 10, nprobe), catalog_counts)
+        rows.append((f"ivf/{nprobe}", samples, recall(nprobe)))
+    for name, samples, hit_rate in rows:
+        shown = "" if hit_rate is None else f"{hit_rate:.3f}"
+        print(f"{name:<8} {samples.mean():>8.3f} {np.percentile(samples, 50):>8.3f} "
+              f"{np.percentile(samples, 95):>8.3f} {shown:>10}")
+    print("\nsample:", brute.recommend(brute.embed_counts(catalog_counts[0]), 3))
+
+
+if __name__ == "__main__":
+    main()
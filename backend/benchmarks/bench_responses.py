@@ -0,0 +1,99 @@
+"""
+Analysis response serialisation: time and bytes on the wire.
+
+  default   FastAPI's path for a returned dict (jsonable_encoder + JSONResponse)
+  model     validating through AnalysisResponse and dumping it (response_model)
+  fast      shape_response + utils.responses.dumps (orjson when installed)
+  compact   the same with ?fields=skills,ats
+
+Sizes are given raw and gzip-compressed (and br when brotli is installed).
+"typical" is an ordinary two-page resume; "worst" a long resume flooded with
+contact details so every entity list is at its cap.
+
+Run from backend/:  python -m benchmarks.bench_responses [--repeats N]
+"""
+
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.corpus import generate_resume
+from utils.pipeline import analyze_prepared, prepare_source
+from utils.responses import (
+    AnalysisResponse,
+    brotli,
+    compress,
+    dumps,
+    orjson,
+    parse_fields,
+    shape_response
+)
+
+
+def analysed(text: str) -> dict:
+    result = analyze_prepared(prepare_source(text.encode("utf-8"), "resume.txt"))
+    for key in ("timings", "section_cache"):
+        result.pop(key)
+    result["resume_id"] = "0" * 64
+    return result
+
+
+FIRST = ("Amara", "Bruno", "Chen", "Dana", "Elif", "Farid", "Greta", "Hugo", "Ines", "Jonas", "Kavya", "Lars")
+LAST = ("Okafor", "Silva", "Novak", "Haddad", "Larsen", "Moreau", "Tanaka", "Quinn", "Reyes", "Weber")
+
+
+def worst_case_text() -> str:
+    """A long resume whose references fill every entity list (within the entity scan window)."""
+    flood = []
+    for i in range(120):
+        name = f"{FIRST[i % len(FIRST)]} {LAST[i // len(FIRST) % len(LAST)]}"
+        org = f"ORG{chr(65 + i % 26)}{chr(65 + i // 26)}"
+        flood.append(f"Reference {name} at {org}: ref{i}@referee-{i}.example.com +1 555 {i:03d} {i:04d}")
+    return generate_resume(2000, 0.08, seed=7).text + "\nReferences\n" + "\n".join(flood) + "\n" + \
+        generate_resume(10000, 0.08, seed=8).text
+
+
+def best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    def validate(result):
+        if hasattr(AnalysisResponse, "model_validate"):
+            return AnalysisResponse.model_validate(result).model_dump_json(exclude_none=True).encode()
+        return AnalysisResponse.parse_obj(result).json(exclude_none=True).encode()
+
+    compact = parse_fields("skills,ats")
+    paths = {
+        "default": lambda r: JSONResponse(jsonable_encoder(r)).body,
+        "model": validate,
+        "fast": lambda r: dumps(shape_response(r)),
+        "compact": lambda r: dumps(shape_response(r, compact)),
+    }
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+    print(f"serializer: {'orjson' if orjson is not None else 'json'}; encodings: {', '.join(encodings)}")
+    header = f"{'resume':<8} {'path':<8} {'ms':>8} {'bytes':>8}" + "".join(f" {e:>8}" for e in encodings)
+    print(header)
+    for name, text in (("typical", generate_resume(800, 0.04, seed=1).text), ("worst", worst_case_text())):
+        result = analysed(text)
+        for path, serialise in paths.items():
+            ms = best_ms(lambda: serialise(result), args.repeats)
+            body = serialise(result)
+            sizes = "".join(f" {len(compress(body, e)):>8}" for e in encodings)
+            print(f"{name:<8} {path:<8} {ms:>8.3f} {len(body):>8}{sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Incremental re-analysis: a full analysis vs re-analysing a resume after one
+section was edited, with the per-section feature cache warm.
+
+Uses a throwaway SectionStore in a temporary directory.
+
+Run from backend/:  python -m benchmarks.bench_sections [--repeats N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import generate_resume
+from utils.pipeline import analyze_text
+from utils.section_store import SectionStore
+
+
+def best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    store = SectionStore(os.path.join(tempfile.mkdtemp(), "sections.sqlite3"))
+    print(f"{'words':>6} {'sections':>8} {'full ms':>8} {'edited ms':>10} {'recomputed':>10} {'saving':>7}")
+    for words in (600, 3000, 15000):
+        text = generate_resume(words, 0.04, seed=words).text
+        full = best_ms(lambda: analyze_text(text, store=False), args.repeats)
+        analyze_text(text, store=store)
+
+        edits = [text.replace("Bachelor of Science", f"Master of Science ({words}-{i})") for i in range(args.repeats)]
+        edited = float("inf")
+        for variant in edits:
+            t0 = time.perf_counter()
+            result = analyze_text(variant, store=store)
+            edited = min(edited, time.perf_counter() - t0)
+        edited *= 1000.0
+        cache = result["section_cache"]
+        print(f"{words:>6} {cache['sections']:>8} {full:>8.2f} {edited:>10.2f} {cache['computed']:>10} {1 - edited / full:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Skill matcher latency vs taxonomy size.
+
+Grows the skill list from COMMON_SKILLS up to 100x with synthetic entries and
+times one extract over a fixed resume, for the automaton and for the old
+per-skill `str.count` loop.
+
+Run from backend/:  python -m benchmarks.bench_skill_matcher
+"""
+
+import argparse
+import random
+import string
+import time
+
+from utils.nlp_utils import COMMON_SKILLS, SKILL_ALIASES
+from utils.skill_matcher import SkillMatcher
+
+
+def synthetic_skills(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    out = set()
+    while len(out) < n:
+        words = rng.choice((1, 1, 1, 2))
+        out.add(" ".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+            for _ in range(words)
+        ))
+    return sorted(out)
+
+
+def sample_resume(repeat: int = 20) -> str:
+    with open("dummy_resume.txt", encoding="utf-8") as f:
+        base = f.read()
+    filler = " ".join(COMMON_SKILLS[::3])
+    return ("\n".join([base, filler] * repeat)).lower()
+
+
+def legacy_scan(skills, text_l):
+    found = {}
+    for skill in skills:
+        count = text_l.count(skill)
+        if count > 0:
+            found[skill] = {"count": count, "first": text_l.find(skill)}
+    return found
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    text_l = sample_resume()
+    print(f"resume size: {len(text_l)} chars")
+    print(f"{'skills':>8} {'build ms':>10} {'automaton ms':>14} {'legacy ms':>11}")
+
+    base = len(COMMON_SKILLS)
+    for factor in (1, 10, 100):
+        skills = list(COMMON_SKILLS) + synthetic_skills(base * factor - base)
+        t0 = time.perf_counter()
+        matcher = SkillMatcher(skills, SKILL_ALIASES)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+
+        auto_ms = best_of(lambda: matcher.scan(text_l), args.repeats)
+        legacy_ms = best_of(lambda: legacy_scan(skills, text_l), args.repeats)
+        print(f"{len(skills):>8} {build_ms:>10.1f} {auto_ms:>14.2f} {legacy_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
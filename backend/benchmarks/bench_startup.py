@@ -0,0 +1,120 @@
+"""
+Cold-start measurement: import time of `main`, then a real uvicorn process
+timed to first /health, first successful analysis and /ready.
+
+Each import sample runs in a fresh interpreter. The first analysis is sent as
+soon as /health answers, i.e. possibly before the background warm-up is done,
+which is what an autoscaled container sees.
+
+Run from backend/:  python -m benchmarks.bench_startup [--json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmarks.corpus import generate_resume
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+heavy = ["sklearn", "scipy", "PyPDF2", "docx", "cryptography"]
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def measure_import(samples: int) -> dict:
+    runs = []
+    loaded = []
+    env = dict(os.environ, LOG_LEVEL="OFF")
+    for _ in range(samples):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, env=env)
+        if out.returncode != 0:
+            raise RuntimeError(f"import main failed:\n{out.stderr}")
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(probe["seconds"])
+        loaded = probe["loaded"]
+    return {
+        "median_s": round(statistics.median(runs), 4),
+        "min_s": round(min(runs), 4),
+        "samples": samples,
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float, expect=200) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == expect:
+                return time.perf_counter()
+        except requests.RequestException:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not return {expect} in time")
+
+
+def measure_server(timeout: float) -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    resume = generate_resume(800, 0.03).pdf()
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = started + timeout
+    try:
+        healthy = _wait_for(f"{base}/health", deadline)
+        response = requests.post(f"{base}/analyze_resume", files={"file": ("cold.pdf", resume)}, timeout=timeout)
+        response.raise_for_status()
+        first_analysis = time.perf_counter()
+        ready = _wait_for(f"{base}/ready", deadline)
+        return {
+            "time_to_health_s": round(healthy - started, 4),
+            "time_to_first_analysis_s": round(first_analysis - started, 4),
+            "first_analysis_latency_s": round(first_analysis - healthy, 4),
+            "time_to_ready_s": round(ready - started, 4),
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5, help="fresh-interpreter imports to time")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="print one JSON object instead of a table")
+    args = parser.parse_args()
+
+    report = {"import": measure_import(args.samples), "server": measure_server(args.timeout)}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    imp = report["import"]
+    print(f"import main                {imp['median_s'] * 1000:8.1f} ms (median of {imp['samples']})")
+    print(f"heavy modules loaded       {', '.join(imp['heavy_modules_loaded']) or 'none'}")
+    for name, value in report["server"].items():
+        print(f"{name:<26} {value * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Synthetic resume corpus for the benchmark suite.
+
+Resumes are generated from a fixed seed with a controlled word count and skill
+density (fraction of words drawn from COMMON_SKILLS), and rendered as TXT,
+DOCX (python-docx) and PDF (a minimal hand-written PDF with the standard
+Helvetica font), so nothing is downloaded and no PDF library is needed.
+Job postings for the catalog benchmark are generated the same way.
+"""
+
+import io
+import random
+from dataclasses import dataclass
+
+from docx import Document
+
+from utils.nlp_utils import COMMON_SKILLS
+
+FIRST_NAMES = ["Asha", "Daniel", "Priya", "Marco", "Elena", "Kenji", "Fatima", "Lucas"]
+LAST_NAMES = ["Sharma", "Okafor", "Nguyen", "Rossi", "Lindqvist", "Tanaka", "Haddad", "Silva"]
+VERBS = ["built", "designed", "led", "migrated", "optimised", "shipped", "maintained", "automated"]
+FILLER = (
+    "the a team service platform pipeline customers latency throughput reliability "
+    "reporting internal external data release quality process cost users feature "
+    "stakeholders roadmap backlog review production monitoring incident launch"
+).split()
+SECTIONS = ["Experience", "Projects", "Leadership"]
+
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 55
+
+
+@dataclass
+class SyntheticResume:
+    name: str
+    words: int
+    skill_density: float
+    text: str
+
+    def txt(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def docx(self) -> bytes:
+        doc = Document()
+        for line in self.text.splitlines():
+            doc.add_paragraph(line)
+        out = io.BytesIO()
+        doc.save(out)
+        return out.getvalue()
+
+    def pdf(self) -> bytes:
+        lines = self.text.splitlines()
+        pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+        return render_pdf(pages or [[]])
+
+
+def generate_resume(words: int, skill_density: float, seed: int = 0, name: str = None) -> SyntheticResume:
+    """A resume of about `words` words where ~skill_density of them are skills."""
+    rng = random.Random(seed)
+    person = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        person,
+        f"{person.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "Summary",
+    ]
+    count = 0
+
+    def sentence():
+        nonlocal count
+        out = [rng.choice(VERBS)]
+        for _ in range(WORDS_PER_LINE - 1):
+            out.append(rng.choice(COMMON_SKILLS) if rng.random() < skill_density else rng.choice(FILLER))
+        count += len(out)
+        return " ".join(out)
+
+    lines.append(sentence())
+    section = 0
+    while count < words:
+        if (len(lines) - 3) % 20 == 0:
+            lines.append(SECTIONS[section % len(SECTIONS)])
+            lines.append(f"Senior Engineer, ACME {section} Corp, 20{10 + section % 14}-20{11 + section % 14}")
+            section += 1
+        lines.append(f"- {sentence()}")
+
+    lines.append("Education")
+    lines.append("Bachelor of Science in Computer Science")
+    lines.append("Skills")
+    lines.append(", ".join(rng.sample(COMMON_SKILLS, 12)))
+    return SyntheticResume(
+        name=name or f"words={words},density={skill_density}",
+        words=words,
+        skill_density=skill_density,
+        text="\n".join(lines),
+    )
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(pages) -> bytes:
+    """Minimal PDF 1.4: one Helvetica text block per page, one line per entry."""
+    objects = []
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, lines in enumerate(pages):
+        ops = ["BT", "/F1 10 Tf", "13 TL", "40 800 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842]"
+            f" /Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ------------------------------------------------------
+# JOB POSTINGS
+# ------------------------------------------------------
+POSTING_FAMILIES = {
+    "Data Analyst": ["sql", "excel", "tableau", "power bi", "python", "reporting", "dashboards", "statistics"],
+    "Data Scientist": ["python", "machine learning", "pandas", "numpy", "scikit-learn", "statistics", "experiments"],
+    "Machine Learning Engineer": ["pytorch", "tensorflow", "deep learning", "python", "docker", "kubernetes", "mlops"],
+    "Backend Developer": ["java", "go", "postgresql", "redis", "microservices", "apis", "django", "fastapi"],
+    "Frontend Developer": ["javascript", "typescript", "react", "vue", "css", "html", "accessibility", "tailwind"],
+    "Full Stack Developer": ["react", "node", "express", "mongodb", "typescript", "rest", "graphql", "css"],
+    "DevOps Engineer": ["aws", "terraform", "docker", "kubernetes", "jenkins", "ci/cd", "monitoring", "linux"],
+    "Mobile Developer": ["swift", "kotlin", "ios", "android", "flutter", "mobile", "app store", "firebase"],
+    "Security Engineer": ["penetration testing", "siem", "iam", "threat modelling", "soc", "vulnerability", "cloud"],
+    "Product Manager": ["roadmap", "stakeholders", "discovery", "metrics", "prioritisation", "agile", "launch"],
+    "Business Intelligence Analyst": ["power bi", "tableau", "sql", "data warehouse", "etl", "kpis", "excel"],
+    "Data Engineer": ["spark", "airflow", "kafka", "sql", "python", "etl", "data lake", "dbt"],
+}
+SENIORITY = ["Junior", "", "", "Senior", "Lead", "Staff"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Tyrell", "Cyberdyne"]
+DUTIES = (
+    "you will build own improve collaborate with partner across teams to deliver ship maintain scale "
+    "our product platform customers users reliable secure fast services tools insights decisions"
+).split()
+
+
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "zen", "dra", "pel", "qui", "bor", "tex", "gal")
+POSTING_VOCABULARY = 30000
+FAMILY_VOCABULARY = 1500
+
+
+def _pseudo_words(rng, count: int) -> list:
+    """Distinct made-up words (tools, domains, product names), so the catalog has a realistic vocabulary."""
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def generate_postings(count: int, seed: int = 0):
+    """Yield `count` synthetic postings ({"id", "title", "company", "description"}) from a fixed seed."""
+    rng = random.Random(seed)
+    families = list(POSTING_FAMILIES)
+    vocabulary = _pseudo_words(rng, POSTING_VOCABULARY)
+    # each family draws its topical words from its own slice, Zipf-like (a few words are very common)
+    topical = {family: rng.sample(vocabulary, FAMILY_VOCABULARY) for family in families}
+    zipf = [1.0 / rank for rank in range(1, FAMILY_VOCABULARY + 1)]
+    for i in range(count):
+        family = families[rng.randrange(len(families))]
+        # neighbouring families share some vocabulary, as real postings do
+        neighbour = POSTING_FAMILIES[families[(families.index(family) + 1) % len(families)]]
+        terms = POSTING_FAMILIES[family]
+        length = rng.randint(60, 160)
+        own_words = iter(rng.choices(topical[family], weights=zipf, k=length))
+        words = []
+        for _ in range(length):
+            roll = rng.random()
+            if roll < 0.2:
+                words.append(rng.choice(terms))
+            elif roll < 0.26:
+                words.append(rng.choice(neighbour))
+            elif roll < 0.36:
+                words.append(rng.choice(COMMON_SKILLS))
+            elif roll < 0.56:
+                words.append(next(own_words))
+            elif roll < 0.6:
+                words.append(rng.choice(vocabulary))
+            else:
+                words.append(rng.choice(DUTIES if roll < 0.8 else FILLER))
+        title = " ".join(part for part in (rng.choice(SENIORITY), family) if part)
+        yield {
+            "id": f"p{i}",
+            "title": title,
+            "company": rng.choice(COMPANIES),
+            "description": " ".join(words),
+        }
@@ -0,0 +1,176 @@
+"""
+Reproducible benchmark suite for the analysis pipeline stages.
+
+Generates synthetic resumes (benchmarks.corpus) at several sizes and skill
+densities, times each stage separately and writes the medians as JSON:
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --baseline bench.json --tolerance 0.25
+
+With --profile DIR each stage is also run once under cProfile (outside the
+timed samples) and saved there; list them with
+`python -m utils.profiling --dir DIR`.
+
+With --baseline the run exits with status 1 when any stage is slower than the
+baseline by more than the tolerance (relative) plus --min-ms (absolute noise
+floor). Runs fully offline; the role index is built locally if missing.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import generate_resume
+from utils.text_extraction import extract_text_from_pdf, extract_text_from_docx
+from utils.nlp_utils import (
+    normalize_text,
+    extract_basic_entities,
+    extract_skills,
+    recommend_jobs_via_embeddings,
+    get_role_index
+)
+from utils.ats_scoring import calculate_ats_score
+from utils.profiling import Profile, run_profiled
+
+RESULTS_FORMAT = 1
+
+# name -> (words, skill_density)
+CASES = {
+    "small": (300, 0.03),
+    "medium": (1500, 0.03),
+    "large": (8000, 0.03),
+    "medium-sparse": (1500, 0.005),
+    "medium-dense": (1500, 0.15),
+}
+
+
+def stage_calls(resume):
+    """(stage name, zero-argument callable) for one resume; inputs are prepared up front."""
+    pdf = resume.pdf()
+    docx = resume.docx()
+    text = normalize_text(resume.text)
+    entities = extract_basic_entities(text)
+    skills = extract_skills(text)
+    return [
+        ("extract_text_from_pdf", lambda: extract_text_from_pdf(pdf)),
+        ("extract_text_from_docx", lambda: extract_text_from_docx(docx)),
+        ("normalize_text", lambda: normalize_text(resume.text)),
+        ("extract_basic_entities", lambda: extract_basic_entities(text)),
+        ("extract_skills", lambda: extract_skills(text)),
+        ("recommend_jobs_via_embeddings", lambda: recommend_jobs_via_embeddings(text, top_k=5)),
+        ("calculate_ats_score", lambda: calculate_ats_score(skills, text, entities)),
+    ]
+
+
+def time_call(fn, repeats: int, min_seconds: float) -> dict:
+    fn()  # warm-up
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeats or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "runs": len(samples),
+    }
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(cases, stages=None, repeats: int = 15, min_seconds: float = 0.2, seed: int = 0,
+              profile_dir: str = None) -> dict:
+    get_role_index()  # load/build once, outside the timings
+    profile = Profile(time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + f"-{seed:x}", "suite", profile_dir)
+    results = {}
+    for case in cases:
+        words, density = CASES[case]
+        resume = generate_resume(words, density, seed=seed, name=case)
+        for stage, fn in stage_calls(resume):
+            if stages and stage not in stages:
+                continue
+            key = f"{stage}[{case}]"
+            results[key] = time_call(fn, repeats, min_seconds)
+            if profile_dir:
+                run_profiled(profile, key, fn)
+            print(f"{key:<48} {results[key]['median_ms']:>10.3f} ms")
+    return {
+        "format": RESULTS_FORMAT,
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "cases": {case: {"words": CASES[case][0], "skill_density": CASES[case][1]} for case in cases},
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """Stages slower than baseline * (1 + tolerance) + min_ms, as report dicts."""
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if before is None:
+            continue
+        limit = before["median_ms"] * (1 + tolerance) + min_ms
+        if now["median_ms"] > limit:
+            regressions.append({
+                "stage": key,
+                "baseline_ms": before["median_ms"],
+                "current_ms": now["median_ms"],
+                "ratio": round(now["median_ms"] / before["median_ms"], 3) if before["median_ms"] else None,
+            })
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    parser.add_argument("--min-ms", type=float, default=0.05, help="absolute noise floor in ms (default 0.05)")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--stages", nargs="+", help="only time these stages")
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="minimum sampling time per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", metavar="DIR", help="also save a cProfile capture of each stage here")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.cases, args.stages, args.repeats, args.min_seconds, args.seed, args.profile)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance, args.min_ms)
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+        return 0
+    for r in regressions:
+        print(f"REGRESSION {r['stage']}: {r['baseline_ms']:.3f} ms -> {r['current_ms']:.3f} ms")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
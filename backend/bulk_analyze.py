@@ -0,0 +1,427 @@
+"""
+Offline bulk analysis: re-score an archive of resumes without the API.
+
+Walks a directory (or reads a manifest of paths, one per line) and streams the
+files through read -> extract -> normalise -> analyse in worker processes,
+with a bounded number of files in flight, writing one record per file:
+
+    python bulk_analyze.py --input archive/ --output scores.jsonl
+    python bulk_analyze.py --manifest files.txt --output scores/ --format parquet --workers 8
+
+Progress is checkpointed next to the output (<output>.checkpoint.sqlite3):
+files already written for the current pipeline version with an unchanged
+size and mtime are skipped, so an interrupted run (Ctrl-C, SIGTERM, crash)
+picks up where it stopped. Output past the last checkpoint is discarded on
+resume, so no file is written twice. Throughput (files/s, MB/s) is printed
+while running and at the end.
+
+JSONL records carry the analysis as the API returns it (`--fields` works the
+same way); Parquet output (needs pyarrow) is a directory of part files with
+flat columns plus the analysis as a JSON string.
+
+--profile-rate samples files to profile with cProfile (see utils.profiling);
+list the captures with `python -m utils.profiling --dir <profile dir>`.
+"""
+
+import argparse
+import hashlib
+import os
+import signal
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.pipeline import analyze_batch_item
+from utils.profiling import PROFILE_DIR, run_profiled, should_profile, start_profile
+from utils.result_cache import pipeline_version
+from utils.responses import dumps, parse_fields, shape_response
+from utils.worker_pool import _init_worker
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: only needed for --format parquet
+    pyarrow = None
+
+BULK_EXTENSIONS = (".pdf", ".docx", ".txt")
+CHECKPOINT_EVERY = 500
+CHECKPOINT_SECONDS = 30.0
+PROGRESS_SECONDS = 5.0
+
+
+# ------------------------------------------------------
+# INPUTS
+# ------------------------------------------------------
+def walk_directory(root: str):
+    """Resume files under `root` (by extension), in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(BULK_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def read_manifest(path: str):
+    """Paths listed in a manifest (blank lines and # comments skipped), relative to its directory."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield os.path.join(base, line)
+
+
+def with_stat(paths):
+    """(path, size, mtime_ns) for each path; missing files are reported and skipped."""
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            print(f"skipping {path}: {e}", file=sys.stderr)
+            continue
+        yield path, st.st_size, st.st_mtime_ns
+
+
+# ------------------------------------------------------
+# WORKERS
+# ------------------------------------------------------
+_profiling = {"rate": 0.0, "directory": None}
+
+
+def _init_bulk_worker(section_cache: bool, profile_rate: float = 0.0, profile_dir: str = None):
+    """Warm the worker like the API pool; Ctrl-C is handled by the parent only."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)  # not the parent's stop handler
+    _init_worker()
+    import utils.section_store
+    # Archive files rarely share sections, so the cache is off unless asked for
+    utils.section_store.SECTION_CACHE = section_cache
+    _profiling.update(rate=profile_rate, directory=profile_dir)
+
+
+def analyse_file(path: str) -> dict:
+    """Read one file and analyse it; failures become an error record (see analyze_batch_item)."""
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return {"filename": path, "status": "error", "error": f"{type(e).__name__}: {e}", "stage": "read"}
+    read_seconds = time.perf_counter() - started
+    if _profiling["rate"] and should_profile(rate=_profiling["rate"]):
+        profile = start_profile(path, _profiling["directory"])
+        item = run_profiled(profile, "bulk", analyze_batch_item, 0, path, data)
+    else:
+        item = analyze_batch_item(0, path, data)
+    item["sha256"] = hashlib.sha256(data).hexdigest()
+    item["timings"] = {"read": read_seconds, **item.get("timings", {})}
+    return item
+
+
+def analyse_stream(pool, items, window: int):
+    """
+    Yield ((path, size, mtime_ns), item) as results complete, keeping at most
+    `window` files submitted but not yet written.
+    """
+    pending = {}
+    items = iter(items)
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < window:
+            entry = next(items, None)
+            if entry is None:
+                exhausted = True
+                break
+            pending[pool.submit(analyse_file, entry[0])] = entry
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+
+
+# ------------------------------------------------------
+# CHECKPOINT
+# ------------------------------------------------------
+class Checkpoint:
+    """
+    Files already written, plus how much of the output is committed
+    (`output_size`: JSONL bytes or Parquet part count). Marks become durable
+    only on `commit`, which the caller runs after flushing the output.
+    """
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " version TEXT NOT NULL, status TEXT NOT NULL, finished_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+
+    def is_done(self, path: str, size: int, mtime_ns: int, version: str, retry_errors: bool = False) -> bool:
+        row = self._db.execute(
+            "SELECT size, mtime_ns, version, status FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or tuple(row[:3]) != (size, mtime_ns, version):
+            return False
+        return not (retry_errors and row[3] == "error")
+
+    def mark(self, path: str, size: int, mtime_ns: int, version: str, status: str):
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, version, status, finished_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, version, status, time.time()),
+        )
+
+    @property
+    def output_size(self) -> int:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'output_size'").fetchone()
+        return int(row[0]) if row else 0
+
+    def commit(self, output_size: int):
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('output_size', ?)", (str(output_size),)
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+# ------------------------------------------------------
+# OUTPUT
+# ------------------------------------------------------
+class JsonlWriter:
+    """One JSON object per line; `flush` makes the written lines durable."""
+
+    def __init__(self, path: str, committed: int):
+        self._file = open(path, "ab")
+        # Drop lines written after the last checkpoint (they will be redone)
+        self._file.truncate(committed)
+        self._file.seek(committed)
+
+    def write(self, record: dict):
+        self._file.write(dumps(record) + b"\n")
+
+    def flush(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+PARQUET_COLUMNS = (
+    ("path", "string"),
+    ("sha256", "string"),
+    ("bytes", "int64"),
+    ("status", "string"),
+    ("error", "string"),
+    ("stage", "string"),
+    ("pipeline_version", "string"),
+    ("ats_score", "int64"),
+    ("skills", "list<string>"),
+    ("top_role", "string"),
+    ("analysis", "string"),
+)
+
+
+class ParquetWriter:
+    """
+    A directory of part files, one per checkpoint, each written whole (a
+    Parquet file is unreadable until its footer is written). `flush` returns
+    the number of parts.
+    """
+
+    def __init__(self, path: str, committed: int):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.parts = committed
+        for name in os.listdir(path):
+            # Parts past the last checkpoint hold files that will be redone
+            if name.startswith("part-") and int(name[5:10]) >= committed:
+                os.remove(os.path.join(path, name))
+        types = {"string": pyarrow.string(), "int64": pyarrow.int64(), "list<string>": pyarrow.list_(pyarrow.string())}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in PARQUET_COLUMNS])
+        self._rows = []
+
+    def write(self, record: dict):
+        analysis = record.get("analysis") or {}
+        skills = analysis.get("skills_proficiency")
+        jobs = analysis.get("job_recommendations")
+        self._rows.append({
+            "path": record["path"],
+            "sha256": record.get("sha256"),
+            "bytes": record["bytes"],
+            "status": record["status"],
+            "error": record.get("error"),
+            "stage": record.get("stage"),
+            "pipeline_version": record["pipeline_version"],
+            "ats_score": analysis.get("ats_score"),
+            "skills": None if skills is None else [skill["skill"] for skill in skills],
+            "top_role": jobs[0]["role"] if jobs else None,
+            "analysis": dumps(analysis).decode("utf-8") if analysis else None,
+        })
+
+    def flush(self) -> int:
+        if self._rows:
+            table = pyarrow.Table.from_pylist(self._rows, schema=self.schema)
+            final = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+            pyarrow.parquet.write_table(table, final + ".tmp", compression="zstd")
+            os.replace(final + ".tmp", final)
+            self.parts += 1
+            self._rows = []
+        return self.parts
+
+    def close(self):
+        pass
+
+
+WRITERS = {"jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+# ------------------------------------------------------
+# RUN
+# ------------------------------------------------------
+class Throughput:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files = 0
+        self.errors = 0
+        self.bytes = 0
+        self.stage_seconds = {}
+
+    def add(self, size: int, item: dict):
+        self.files += 1
+        self.bytes += size
+        self.errors += item["status"] != "ok"
+        for stage, seconds in item.get("timings", {}).items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (f"{self.files} files ({self.errors} errors), {self.bytes / 2 ** 20:.1f} MB in {elapsed:.1f} s: "
+                f"{self.files / elapsed:.1f} files/s, {self.bytes / 2 ** 20 / elapsed:.2f} MB/s")
+
+
+def output_record(entry, item: dict, version: str, selected) -> dict:
+    path, size, _ = entry
+    record = {"path": path, "bytes": size, "sha256": item.get("sha256"), "status": item["status"],
+              "pipeline_version": version}
+    if item["status"] == "ok":
+        record["analysis"] = shape_response(item["result"], selected)
+    else:
+        record["error"] = item["error"]
+        record["stage"] = item["stage"]
+    return record
+
+
+_stop = {"requested": False}
+
+
+def _request_stop(signum, frame):
+    """SIGINT/SIGTERM: stop after the current file's record and mark, never between them."""
+    _stop["requested"] = True
+
+
+def run(args) -> int:
+    version = pipeline_version()
+    selected = parse_fields(args.fields)
+    checkpoint = Checkpoint(args.checkpoint)
+    writer = WRITERS[args.format](args.output, checkpoint.output_size)
+
+    paths = walk_directory(args.input) if args.input else read_manifest(args.manifest)
+    skipped = 0
+
+    def todo():
+        nonlocal skipped
+        for count, entry in enumerate(with_stat(paths)):
+            if _stop["requested"]:
+                return
+            if checkpoint.is_done(*entry, version, args.retry_errors):
+                skipped += 1
+                continue
+            if args.limit is not None and count - skipped >= args.limit:
+                return
+            yield entry
+
+    stats = Throughput()
+    last_commit = last_progress = time.perf_counter()
+    uncommitted = 0
+    _stop["requested"] = False
+    previous = {signum: signal.signal(signum, _request_stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_bulk_worker,
+                               initargs=(args.section_cache, args.profile_rate, args.profile_dir))
+    try:
+        for entry, item in analyse_stream(pool, todo(), args.queue or args.workers * 4):
+            writer.write(output_record(entry, item, version, selected))
+            checkpoint.mark(entry[0], entry[1], entry[2], version, item["status"])
+            stats.add(entry[1], item)
+            uncommitted += 1
+            now = time.perf_counter()
+            if uncommitted >= args.checkpoint_every or now - last_commit >= CHECKPOINT_SECONDS:
+                checkpoint.commit(writer.flush())
+                last_commit, uncommitted = now, 0
+            if now - last_progress >= args.progress_seconds:
+                print(stats.line(), file=sys.stderr, flush=True)
+                last_progress = now
+            if _stop["requested"]:
+                break
+    finally:
+        pool.shutdown(wait=not _stop["requested"], cancel_futures=True)
+        # Every record written has its mark, so both are committed even on interrupt
+        checkpoint.commit(writer.flush())
+        writer.close()
+        checkpoint.close()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    if _stop["requested"]:
+        print("interrupted; checkpoint saved", file=sys.stderr)
+    print(stats.line() + f"; {skipped} already done")
+    if stats.stage_seconds:
+        print("worker seconds by stage: " + ", ".join(
+            f"{stage} {seconds:.2f}" for stage, seconds in stats.stage_seconds.items()))
+    return 130 if _stop["requested"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="directory to walk for .pdf/.docx/.txt files")
+    source.add_argument("--manifest", help="file listing one path per line (relative to the manifest)")
+    parser.add_argument("--output", required=True, help="JSONL file, or directory for --format parquet")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--checkpoint", help="checkpoint database (default: <output>.checkpoint.sqlite3)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue", type=int, default=0, help="max files in flight (default: 4 x workers)")
+    parser.add_argument("--fields", help="analysis fields to keep, as the API's ?fields= (default: all)")
+    parser.add_argument("--limit", type=int, help="stop after this many new files")
+    parser.add_argument("--retry-errors", action="store_true", help="redo files that failed last time")
+    parser.add_argument("--section-cache", action="store_true", help="use the shared section cache")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY, help="files per checkpoint")
+    parser.add_argument("--progress-seconds", type=float, default=PROGRESS_SECONDS)
+    parser.add_argument("--profile-rate", type=float, default=0.0, help="share of files to profile (0-1)")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    args = parser.parse_args()
+
+    if args.format == "parquet" and pyarrow is None:
+        parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+    try:
+        parse_fields(args.fields)
+    except ValueError as e:
+        parser.error(str(e))
+    args.checkpoint = args.checkpoint or args.output.rstrip("/\\") + ".checkpoint.sqlite3"
+    if os.path.exists(args.output) and not os.path.exists(args.checkpoint):
+        # Resuming discards output past the checkpoint, so never adopt a foreign file
+        parser.error(f"{args.output} exists without a checkpoint at {args.checkpoint}")
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
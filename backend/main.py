@@ -5,28 +5,101 @@ Secure Gmail Email System + Resume Analysis
 """
 
 import os
-import shutil
+import io
+import json
+import time
 import uuid
-import re
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import socket
+import asyncio
+import zipfile
+import hashlib
+import functools
+from typing import Dict, List, Optional
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response, JSONResponse, FileResponse
 from pydantic import BaseModel
 
-# Email imports
-from cryptography.fernet import Fernet
+# Email imports (cryptography is imported by the handler that uses it)
+from functools import lru_cache
 from dotenv import load_dotenv
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 # NLP imports
-from utils.text_extraction import extract_text_from_file
-from utils.nlp_utils import (
-    normalize_text,
-    extract_basic_entities,
-    extract_skills,
-    recommend_jobs_via_embeddings
+from utils.nlp_utils import get_role_index, get_job_catalog
+from utils.ats_scoring import calculate_ats_score  # re-exported for existing callers
+from utils.ats_scoring import ATS_WEIGHTS, weight_matrix, score_matrix
+from utils.feature_store import FeatureStore
+from utils.candidate_index import CandidateIndex
+from utils.near_duplicate import NearDuplicateIndex, NEAR_DUP_ACTION, NEAR_DUP_REUSE
+from utils.pipeline import (
+    EmptyResumeError,
+    prepare_source,
+    analyze_prepared,
+    analyze_batch_item
 )
+from utils.formats import UnsupportedFormatError
+from utils.section_store import SectionStore
+from utils.sections import diff_analyses
+from utils.text_extraction import plan_extraction, resolve_extractor
+from utils.upload_ingest import (
+    ingest_upload,
+    store_upload,
+    UploadSizeLimit,
+    MAX_BATCH_UPLOAD_BYTES,
+    MAX_JOB_UPLOAD_BYTES
+)
+from utils.overload import (
+    DEADLINE_HEADER,
+    DEGRADED,
+    NORMAL,
+    REJECT,
+    Deadline,
+    OverloadController,
+    request_deadline
+)
+from utils.job_queue import JobQueue, TERMINAL_STATES, record_job_progress
+from utils.mailer import MailDispatcher, MailQueueFull
+from utils.logs import configure_logging, get_logger, log_preview
+from utils.metrics import (
+    REGISTRY,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    Gauge,
+    ANALYSES,
+    HTTP_IN_FLIGHT,
+    REQUEST_SECONDS,
+    file_type,
+    observe_stages,
+    observe_extraction,
+    observe_sections,
+    record_error
+)
+from utils.profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    PROFILE_TOKEN,
+    is_trusted,
+    list_profiles,
+    profile_path,
+    profiled_call,
+    should_profile,
+    start_profile
+)
+from utils.result_cache import ResultCache
+from utils.responses import AnalysisResponse, dumps, json_response, parse_fields, shape_response
+from utils.worker_pool import (
+    ANALYSIS_WORKERS,
+    ANALYSIS_MAX_IN_FLIGHT,
+    ANALYSIS_RETRY_AFTER,
+    InFlightLimiter,
+    get_process_pool,
+    warm_process_pool,
+    reset_process_pool,
+    shutdown_process_pool
+)
+import numpy as np
 import traceback
 
 # ------------------------------------------------------
@@ -38,13 +111,20 @@ load_dotenv()
 import logging
 logging.basicConfig(filename='server_errors.log', level=logging.ERROR, 
                     format='%(asctime)s %(levelname)s:%(message)s')
+# Leveled console logging for the hot path (LOG_LEVEL, LOG_PREVIEW_SAMPLE_RATE)
+configure_logging()
+log = get_logger()
 
 YOUR_EMAIL = os.getenv("Email")
 
 # ------------------------------------------------------
 # DECRYPT GMAIL APP PASSWORD
 # ------------------------------------------------------
+@lru_cache(maxsize=1)
 def get_decrypted_gmail_password():
+    """Decrypted once per process; failures are not cached, so a fixed key is picked up."""
+    from cryptography.fernet import Fernet
+
     try:
         key = os.getenv("EMAIL_KEY")
         if not key:
@@ -60,7 +140,7 @@ def get_decrypted_gmail_password():
         return decrypted.decode()
 
     except Exception as e:
-        print("Decryption Error:", e)
+        log.error("Decryption Error: %s", e)
         raise Exception("Failed to decrypt Gmail App Password")
 
 
@@ -73,11 +153,30 @@ class ContactForm(BaseModel):
     message: str
 
 
+# ------------------------------------------------------
+# ATS RE-RANK SCHEMA
+# ------------------------------------------------------
+class RerankRequest(BaseModel):
+    # named weight profiles, e.g. {"backend": {"skill_match": 0.7, "education": 0.3}}
+    profiles: Optional[Dict[str, Dict[str, float]]] = None
+    # shorthand for a single profile
+    weights: Optional[Dict[str, float]] = None
+    resume_ids: Optional[List[str]] = None
+    top_k: int = 50
+
+
 # ------------------------------------------------------
 # FASTAPI APP & CORS CONFIG
 # ------------------------------------------------------
 app = FastAPI()
 
+# Oversized bodies get a 413 while streaming (added first so CORS headers wrap it);
+# MAX_UPLOAD_BYTES applies to every other POST
+app.add_middleware(UploadSizeLimit, limits={
+    "/analyze_resumes/batch": MAX_BATCH_UPLOAD_BYTES,
+    "/jobs": MAX_JOB_UPLOAD_BYTES,
+})
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],    # In production change to your domain
@@ -86,172 +185,185 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Temporary file directory
-UPLOAD_DIR = "uploaded_files"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+@app.middleware("http")
+async def track_requests(request, call_next):
+    """Request latency by route template and requests in flight, for /metrics."""
+    started = time.perf_counter()
+    status = 500
+    HTTP_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+
+# Admission control for CPU-bound analysis
+analysis_limiter = InFlightLimiter(ANALYSIS_MAX_IN_FLIGHT)
+
+REGISTRY.register(Gauge(
+    "analysis_in_flight", "Analysis requests holding a worker slot.",
+    function=lambda: analysis_limiter.in_flight,
+))
+REGISTRY.register(Gauge(
+    "analysis_in_flight_limit", "Maximum analysis requests admitted at once.",
+    function=lambda: analysis_limiter.limit,
+))
+
+# Deadline-aware degrade/reject decisions for interactive analysis
+overload = OverloadController(ANALYSIS_WORKERS)
+
+OVERLOAD_EXPECTED_SECONDS = REGISTRY.register(Gauge(
+    "analysis_expected_seconds", "Recent latency of one analysis (EWMA of its stage timings), by mode.",
+    ("mode",),
+))
+
+# Results keyed by upload hash + pipeline version
+result_cache = ResultCache()
+
+# ATS sub-score vectors of every analysed resume, for re-ranking
+feature_store = FeatureStore()
+
+# Skill -> candidates inverted index, for boolean search
+candidate_index = CandidateIndex()
+
+# MinHash/LSH signatures of stored resumes, for near-duplicate detection
+near_duplicates = NearDuplicateIndex() if NEAR_DUP_ACTION != "off" else None
+
+# Section hashes and scores of every analysed resume, for previous_id diffs
+section_store = SectionStore()
+
+
+def find_near_duplicate(resume_id: str, signature) -> Optional[dict]:
+    """Closest stored resume above NEAR_DUP_THRESHOLD, or None (blocking)."""
+    if near_duplicates is None:
+        return None
+    return near_duplicates.query(signature, exclude=resume_id)
+
+
+def mark_near_duplicate(result: dict, match: dict, reused: bool = False):
+    result["near_duplicate"] = {
+        "resume_id": match["resume_id"],
+        "similarity": match["similarity"],
+        "collapsed": NEAR_DUP_ACTION == "collapse",
+        # entities/skills then describe the earlier upload, not this one
+        "analysis_reused": reused,
+    }
 
-print("USING NLP BACKEND (spaCy + TF-IDF)")
-print("RUNNING FROM:", os.path.abspath(__file__))
 
+def record_analysis(resume_id: str, filename: str, result: dict, signature=None, cache_key=None):
+    """
+    Persist an analysis into the section store, the re-rank feature store, the
+    candidate index and the near-duplicate index (blocking). Collapsed
+    near-duplicates only get the section record, so they can still be revised.
+    """
+    section_store.record_resume(resume_id, result)
+    if result.get("near_duplicate", {}).get("collapsed"):
+        return
+    feature_store.put(resume_id, filename, result["ats_features"])
+    candidate_index.add(
+        resume_id, filename, result["skills_proficiency"], result["entities"], result["ats_score"]
+    )
+    if near_duplicates is not None and signature is not None:
+        near_duplicates.add(resume_id, signature, cache_key)
 
-# ------------------------------------------------------
-# ATS SCORING AUTOMATION
-# ------------------------------------------------------
-def _has_contact(entities: dict) -> float:
-    """Return contact presence score: 1.0 if email+phone, 0.5 if one, 0 otherwise."""
-    emails = entities.get("emails", []) if isinstance(entities, dict) else []
-    phones = entities.get("phones", []) if isinstance(entities, dict) else []
-    has_email = len(emails) > 0
-    has_phone = len(phones) > 0
-    if has_email and has_phone:
-        return 1.0
-    if has_email or has_phone:
-        return 0.5
-    return 0.0
+# Batch limits
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+MAX_BATCH_MEMBER_BYTES = int(os.getenv("MAX_BATCH_MEMBER_BYTES", str(10 * 1024 * 1024)))
 
+log.info("USING NLP BACKEND (spaCy + TF-IDF)")
+log.info("RUNNING FROM: %s", os.path.abspath(__file__))
 
-def _education_score(text: str) -> float:
-    """Simple education matching heuristics (bachelor/master/phd -> 1.0, diploma -> 0.6, none -> 0)."""
-    t = text.lower()
-    if re.search(r'\b(phd|doctorate)\b', t):
-        return 1.0
-    if re.search(r'\b(master|msc|m\.sc|mtech|m\.tech|mba)\b', t):
-        return 1.0
-    if re.search(r'\b(bachelor|bsc|b\.sc|btech|b\.tech|bachelor of technology|bachelor of science)\b', t):
-        return 1.0
-    if re.search(r'\b(diploma|associate|certificate)\b', t):
-        return 0.6
-    return 0.0
 
+# Analysis engine warm-up state, reported by /ready
+engine_state = {"ready": False, "error": None, "started_at": None, "warmed_at": None}
 
-def _formatting_quality(text: str) -> float:
-    """Heuristic formatting score (0-1). Checks length, presence of many short lines, and non-printables."""
-    if not text:
-        return 0.0
 
-    # Remove long whitespace
-    clean = re.sub(r'\s+', ' ', text).strip()
-    words = clean.split()
-    words_count = len(words)
+def warm_engine():
+    """
+    Vectorise job roles and map the job catalog (importing scikit-learn) in this
+    process, then spawn the analysis workers so they fork with both already
+    loaded (blocking).
+    """
+    index = get_role_index()
+    log.info("Role index ready: version %s, %d roles", index.version, len(index.roles))
+    catalog = get_job_catalog()
+    if catalog is not None:
+        log.info("Job catalog ready: version %s, %d postings x %d dims (memory-mapped)",
+                 catalog.version, len(catalog), catalog.embeddings.shape[1])
+    warm_process_pool()
+    log.info("Analysis pool ready: %d workers, max %d in flight", ANALYSIS_WORKERS, ANALYSIS_MAX_IN_FLIGHT)
 
-    # Basic length heuristic
-    length_score = 1.0 if words_count >= 300 else (0.6 if words_count >= 150 else 0.3)
 
-    # Check for many short lines (bad formatting) - penalize if too many short lines
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    short_lines = sum(1 for ln in lines if len(ln.split()) <= 3)
-    if lines:
-        short_ratio = short_lines / len(lines)
-    else:
-        short_ratio = 0.0
+async def _warm_engine_in_background():
+    try:
+        await asyncio.to_thread(warm_engine)
+        engine_state["warmed_at"] = time.time()
+        engine_state["ready"] = True
+    except Exception as e:
+        engine_state["error"] = f"{type(e).__name__}: {e}"
+        logging.error(f"Engine warm-up failed: {traceback.format_exc()}")
 
-    short_penalty = max(0.0, 1.0 - short_ratio * 1.5)  # if many short lines, reduce
 
-    # Check non-printable / weird characters
-    nonprintables = len(re.findall(r'[^\x00-\x7F]', text))
-    nonprint_penalty = 1.0 if nonprintables == 0 else max(0.0, 1.0 - (nonprintables / 50.0))
+@app.on_event("startup")
+async def start_engine_warm_up():
+    """Start serving at once; heavy imports and worker spawn happen in the background."""
+    engine_state["started_at"] = time.time()
+    engine_state["task"] = asyncio.create_task(_warm_engine_in_background())
 
-    score = length_score * 0.6 + short_penalty * 0.25 + nonprint_penalty * 0.15
-    return max(0.0, min(1.0, score))
 
+@app.on_event("shutdown")
+def stop_worker_pool():
+    shutdown_process_pool()
 
-def _keyword_density_score(skills_list: list, text: str) -> float:
-    """
-    Keyword density heuristic:
-    - number of unique skills found vs expected (we treat top 10 skills as ideal).
-    - scaled to 0-1
-    """
-    if not skills_list:
-        return 0.0
-    unique_skills = { (s.get("skill") if isinstance(s, dict) else str(s)).lower() for s in skills_list }
-    found = len(unique_skills)
-    # ideal target is 10 unique relevant skills
-    return min(1.0, found / 10.0)
 
+# ------------------------------------------------------
+# SEND EMAIL ENDPOINT (CONTACT FORM)
+# ------------------------------------------------------
+def mail_password() -> str:
+    """App_password from the environment, else the encrypted password file."""
+    return os.getenv("App_password") or get_decrypted_gmail_password()
 
-def _skill_match_score(skills_list: list) -> float:
-    """
-    Skill match based on avg confidence (if provided) or presence.
-    Expect skills_list to be a list of dicts: [{"skill":"python","confidence":80}, ...]
-    """
-    if not skills_list:
-        return 0.0
-
-    confidences = []
-    for s in skills_list:
-        if isinstance(s, dict):
-            c = s.get("confidence")
-            if isinstance(c, (int, float)):
-                confidences.append(max(0.0, min(100.0, float(c))))
-            else:
-                # if confidence not present, assume moderate (60)
-                confidences.append(60.0)
-        else:
-            confidences.append(60.0)
 
-    avg_conf = sum(confidences) / len(confidences)
-    return max(0.0, min(1.0, avg_conf / 100.0))
+# Contact-form mail is sent by one background worker over a reused SMTP session
+mail_dispatcher = MailDispatcher(YOUR_EMAIL, mail_password)
 
+REGISTRY.register(Gauge(
+    "mail_queue_depth", "Contact-form messages waiting to be sent.",
+    function=lambda: mail_dispatcher.stats()["waiting"],
+))
 
-def calculate_ats_score(skills_list: list, text: str, entities: dict = None) -> tuple:
-    """
-    Returns (ats_score_int, breakdown_dict)
-    breakdown values are floats in [0,1].
-    Weights:
-      skill_match: 50%
-      keyword_density: 20%
-      contact: 10%
-      education: 10%
-      formatting: 10%
-    """
-    entities = entities or {}
-    # Sub-scores 0..1
-    skill_match = _skill_match_score(skills_list)
-    keyword_density = _keyword_density_score(skills_list, text)
-    contact = _has_contact(entities)
-    education = _education_score(text)
-    formatting = _formatting_quality(text)
-
-    # weights
-    w_skill = 0.50
-    w_keyword = 0.20
-    w_contact = 0.10
-    w_edu = 0.10
-    w_format = 0.10
-
-    overall = (skill_match * w_skill +
-               keyword_density * w_keyword +
-               contact * w_contact +
-               education * w_edu +
-               formatting * w_format)
-
-    ats_score = int(round(overall * 100))
-
-    breakdown = {
-        "skill_match": round(skill_match, 2),
-        "keyword_coverage": round(keyword_density, 2),
-        "contact_score": round(contact, 2),
-        "education_score": round(education, 2),
-        "formatting_score": round(formatting, 2),
-    }
 
-    return ats_score, breakdown
+@app.on_event("startup")
+def start_mail_dispatcher():
+    mail_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def stop_mail_dispatcher():
+    mail_dispatcher.stop()
 
 
-# ------------------------------------------------------
-# SEND EMAIL ENDPOINT (CONTACT FORM)
-# ------------------------------------------------------
 @app.post("/send_email")
-def send_email(data: ContactForm):
-    try:
-        APP_PASSWORD = os.getenv("App_password")
+async def send_email(data: ContactForm):
+    """Queue the message and return at once; delivery happens in the background."""
+    if not YOUR_EMAIL:
+        return {"success": False, "message": "Failed to send email: Email is not configured"}
 
-        msg = MIMEMultipart()
-        msg["From"] = YOUR_EMAIL
-        msg["To"] = YOUR_EMAIL
-        msg["Subject"] = f"New Contact Form Message from {data.name}"
+    msg = MIMEMultipart()
+    msg["From"] = YOUR_EMAIL
+    msg["To"] = YOUR_EMAIL
+    msg["Subject"] = f"New Contact Form Message from {data.name}"
 
-        body = f"""
+    body = f"""
 New message from ElevateCV Contact Form:
 
 Name: {data.name}
@@ -261,21 +373,15 @@ Message:
 {data.message}
         """
 
-        msg.attach(MIMEText(body, "plain"))
-
-        # Add timeout so endpoint doesn't freeze
-        server = smtplib.SMTP("smtp.gmail.com", 587, timeout=10)
-        server.starttls()
-
-        server.login(YOUR_EMAIL, APP_PASSWORD)
-        server.sendmail(YOUR_EMAIL, YOUR_EMAIL, msg.as_string())
-        server.quit()
+    msg.attach(MIMEText(body, "plain"))
 
-        return {"success": True, "message": "Email sent successfully"}
+    try:
+        mail_dispatcher.enqueue(YOUR_EMAIL, [YOUR_EMAIL], msg.as_string())
+    except MailQueueFull as e:
+        log.error("Email error: %s", e)
+        return {"success": False, "message": "Failed to send email: too many messages queued, try again later"}
 
-    except Exception as e:
-        print("Email error:", e)
-        return {"success": False, "message": f"Failed to send email: {str(e)}"}
+    return {"success": True, "message": "Email queued for delivery"}
 
 
 # ------------------------------------------------------
@@ -283,82 +389,712 @@ Message:
 # ------------------------------------------------------
 @app.post("/test_upload")
 async def test_upload(file: UploadFile = File(...)):
-    print("📥 TEST UPLOAD:", file.filename)
+    log.info("📥 TEST UPLOAD: %s", file.filename)
     return {"filename": file.filename}
 
 
 # ------------------------------------------------------
 # RESUME ANALYZER ENDPOINT
 # ------------------------------------------------------
-@app.post("/analyze_resume")
-async def analyze_resume(file: UploadFile = File(...)):
+def _saturated(detail: str = "Analysis capacity exhausted, retry shortly") -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(ANALYSIS_RETRY_AFTER)},
+    )
+
+
+async def within_deadline(awaitable, deadline: Optional[Deadline]):
+    """
+    Await `awaitable`, giving up with 503 once `deadline` has passed. Work still
+    queued for the pool is cancelled; work already running finishes unobserved.
+    """
+    if deadline is None:
+        return await awaitable
     try:
-        print("\n=====================================")
-        print("Resume received for analysis")
-        print("=====================================")
-
-        # Sanitize filename
-        safe_filename = re.sub(r'[^a-zA-Z0-9.-]', '_', file.filename)
-        temp_filename = f"{uuid.uuid4()}_{safe_filename}"
-        temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-
-        print(f"Saving file to: {temp_path}")
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        print("Extracting text...")
-        raw_text = extract_text_from_file(temp_path, file.filename)
-        print(f"Extraction complete. Length: {len(raw_text)}")
-        raw_text = normalize_text(raw_text)
-
-        if not raw_text.strip():
-            os.remove(temp_path)
-            raise HTTPException(status_code=400, detail="Could not extract resume text")
-
-        print("Extracted Resume Preview:")
-        print(raw_text[:300], "...\n")
-
-        os.remove(temp_path)
-
-        print("Running Local NLP Analysis...")
-        
-        # 1. Extract Entities
-        entities = extract_basic_entities(raw_text)
-        
-        # 2. Extract Skills
-        skills_list = extract_skills(raw_text)
-        
-        # 3. Job Recommendations
-        job_recs = recommend_jobs_via_embeddings(raw_text, top_k=5)
-        
-        # 4. ATS Score
-        ats_score, breakdown = calculate_ats_score(skills_list, raw_text, entities)
-        
-        # 5. Build JSON Response
-        response = {
-            "overall_score": ats_score,
-            "ats_score": ats_score,
-            "ats_breakdown": breakdown,
-            "key_metrics": {
-                "keyword_density": breakdown.get("keyword_coverage", 0),
-                "formatting_clarity": breakdown.get("formatting_score", 0)
-            },
-            "skills_proficiency": skills_list,
-            "job_recommendations": job_recs,
-            "entities": entities,
-            "summary": "This resume has been analyzed locally. Consider optimizing your formatting and ensuring relevant keywords are present for better ATS compatibility."
-        }
-
-        print("LOCAL NLP RESULT SENT TO FRONTEND")
-        return response
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except asyncio.TimeoutError:
+        raise _saturated("Analysis deadline exceeded, retry shortly")
+
+
+async def wait_for_engine():
+    """
+    Hold analysis work until the background warm-up has finished. Workers are
+    forked, and forking while the warm-up thread is half-way through importing
+    scikit-learn would leave the child blocked on that import's lock.
+    """
+    task = engine_state.get("task")
+    if task is not None and not task.done():
+        await asyncio.shield(task)
+
+
+async def run_in_pool(fn, *args):
+    """Run a picklable function on the analysis pool without blocking the event loop."""
+    await wait_for_engine()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_process_pool(), fn, *args)
+    except BrokenProcessPool:
+        reset_process_pool()
+        raise
+
+
+async def prepare_across_pool(source, filename: str, progress=None, budget=None, profile=None, plan=None):
+    """
+    Large PDFs: page ranges are spread over every worker while a thread here
+    merges them in order and computes the signature (that thread is what a
+    `profile` captures).
+    """
+    await wait_for_engine()
+    try:
+        return await asyncio.to_thread(
+            *profiled_call(profile, "prepare", prepare_source, source, filename, budget, progress,
+                           get_process_pool(), plan)
+        )
+    except BrokenProcessPool:
+        reset_process_pool()
+        raise
+
+
+def analyses_ahead() -> int:
+    """Queue depth seen by the overload controller: interactive analyses plus running jobs."""
+    return analysis_limiter.in_flight + len(job_state["running"])
+
+
+def observe_latency(mode: str, timings: dict):
+    overload.observe(mode, timings)
+    OVERLOAD_EXPECTED_SECONDS.set(overload.expected_seconds(mode), mode=mode)
+
+
+async def analyse_upload(resume_id: str, source, filename: str, size: int, key: str,
+                         limiter: InFlightLimiter = None, progress=None, deadline: Deadline = None,
+                         profile=None):
+    """
+    Extract, look for a near-duplicate, analyse (or reuse) and record one upload.
+    The format is sniffed first, so unsupported files fail (UnsupportedFormatError)
+    before taking a worker. `limiter` is held while the workers are busy (503
+    when full); `progress` is a picklable stage callback run inside the workers.
+    With a `deadline` the overload controller picks full or degraded analysis
+    (or rejects with 503), and pool work is abandoned once the deadline passes.
+    With a `profile` (utils.profiling) both pool stages run under cProfile and
+    a near-duplicate's analysis is not reused.
+    Returns (result, outcome) with outcome "analysed", "degraded" or "reused".
+    """
+    mode = NORMAL
+    budget = None
+    if deadline is not None:
+        mode = overload.decide(analyses_ahead(), deadline)
+        if mode == REJECT:
+            raise _saturated()
+        budget = overload.extraction_budget(mode, deadline)
+
+    try:
+        plan = await asyncio.to_thread(plan_extraction, source, filename, budget)
+    except UnsupportedFormatError as e:
+        e.pipeline_stage = "format"
+        raise
+
+    if limiter is not None and not limiter.try_acquire():
+        raise _saturated()
+    try:
+        log.debug("Extracting text and running Local NLP Analysis...")
+        if plan.parallel and ANALYSIS_WORKERS > 1:
+            prepared = await within_deadline(
+                prepare_across_pool(source, filename, progress, budget, profile, plan), deadline
+            )
+        else:
+            prepared = await within_deadline(
+                run_in_pool(*profiled_call(profile, "prepare", prepare_source, source, filename, budget, progress,
+                                           None, plan)),
+                deadline
+            )
+        observe_extraction(filename, size, prepared["extraction"])
+        observe_stages(prepared["timings"])
+        log_preview(log, filename, prepared["text"])
+        match = await asyncio.to_thread(find_near_duplicate, resume_id, prepared["signature"])
+
+        result = None
+        reused = False
+        if match and NEAR_DUP_REUSE and match["cache_key"] and profile is None:
+            result = await asyncio.to_thread(result_cache.get, match["cache_key"])
+            if result is not None:
+                log.info("Near-duplicate of %s, reusing its analysis", match["resume_id"])
+                result["extraction"] = prepared["extraction"]
+                reused = True
+        if result is None:
+            if deadline is not None:
+                mode = overload.downgrade(mode, deadline)
+            result = await within_deadline(
+                run_in_pool(*profiled_call(profile, "analyze", analyze_prepared, prepared, progress, mode == DEGRADED)),
+                deadline
+            )
+            timings = result.pop("timings")
+            observe_stages(timings)
+            observe_latency(mode, {**prepared["timings"], **timings})
+            observe_sections(result.pop("section_cache", None))
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+    result["resume_id"] = resume_id
+    result.pop("near_duplicate", None)
+    if match:
+        mark_near_duplicate(result, match, reused)
+    await asyncio.to_thread(record_analysis, resume_id, filename, result, prepared["signature"], key)
+    if reused:
+        return result, "reused"
+    return result, "degraded" if result.get("degraded") else "analysed"
+
+
+def _selected_fields(fields: Optional[str]) -> Optional[tuple]:
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/analyze_resume", response_model=AnalysisResponse, response_model_exclude_none=True)
+async def analyze_resume(request: Request, file: UploadFile = File(...), previous_id: Optional[str] = None,
+                         fields: Optional[str] = None):
+    """
+    Analyse one resume. With `previous_id` (the `resume_id` of an earlier
+    analysis) the response gains a `revision` block: which sections changed,
+    were added or removed, and how the ATS score, sub-scores and skills moved.
+    Unchanged sections reuse their cached features.
+
+    The request must finish within its deadline (`X-Deadline-Ms`, capped at
+    ANALYSIS_DEADLINE_SECONDS). Under load the response may be `degraded`:
+    extraction capped and no job recommendations. Degraded results are not
+    cached. When even that cannot meet the deadline the answer is 503.
+
+    `fields` (e.g. "skills,ats") returns only those groups; large responses
+    are gzip/br compressed when the client accepts it.
+
+    Profiled requests (`X-Profile: <PROFILE_TOKEN>`, or sampled at
+    PROFILE_SAMPLE_RATE) bypass the result cache and answer with an
+    `X-Profile-Id` header; see GET /profiles.
+    """
+    selected = _selected_fields(fields)
+    deadline = request_deadline(request.headers.get(DEADLINE_HEADER))
+    profile = start_profile(file.filename or "") if should_profile(request.headers.get(PROFILE_HEADER)) else None
+    outcome = "cached"
+    previous = None
+    if previous_id:
+        previous = await asyncio.to_thread(section_store.get_resume, previous_id)
+        if previous is None:
+            raise HTTPException(status_code=404, detail="Unknown previous_id")
+    try:
+        log.info("Resume received for analysis: %s", file.filename)
+
+        async with ingest_upload(file) as upload:
+            key = result_cache.key_for_digest(upload.sha256, upload.filename)
+
+            async def compute():
+                nonlocal outcome
+                result, outcome = await analyse_upload(
+                    upload.sha256, upload.source, upload.filename, upload.size, key,
+                    limiter=analysis_limiter, deadline=deadline, profile=profile
+                )
+                return result
+
+            if profile is not None:
+                # A cache hit would leave nothing to profile
+                response = await compute()
+            else:
+                response = await result_cache.get_or_compute(
+                    key, compute, cacheable=lambda result: not result.get("degraded")
+                )
+
+        ANALYSES.inc(file_type=file_type(file.filename), outcome=outcome)
+        if previous is not None:
+            response = {**response, "revision": diff_analyses(previous, response)}
+        log.debug("LOCAL NLP RESULT SENT TO FRONTEND")
+        reply = json_response(shape_response(response, selected), request.headers.get("accept-encoding"))
+        if profile is not None:
+            reply.headers[PROFILE_ID_HEADER] = profile.profile_id
+        return reply
+
+    except HTTPException as e:
+        if e.status_code == 503:
+            ANALYSES.inc(file_type=file_type(file.filename), outcome="rejected")
+        raise
+
+    except EmptyResumeError as e:
+        record_error(file.filename, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except UnsupportedFormatError as e:
+        record_error(file.filename, e)
+        raise HTTPException(status_code=415, detail=f"Unsupported file: {e}")
 
     except Exception as e:
+        record_error(file.filename, e)
         error_msg = traceback.format_exc()
         logging.error(f"General Analysis Error: {error_msg}")
-        print(error_msg)
+        log.debug(error_msg)
         raise HTTPException(status_code=500, detail=f"Server Error: {str(e)}")
 
 
+# ------------------------------------------------------
+# BATCH RESUME ANALYZER (NDJSON STREAM)
+# ------------------------------------------------------
+def _error_item(index: int, filename: str, message: str) -> dict:
+    return {"index": index, "filename": filename, "status": "error", "error": message}
+
+
+def _ndjson_line(item: dict, selected: Optional[tuple] = None) -> bytes:
+    if "result" in item:
+        item = {**item, "result": shape_response(item["result"], selected)}
+    return dumps(item) + b"\n"
+
+
+async def _open_batch_archive(files: List[UploadFile]) -> Optional[zipfile.ZipFile]:
+    """The archive when the upload is a single ZIP, else None; raises BadZipFile if it is corrupt."""
+    if len(files) != 1:
+        return None
+    upload = files[0]
+    head = await upload.read(4)
+    await upload.seek(0)
+    if head != b"PK\x03\x04" or not (upload.filename or "").lower().endswith(".zip"):
+        return None
+    return zipfile.ZipFile(io.BytesIO(await upload.read()))
+
+
+async def _iter_batch_items(files: List[UploadFile], archive: Optional[zipfile.ZipFile] = None):
+    """Yield (index, filename, bytes | None, error | None) for each resume in the upload."""
+    index = 0
+
+    if archive is not None:
+        # A single ZIP archive: every regular member is one resume
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or not base or base.startswith(".") or name.startswith("__MACOSX/"):
+                continue
+            if index >= MAX_BATCH_FILES:
+                yield index, name, None, f"Batch limit of {MAX_BATCH_FILES} files exceeded"
+                return
+            if info.file_size > MAX_BATCH_MEMBER_BYTES:
+                yield index, name, None, f"File exceeds {MAX_BATCH_MEMBER_BYTES} bytes"
+            else:
+                try:
+                    yield index, name, archive.read(info), None
+                except Exception as e:
+                    yield index, name, None, f"Could not read archive member: {e}"
+            index += 1
+        return
+
+    for upload in files:
+        if index >= MAX_BATCH_FILES:
+            yield index, upload.filename, None, f"Batch limit of {MAX_BATCH_FILES} files exceeded"
+            return
+        data = await upload.read(MAX_BATCH_MEMBER_BYTES + 1)
+        if len(data) > MAX_BATCH_MEMBER_BYTES:
+            yield index, upload.filename, None, f"File exceeds {MAX_BATCH_MEMBER_BYTES} bytes"
+        else:
+            yield index, upload.filename, data, None
+        index += 1
+
+
+async def _stream_batch(files: List[UploadFile], selected: Optional[tuple] = None,
+                        archive: Optional[zipfile.ZipFile] = None):
+    """
+    Fan items out over the process pool and yield one NDJSON line as each finishes.
+    Releases the batch's in-flight slot when the stream ends, fails or is cancelled.
+    """
+    try:
+        await wait_for_engine()
+        loop = asyncio.get_running_loop()
+        window = max(1, ANALYSIS_WORKERS * 2)
+        pending = {}
+        items = _iter_batch_items(files, archive)
+        exhausted = False
+
+        while True:
+            # Keep at most `window` items in flight so a huge archive is not all in memory at once
+            while not exhausted and len(pending) < window:
+                try:
+                    index, filename, data, error = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                if error:
+                    yield _ndjson_line(_error_item(index, filename, error))
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                key = result_cache.key_for_digest(digest, filename)
+                cached = await asyncio.to_thread(result_cache.get, key)
+                if cached is not None:
+                    item = {"index": index, "filename": filename, "status": "ok", "result": cached}
+                    ANALYSES.inc(file_type=file_type(filename), outcome="cached")
+                    yield _ndjson_line(item, selected)
+                    continue
+                future = loop.run_in_executor(get_process_pool(), analyze_batch_item, index, filename, data)
+                pending[future] = (index, filename, key, digest, len(data))
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index, filename, key, digest, size = pending.pop(future)
+                try:
+                    item = future.result()
+                    if item["status"] != "ok":
+                        record_error(filename, stage=item["stage"])
+                    else:
+                        observe_extraction(filename, size, item["result"]["extraction"])
+                        observe_stages(item.pop("timings"))
+                        observe_sections(item["result"].pop("section_cache", None))
+                        ANALYSES.inc(file_type=file_type(filename), outcome="analysed")
+                        signature = item.pop("signature")
+                        item["result"]["resume_id"] = digest
+                        match = await asyncio.to_thread(find_near_duplicate, digest, signature)
+                        if match:
+                            mark_near_duplicate(item["result"], match)
+                        await asyncio.to_thread(result_cache.put, key, item["result"])
+                        await asyncio.to_thread(record_analysis, digest, filename, item["result"], signature, key)
+                except BrokenProcessPool:
+                    reset_process_pool()
+                    record_error(filename, stage="worker")
+                    item = _error_item(index, filename, "Worker process crashed")
+                except Exception as e:
+                    record_error(filename, e)
+                    item = _error_item(index, filename, f"{type(e).__name__}: {e}")
+                yield _ndjson_line(item, selected)
+    finally:
+        analysis_limiter.release()
+
+
+@app.post("/analyze_resumes/batch")
+async def analyze_resumes_batch(files: List[UploadFile] = File(...), fields: Optional[str] = None):
+    """
+    Analyse many resumes (several files, or one ZIP archive) in parallel.
+    Streams one JSON object per line in completion order; each carries its
+    upload `index`, `filename` and either `result` or `error`.
+    `fields` selects result fields as for /analyze_resume.
+    The whole batch occupies one in-flight slot.
+    """
+    selected = _selected_fields(fields)
+    try:
+        archive = await _open_batch_archive(files)
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {e}")
+    if not analysis_limiter.try_acquire():
+        raise _saturated()
+    return StreamingResponse(_stream_batch(files, selected, archive), media_type="application/x-ndjson")
+
+
+# ------------------------------------------------------
+# ASYNC JOBS (DURABLE QUEUE + SSE PROGRESS)
+# ------------------------------------------------------
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "0")) or ANALYSIS_WORKERS
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_EVENT_POLL_SECONDS = 0.25
+JOB_EVENT_KEEPALIVE_SECONDS = 15
+
+# Identifies this process's leases; another process only takes over a job once its lease expires
+JOB_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+job_queue = JobQueue()
+job_state = {"dispatcher": None, "wakeup": None, "running": {}}
+
+REGISTRY.register(Gauge(
+    "jobs_running", "Jobs this process is currently running.",
+    function=lambda: len(job_state["running"]),
+))
+REGISTRY.register(Gauge(
+    "jobs_queued", "Jobs waiting in the durable queue (all processes).",
+    function=lambda: job_queue.counts().get("queued", 0),
+))
+
+
+async def _run_job(job: dict):
+    job_id = job["id"]
+    filename = job["filename"]
+    # runs inside the worker: stage events go straight to the job database
+    progress = functools.partial(record_job_progress, job_queue.db_path, job_id)
+    try:
+        key = result_cache.key_for_digest(job["sha256"], filename)
+
+        async def compute():
+            result, outcome = await analyse_upload(
+                job["sha256"], job["upload_path"], filename, job["size"], key, progress=progress
+            )
+            ANALYSES.inc(file_type=file_type(filename), outcome=outcome)
+            return result
+
+        result = await result_cache.get_or_compute(key, compute)
+        await asyncio.to_thread(job_queue.complete, job_id, JOB_OWNER, result)
+    except (EmptyResumeError, UnsupportedFormatError) as e:
+        record_error(filename, e)
+        await asyncio.to_thread(job_queue.fail, job_id, JOB_OWNER, str(e), False)
+    except BrokenProcessPool:
+        record_error(filename, stage="worker")
+        await asyncio.to_thread(job_queue.fail, job_id, JOB_OWNER, "Worker process crashed", True)
+    except Exception as e:
+        record_error(filename, e)
+        logging.error(f"Job {job_id} failed: {traceback.format_exc()}")
+        await asyncio.to_thread(job_queue.fail, job_id, JOB_OWNER, f"{type(e).__name__}: {e}", True)
+
+
+async def _job_dispatcher():
+    """Claim runnable jobs up to JOB_CONCURRENCY, keep their leases fresh, repeat."""
+    running = job_state["running"]
+    wakeup = job_state["wakeup"]
+    last_renewal = 0.0
+    while True:
+        try:
+            while len(running) < JOB_CONCURRENCY:
+                job = await asyncio.to_thread(job_queue.claim, JOB_OWNER)
+                if job is None:
+                    break
+                log.info("Job %s started (attempt %d): %s", job["id"], job["attempts"], job["filename"])
+                running[job["id"]] = asyncio.create_task(_run_job(job))
+
+            for job_id in [j for j, task in running.items() if task.done()]:
+                running.pop(job_id)
+
+            if running and time.monotonic() - last_renewal >= job_queue.lease_seconds / 3:
+                await asyncio.to_thread(job_queue.renew, list(running), JOB_OWNER)
+                last_renewal = time.monotonic()
+
+            wakeup.clear()
+            waiter = asyncio.create_task(wakeup.wait())
+            try:
+                await asyncio.wait(
+                    [waiter, *running.values()],
+                    # wake often enough to renew leases before they lapse
+                    timeout=min(JOB_POLL_SECONDS, job_queue.lease_seconds / 3),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                waiter.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.error(f"Job dispatcher error: {traceback.format_exc()}")
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+@app.on_event("startup")
+async def start_job_dispatcher():
+    job_state["wakeup"] = asyncio.Event()
+    job_state["dispatcher"] = asyncio.create_task(_job_dispatcher())
+
+
+@app.on_event("shutdown")
+async def stop_job_dispatcher():
+    tasks = [job_state["dispatcher"], *job_state["running"].values()]
+    for task in tasks:
+        if task is not None:
+            task.cancel()
+    await asyncio.gather(*[t for t in tasks if t is not None], return_exceptions=True)
+    released = await asyncio.to_thread(job_queue.release_owned, JOB_OWNER)
+    if released:
+        log.info("Requeued %d unfinished job(s) for the next start", released)
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(file: UploadFile = File(...)):
+    """
+    Store the upload and queue it for analysis; returns at once with a job ID.
+    Poll GET /jobs/{job_id} or stream GET /jobs/{job_id}/events for progress.
+    """
+    job_id, path = job_queue.new_upload_path(file.filename)
+    sha256, size = await store_upload(file, path)
+    try:
+        await asyncio.to_thread(resolve_extractor, path, file.filename)
+    except UnsupportedFormatError as e:
+        os.remove(path)
+        record_error(file.filename, e, stage="format")
+        raise HTTPException(status_code=415, detail=f"Unsupported file: {e}")
+    job = await asyncio.to_thread(job_queue.create, job_id, file.filename, path, sha256, size)
+    job_state["wakeup"].set()
+    return {
+        **job,
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+    }
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, request: Request, include_result: bool = True, fields: Optional[str] = None):
+    """Job status; a finished job's `result` is shaped by `fields` as for /analyze_resume."""
+    selected = _selected_fields(fields)
+    job = job_queue.get(job_id, include_result=include_result)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job_id")
+    if job.get("result") is not None:
+        job["result"] = shape_response(job["result"], selected)
+    return json_response(job, request.headers.get("accept-encoding"))
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """
+    Server-sent events, one per stage (queued, started, extract, ..., done/failed).
+    Reconnecting clients resume after the `Last-Event-ID` they saw.
+    """
+    if await asyncio.to_thread(job_queue.get, job_id, False) is None:
+        raise HTTPException(status_code=404, detail="Unknown job_id")
+    try:
+        last_seq = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_seq = 0
+
+    async def stream():
+        nonlocal last_seq
+        idle = 0.0
+        while True:
+            events = await asyncio.to_thread(job_queue.events, job_id, last_seq)
+            for event in events:
+                last_seq = event["seq"]
+                yield f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+                if event["stage"] in TERMINAL_STATES:
+                    return
+            if events:
+                idle = 0.0
+            elif idle >= JOB_EVENT_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(JOB_EVENT_POLL_SECONDS)
+            idle += JOB_EVENT_POLL_SECONDS
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ------------------------------------------------------
+# ATS WHAT-IF RE-RANKING
+# ------------------------------------------------------
+@app.post("/ats/rerank")
+def rerank_resumes(req: RerankRequest):
+    """
+    Re-score every previously analysed resume (or `resume_ids`) under one or more
+    weight profiles without re-parsing files. With default weights the scores
+    equal the `ats_score` returned at analysis time.
+    """
+    profiles = dict(req.profiles or {})
+    if req.weights is not None:
+        profiles["custom"] = req.weights
+    if not profiles:
+        profiles["default"] = ATS_WEIGHTS
+
+    try:
+        weights = weight_matrix(profiles.values())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    ids, filenames, features = feature_store.matrix()
+    if req.resume_ids is not None:
+        wanted = set(req.resume_ids)
+        rows = [i for i, rid in enumerate(ids) if rid in wanted]
+        ids = [ids[i] for i in rows]
+        filenames = [filenames[i] for i in rows]
+        features = features[rows]
+
+    scores = score_matrix(features, weights)  # (N, P)
+    top_k = max(0, req.top_k)
+
+    rankings = {}
+    for p, name in enumerate(profiles):
+        column = scores[:, p]
+        order = np.argsort(-column, kind="stable")[:top_k]
+        rankings[name] = [
+            {"resume_id": ids[i], "filename": filenames[i], "ats_score": int(column[i])}
+            for i in order
+        ]
+
+    return {"resumes_scored": len(ids), "rankings": rankings}
+
+
+# ------------------------------------------------------
+# CANDIDATE SEARCH
+# ------------------------------------------------------
+@app.get("/candidates/search")
+def search_candidates(q: str, rank: str = "confidence", top_k: int = 20):
+    """
+    Boolean skill search over every analysed resume, e.g.
+    q=python AND docker AND NOT java, ranked by summed skill confidence or ATS score.
+    """
+    try:
+        return candidate_index.search(q, rank=rank, top_k=top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.delete("/candidates/{resume_id}")
+def delete_candidate(resume_id: str):
+    removed = candidate_index.delete(resume_id)
+    feature_store.delete(resume_id)
+    section_store.delete_resume(resume_id)
+    if near_duplicates is not None:
+        near_duplicates.remove(resume_id)
+    if not removed:
+        raise HTTPException(status_code=404, detail="Unknown resume_id")
+    return {"deleted": resume_id}
+
+
+# ------------------------------------------------------
+# RESULT CACHE ADMIN
+# ------------------------------------------------------
+@app.get("/cache/stats")
+def cache_stats():
+    return result_cache.stats()
+
+
+@app.post("/cache/invalidate")
+def cache_invalidate(everything: bool = False):
+    """
+    Call after editing COMMON_SKILLS, JOB_ROLES or ATS_WEIGHTS (or pass everything=true).
+    Other uvicorn workers drop their memory tier too when RESULT_CACHE_DB is
+    set; without the disk tier this only clears the worker that handles it.
+    """
+    return result_cache.invalidate(everything=everything)
+
+
+# ------------------------------------------------------
+# PROFILES ADMIN
+# ------------------------------------------------------
+def require_profile_token(request: Request):
+    """Profiles name uploads: 404 unless PROFILE_TOKEN is set, 403 without it in X-Profile."""
+    if not PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is not configured")
+    if not is_trusted(request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(status_code=403, detail="Missing or invalid profile token")
+
+
+@app.get("/profiles")
+def profiles(request: Request, limit: int = 20):
+    """Newest saved profile stages with their top functions by self time."""
+    require_profile_token(request)
+    return {"profiles": list_profiles(max(1, min(limit, 200)))}
+
+
+@app.get("/profiles/{name}")
+def download_profile(request: Request, name: str):
+    """The raw pstats file for one stage (`name` from GET /profiles)."""
+    require_profile_token(request)
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Unknown profile")
+    return FileResponse(path, media_type="application/octet-stream", filename=name + ".prof")
+
+
+# ------------------------------------------------------
+# METRICS (PROMETHEUS TEXT FORMAT)
+# ------------------------------------------------------
+@app.get("/metrics")
+def metrics():
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # ------------------------------------------------------
 # ROOT & HEALTH CHECK
 # ------------------------------------------------------
@@ -370,3 +1106,19 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "service": "ElevateCV NLP Backend"}
+
+
+@app.get("/ready")
+def readiness_check():
+    """200 once the role index is loaded and analysis workers are up, else 503."""
+    body = {
+        "ready": engine_state["ready"],
+        "error": engine_state["error"],
+        "warm_up_seconds": (
+            round(engine_state["warmed_at"] - engine_state["started_at"], 3)
+            if engine_state["warmed_at"] else None
+        ),
+    }
+    if not engine_state["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
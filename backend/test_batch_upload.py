@@ -0,0 +1,72 @@
+"""
+Batch endpoint edge cases: a corrupt or truncated ZIP is rejected up front and
+never holds an in-flight slot, and a good archive still streams its members.
+
+Runs the app in-process (no server needed). Run from backend/:
+    python test_batch_upload.py
+"""
+
+import io
+import json
+import os
+import sys
+import zipfile
+
+os.environ.setdefault("ANALYSIS_WORKERS", "1")
+
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import generate_resume
+
+failures = []
+
+
+def check(condition, label):
+    print(("OK   " if condition else "FAIL ") + label)
+    if not condition:
+        failures.append(label)
+
+
+def archive(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def post_batch(client, filename, body):
+    return client.post("/analyze_resumes/batch", files=[("files", (filename, body, "application/zip"))])
+
+
+good = archive({
+    "a.txt": generate_resume(300, 0.3, 1).txt(),
+    "b.txt": generate_resume(300, 0.3, 2).txt(),
+})
+
+with TestClient(main.app) as client:
+    # 1. Corrupt archives answer 400 and release nothing they never took
+    for label, body in {
+        "truncated archive": good[: len(good) // 2],
+        "zip header, garbage body": b"PK\x03\x04" + b"\x00" * 512,
+    }.items():
+        response = post_batch(client, "resumes.zip", body)
+        check(response.status_code == 400, f"{label}: status {response.status_code}")
+        check("Invalid ZIP archive" in response.text, f"{label}: error detail")
+        check(main.analysis_limiter.in_flight == 0, f"{label}: in-flight {main.analysis_limiter.in_flight}")
+
+    # 2. A valid archive streams one line per member and frees its slot
+    response = post_batch(client, "resumes.zip", good)
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    check(response.status_code == 200, f"valid archive: status {response.status_code}")
+    check(sorted(item["filename"] for item in lines) == ["a.txt", "b.txt"], "valid archive: one line per member")
+    check(all(item["status"] == "ok" for item in lines), "valid archive: members analysed")
+    check(main.analysis_limiter.in_flight == 0, f"valid archive: in-flight {main.analysis_limiter.in_flight}")
+
+if __name__ == "__main__":
+    if failures:
+        print(f"\n{len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\nAll batch upload checks passed")
+    sys.exit(0)
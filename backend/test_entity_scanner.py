@@ -0,0 +1,81 @@
+"""
+Adversarial inputs for the entity scanner: each must scan within a fixed
+wall-clock budget, and ordinary contact details must still be found.
+
+The old single-regex email pattern took seconds on a few tens of KB of these
+inputs (quadratic backtracking); the scanner is linear with capped work.
+Run from backend/:
+    python test_entity_scanner.py
+"""
+
+import sys
+import time
+
+from utils.document import AnalysedDocument
+from utils.entity_scanner import ENTITY_MAX_MATCHES, scan_entities
+
+SIZE = 1_000_000        # characters per adversarial input (before the scan cap)
+BUDGET_SECONDS = 0.25   # worst case allowed for one document
+
+ADVERSARIAL = {
+    "word run then @": "a" * SIZE + " @",
+    "@ then word run, no dot": "x@" + "a" * SIZE,
+    "dotted run then @": "a.-" * (SIZE // 3) + "@x",
+    "many @, no domains": "@a" * (SIZE // 2),
+    "@ every 60 chars": ("b" * 58 + "@.") * (SIZE // 60),
+    "valid-looking flood": "u@d.io " * (SIZE // 7),
+    "digit/dash run": "1-" * (SIZE // 2) + "x",
+    "digit/space table": "1 2 3 4 5 6 7 8 9 " * (SIZE // 18),
+    "digit then dashes": ("1" + "-" * 50 + "x") * (SIZE // 52),
+    "year ranges": "2015 - 2019 " * (SIZE // 12),
+    "capitalised flood": "Aaaa Bbbb " * (SIZE // 10),
+    "upper-case run": "A" * SIZE + "a",
+    "ocr garbage": "l1|.-_@0O " * (SIZE // 10),
+}
+
+failures = []
+
+
+def check(condition, label):
+    print(("OK   " if condition else "FAIL ") + label)
+    if not condition:
+        failures.append(label)
+
+
+# 1. Worst-case runtime stays within the budget
+for name, text in ADVERSARIAL.items():
+    started = time.perf_counter()
+    entities = scan_entities(text)
+    elapsed = time.perf_counter() - started
+    check(elapsed < BUDGET_SECONDS, f"{name:<26} {elapsed * 1000:7.1f} ms")
+    check(all(len(v) <= ENTITY_MAX_MATCHES for v in entities.values()), f"{name:<26} match counts capped")
+
+# 2. The full document path (normalisation + scan) is bounded too
+started = time.perf_counter()
+AnalysedDocument(ADVERSARIAL["dotted run then @"]).entities
+elapsed = time.perf_counter() - started
+check(elapsed < 4 * BUDGET_SECONDS, f"AnalysedDocument on 1 MB dotted run {elapsed * 1000:.1f} ms")
+
+# 3. Ordinary contact details are still extracted
+sample = (
+    "Jane Smith\n"
+    "jane.smith@example.com | +1 555-123-4567 | j_smith@mail.co.uk.\n"
+    "Software Engineer at ACME, 2015 - 2019. Version v1.2@3.4 is not an address.\n"
+    "Office: 020 7946 0958"
+)
+entities = scan_entities(sample)
+check(entities["emails"] == ["jane.smith@example.com", "j_smith@mail.co.uk"], f"emails {entities['emails']}")
+check(entities["phones"] == ["+1 555-123-4567", "020 7946 0958"], f"phones {entities['phones']}")
+check("Jane Smith" in entities["persons"], "person found")
+check(entities["organizations"] == ["ACME"], f"organizations {entities['organizations']}")
+
+# 4. Numbers that are not phones are rejected by the second pass
+entities = scan_entities("Revenue 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 16 17, period 2015 - 2019")
+check(entities["phones"] == [], f"no phones from tables or year ranges {entities['phones']}")
+
+if __name__ == "__main__":
+    if failures:
+        print(f"\n{len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\nAll entity scanner checks passed")
+    sys.exit(0)
@@ -0,0 +1,73 @@
+"""
+Checks that /health stays responsive while several heavy analyses run.
+
+Start the server first (uvicorn main:app --port 8000), then:
+    python test_health_under_load.py
+"""
+
+import sys
+import time
+import threading
+import requests
+
+BASE_URL = "http://127.0.0.1:8000"
+HEAVY_UPLOADS = 6
+HEALTH_BUDGET_SECONDS = 0.5
+HEAVY_COPIES = 20000
+
+# A large plain-text resume keeps the analysis pipeline busy for a while
+with open("dummy_resume.txt", "rb") as f:
+    resume = f.read().rstrip(b"\n") + b"\n"
+RUN_ID = time.time_ns()
+
+
+def heavy_resume(i: int) -> bytes:
+    """Unique per upload, per copy and per run, so neither the result cache's
+    single-flight nor the per-section feature cache collapses the work."""
+    return b"".join(resume + f"Ref {RUN_ID}-{i}-{n}\n".encode() for n in range(HEAVY_COPIES))
+
+
+analysis_status = []
+
+
+def post_heavy(i):
+    try:
+        files = {"file": (f"heavy_{i}.txt", heavy_resume(i))}
+        response = requests.post(f"{BASE_URL}/analyze_resume", files=files, timeout=300)
+        analysis_status.append(response.status_code)
+    except Exception as e:
+        analysis_status.append(str(e))
+
+
+try:
+    requests.get(f"{BASE_URL}/health", timeout=5).raise_for_status()
+except Exception as e:
+    print(f"Connection failed: {e}")
+    sys.exit(1)
+
+threads = [threading.Thread(target=post_heavy, args=(i,)) for i in range(HEAVY_UPLOADS)]
+for t in threads:
+    t.start()
+
+latencies = []
+while any(t.is_alive() for t in threads):
+    start = time.perf_counter()
+    requests.get(f"{BASE_URL}/health", timeout=10)
+    latencies.append(time.perf_counter() - start)
+    time.sleep(0.05)
+
+for t in threads:
+    t.join()
+
+latencies.sort()
+worst = latencies[-1] if latencies else 0.0
+p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+print(f"Heavy analyses: {analysis_status}")
+print(f"/health probes: {len(latencies)}, p95 {p95 * 1000:.1f} ms, max {worst * 1000:.1f} ms")
+
+if worst > HEALTH_BUDGET_SECONDS:
+    print(f"FAIL: /health exceeded {HEALTH_BUDGET_SECONDS * 1000:.0f} ms while analyses were running")
+    sys.exit(1)
+
+print("OK: /health stayed responsive")
+sys.exit(0)
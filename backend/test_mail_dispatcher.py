@@ -0,0 +1,176 @@
+"""
+Exercises the background mail dispatcher against a local SMTP stand-in.
+
+No real mail server or network access is needed; the stand-in below speaks
+just enough SMTP (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, QUIT) and can
+be told to drop the connection or reject messages. Run from backend/:
+    python test_mail_dispatcher.py
+"""
+
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+from utils.mailer import MailDispatcher
+
+
+class StandInState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.delivered = []
+        self.connections = 0
+        self.logins = 0
+        self.drop_after = None      # close the session after this many messages
+        self.temp_failures = 0      # answer the next N DATA commands with 451
+        self.reject_subject = None  # answer DATA with 550 for this subject
+
+
+state = StandInState()
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        with state.lock:
+            state.connections += 1
+        sent_here = 0
+        self.reply("220 stand-in ESMTP")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            cmd = raw.decode().strip()
+            verb = cmd.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-stand-in\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif verb == "AUTH":
+                with state.lock:
+                    state.logins += 1
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline().decode()
+                    if line in (".\r\n", ".\n", ""):
+                        break
+                    lines.append(line)
+                body = "".join(lines)
+                subject = next((ln.split(":", 1)[1].strip() for ln in lines if ln.startswith("Subject:")), "")
+                with state.lock:
+                    if state.temp_failures > 0:
+                        state.temp_failures -= 1
+                        self.reply("451 4.3.0 Try again later")
+                        continue
+                    if state.reject_subject and subject == state.reject_subject:
+                        self.reply("550 5.1.1 Mailbox unavailable")
+                        continue
+                    state.delivered.append(subject or body)
+                self.reply("250 OK queued")
+                sent_here += 1
+                if state.drop_after is not None and sent_here >= state.drop_after:
+                    return  # server-side disconnect without QUIT
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def message(subject: str) -> str:
+    return f"From: a@example.com\r\nTo: b@example.com\r\nSubject: {subject}\r\n\r\nHello\r\n"
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+failures = []
+
+
+def check(condition, label):
+    print(("OK   " if condition else "FAIL ") + label)
+    if not condition:
+        failures.append(label)
+
+
+server = StandInServer(("127.0.0.1", 0), StandInHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+host, port = server.server_address
+
+dead_letter = os.path.join(tempfile.mkdtemp(), "dead_letter.jsonl")
+password_calls = []
+
+
+def password():
+    password_calls.append(1)
+    return "app-password"
+
+
+dispatcher = MailDispatcher(
+    "a@example.com", password, host=host, port=port, starttls=False,
+    dead_letter_path=dead_letter, backoff=0.05, max_attempts=3, idle_seconds=30,
+)
+dispatcher.start()
+
+# 1. A burst is queued instantly and delivered over one authenticated session
+started = time.perf_counter()
+for i in range(25):
+    dispatcher.enqueue("a@example.com", ["b@example.com"], message(f"burst {i}"))
+enqueue_ms = (time.perf_counter() - started) * 1000
+check(enqueue_ms < 50, f"25 messages enqueued in {enqueue_ms:.1f} ms")
+check(wait_until(lambda: len(state.delivered) == 25), "burst delivered")
+check(state.connections == 1 and state.logins == 1, f"one connection/login for the burst ({state.connections}/{state.logins})")
+
+# 2. The server drops the session; the dispatcher reconnects and carries on
+state.drop_after = 1
+for i in range(3):
+    dispatcher.enqueue("a@example.com", ["b@example.com"], message(f"drop {i}"))
+check(wait_until(lambda: len(state.delivered) == 28), "delivered across server disconnects")
+check(state.connections > 1, f"reconnected ({state.connections} connections)")
+state.drop_after = None
+
+# 3. Temporary failures are retried with backoff
+state.temp_failures = 2
+dispatcher.enqueue("a@example.com", ["b@example.com"], message("retry me"))
+check(wait_until(lambda: "retry me" in state.delivered), "451 retried until delivered")
+check(dispatcher.counters["retried"] >= 2, f"retries counted ({dispatcher.counters['retried']})")
+
+# 4. Permanent failures go to the dead-letter file without retrying
+state.reject_subject = "bounce me"
+dispatcher.enqueue("a@example.com", ["b@example.com"], message("bounce me"))
+check(wait_until(lambda: os.path.exists(dead_letter)), "550 written to dead-letter file")
+with open(dead_letter, encoding="utf-8") as f:
+    record = json.loads(f.readline())
+check(record["attempts"] == 1 and "550" in record["last_error"], "dead letter has error and a single attempt")
+
+# 5. Credentials are only requested on (re)connect
+check(len(password_calls) == state.logins, f"password fetched per login only ({len(password_calls)})")
+
+dispatcher.stop()
+server.shutdown()
+
+if __name__ == "__main__":
+    if failures:
+        print(f"\n{len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\nAll mail dispatcher checks passed")
+    sys.exit(0)
@@ -0,0 +1,209 @@
+"""
+ATS scoring heuristics shared by the API, batch workers and offline tools.
+"""
+
+import numpy as np
+
+from utils.document import as_document
+
+# Weight of each sub-score in the overall ATS score (sums to 1.0)
+ATS_WEIGHTS = {
+    "skill_match": 0.50,
+    "keyword_density": 0.20,
+    "contact": 0.10,
+    "education": 0.10,
+    "formatting": 0.10,
+}
+
+# Column order of ATS feature vectors / weight matrices
+ATS_FEATURES = tuple(ATS_WEIGHTS)
+
+
+# ------------------------------------------------------
+# ATS SCORING AUTOMATION
+# ------------------------------------------------------
+def _has_contact(entities: dict) -> float:
+    """Return contact presence score: 1.0 if email+phone, 0.5 if one, 0 otherwise."""
+    emails = entities.get("emails", []) if isinstance(entities, dict) else []
+    phones = entities.get("phones", []) if isinstance(entities, dict) else []
+    has_email = len(emails) > 0
+    has_phone = len(phones) > 0
+    if has_email and has_phone:
+        return 1.0
+    if has_email or has_phone:
+        return 0.5
+    return 0.0
+
+
+def _education_score(text) -> float:
+    """Simple education matching heuristics (bachelor/master/phd -> 1.0, diploma -> 0.6, none -> 0)."""
+    return as_document(text).education_level
+
+
+def _formatting_quality(text) -> float:
+    """
+    Heuristic formatting score (0-1). Checks length, presence of many short lines, and non-printables.
+    Line checks need the raw (un-normalised) text, so pass an AnalysedDocument built from it.
+    """
+    doc = as_document(text)
+    if not doc.raw:
+        return 0.0
+
+    words_count = doc.word_count
+
+    # Basic length heuristic
+    length_score = 1.0 if words_count >= 300 else (0.6 if words_count >= 150 else 0.3)
+
+    # Check for many short lines (bad formatting) - penalize if too many short lines
+    if doc.line_count:
+        short_ratio = doc.short_line_count / doc.line_count
+    else:
+        short_ratio = 0.0
+
+    short_penalty = max(0.0, 1.0 - short_ratio * 1.5)  # if many short lines, reduce
+
+    # Check non-printable / weird characters
+    nonprintables = doc.non_ascii_count
+    nonprint_penalty = 1.0 if nonprintables == 0 else max(0.0, 1.0 - (nonprintables / 50.0))
+
+    score = length_score * 0.6 + short_penalty * 0.25 + nonprint_penalty * 0.15
+    return max(0.0, min(1.0, score))
+
+
+def _keyword_density_score(skills_list: list, text: str) -> float:
+    """
+    Keyword density heuristic:
+    - number of unique skills found vs expected (we treat top 10 skills as ideal).
+    - scaled to 0-1
+    """
+    if not skills_list:
+        return 0.0
+    unique_skills = { (s.get("skill") if isinstance(s, dict) else str(s)).lower() for s in skills_list }
+    found = len(unique_skills)
+    # ideal target is 10 unique relevant skills
+    return min(1.0, found / 10.0)
+
+
+def _skill_match_score(skills_list: list) -> float:
+    """
+    Skill match based on avg confidence (if provided) or presence.
+    Expect skills_list to be a list of dicts: [{"skill":"python","confidence":80}, ...]
+    """
+    if not skills_list:
+        return 0.0
+
+    confidences = []
+    for s in skills_list:
+        if isinstance(s, dict):
+            c = s.get("confidence")
+            if isinstance(c, (int, float)):
+                confidences.append(max(0.0, min(100.0, float(c))))
+            else:
+                # if confidence not present, assume moderate (60)
+                confidences.append(60.0)
+        else:
+            confidences.append(60.0)
+
+    avg_conf = sum(confidences) / len(confidences)
+    return max(0.0, min(1.0, avg_conf / 100.0))
+
+
+def ats_subscores(skills_list: list, text, entities: dict = None) -> dict:
+    """Unrounded sub-scores in [0,1], keyed by ATS_FEATURES."""
+    entities = entities or {}
+    text = as_document(text)
+    return {
+        "skill_match": _skill_match_score(skills_list),
+        "keyword_density": _keyword_density_score(skills_list, text),
+        "contact": _has_contact(entities),
+        "education": _education_score(text),
+        "formatting": _formatting_quality(text),
+    }
+
+
+def calculate_ats_score(skills_list: list, text: str, entities: dict = None) -> tuple:
+    """
+    Returns (ats_score_int, breakdown_dict)
+    breakdown values are floats in [0,1].
+    Weights:
+      skill_match: 50%
+      keyword_density: 20%
+      contact: 10%
+      education: 10%
+      formatting: 10%
+    """
+    # Sub-scores 0..1
+    sub = ats_subscores(skills_list, text, entities)
+    skill_match = sub["skill_match"]
+    keyword_density = sub["keyword_density"]
+    contact = sub["contact"]
+    education = sub["education"]
+    formatting = sub["formatting"]
+
+    # weights
+    w_skill = ATS_WEIGHTS["skill_match"]
+    w_keyword = ATS_WEIGHTS["keyword_density"]
+    w_contact = ATS_WEIGHTS["contact"]
+    w_edu = ATS_WEIGHTS["education"]
+    w_format = ATS_WEIGHTS["formatting"]
+
+    overall = (skill_match * w_skill +
+               keyword_density * w_keyword +
+               contact * w_contact +
+               education * w_edu +
+               formatting * w_format)
+
+    ats_score = int(round(overall * 100))
+
+    breakdown = {
+        "skill_match": round(skill_match, 2),
+        "keyword_coverage": round(keyword_density, 2),
+        "contact_score": round(contact, 2),
+        "education_score": round(education, 2),
+        "formatting_score": round(formatting, 2),
+    }
+
+    return ats_score, breakdown
+
+
+# ------------------------------------------------------
+# BULK / WHAT-IF SCORING
+# ------------------------------------------------------
+def feature_row(subscores: dict) -> list:
+    """Sub-score dict -> list in ATS_FEATURES order."""
+    return [float(subscores[name]) for name in ATS_FEATURES]
+
+
+def weight_matrix(profiles) -> np.ndarray:
+    """
+    Weight profiles (a list of {feature: weight} dicts) -> (P, F) float64 matrix.
+    Missing features weigh 0; unknown names or negative weights raise ValueError.
+    """
+    rows = []
+    for profile in profiles:
+        unknown = set(profile) - set(ATS_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown ATS features: {sorted(unknown)}; expected {list(ATS_FEATURES)}")
+        row = [float(profile.get(name, 0.0)) for name in ATS_FEATURES]
+        if any(w < 0 for w in row):
+            raise ValueError("ATS weights must be non-negative")
+        rows.append(row)
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(ATS_FEATURES))
+
+
+def score_matrix(features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Score N resumes under P weight profiles at once -> (N, P) int64 ATS scores.
+
+    `features` is (N, F) unrounded sub-scores, `weights` is (P, F). Products are
+    accumulated feature by feature in the same order as calculate_ats_score, so
+    every float operation (and therefore round-half-even) matches the scalar
+    path bit for bit; a BLAS matmul may reassociate the sum and flip scores
+    that sit exactly on a .5 boundary.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    overall = features[:, 0:1] * weights[:, 0]
+    for j in range(1, features.shape[1]):
+        overall = overall + features[:, j:j + 1] * weights[:, j]
+    return np.rint(overall * 100).astype(np.int64)
@@ -0,0 +1,456 @@
+"""
+Inverted skill index over analysed resumes.
+
+Every analysed resume gets a dense integer doc id. Each skill keeps a posting
+list of sorted doc ids (uint32) with a parallel array of skill confidences
+(uint8); boolean queries are evaluated as NumPy bitmaps over the doc id space
+and ranked with argpartition, so a query touches only the postings it names.
+
+SQLite (CANDIDATE_DB) is the durable copy shared by all workers; each process
+keeps the compact in-memory form and replays rows other processes changed.
+
+Query syntax:  python AND docker AND NOT java
+               "machine learning" (pytorch OR tensorflow)   # adjacent terms AND
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.feature_store import CANDIDATE_DB
+from utils.nlp_utils import SKILL_ALIASES
+
+
+class QueryError(ValueError):
+    """Malformed boolean skill query."""
+
+
+# ------------------------------------------------------
+# POSTING LISTS
+# ------------------------------------------------------
+class _Postings:
+    """Growable (doc_id uint32, confidence uint8) arrays; ids stay sorted because ids only grow."""
+
+    __slots__ = ("ids", "confs", "size")
+
+    def __init__(self, ids=None, confs=None):
+        if ids is None:
+            self.ids = np.empty(4, dtype=np.uint32)
+            self.confs = np.empty(4, dtype=np.uint8)
+            self.size = 0
+        else:
+            self.ids = ids
+            self.confs = confs
+            self.size = len(ids)
+
+    def append(self, doc_id: int, confidence: int):
+        if self.size == len(self.ids):
+            capacity = max(4, self.size * 2)
+            self.ids = np.resize(self.ids, capacity)
+            self.confs = np.resize(self.confs, capacity)
+        self.ids[self.size] = doc_id
+        self.confs[self.size] = confidence
+        self.size += 1
+
+    def view(self):
+        return self.ids[:self.size], self.confs[:self.size]
+
+
+# ------------------------------------------------------
+# QUERY PARSER  (NOT > AND > OR)
+# ------------------------------------------------------
+_QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]+)"|([^\s()"]+))')
+
+
+def _tokenize(query: str) -> list:
+    tokens = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        m = _QUERY_TOKEN.match(query, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"Unexpected character at position {pos}")
+        pos = m.end()
+        if m.group(1):
+            tokens.append(("(", None))
+        elif m.group(2):
+            tokens.append((")", None))
+        elif m.group(3) is not None:
+            tokens.append(("term", m.group(3)))
+        else:
+            word = m.group(4)
+            upper = word.upper()
+            if upper in ("AND", "OR", "NOT"):
+                tokens.append((upper, None))
+            else:
+                tokens.append(("term", word))
+    return tokens
+
+
+def parse_query(query: str):
+    """
+    Parse into a tiny AST: ("term", skill) | ("not", node) | ("and", [nodes]) | ("or", [nodes]).
+    Raises QueryError.
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        raise QueryError("Empty query")
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def parse_or():
+        nonlocal pos
+        nodes = [parse_and()]
+        while peek() == "OR":
+            pos += 1
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nonlocal pos
+        nodes = [parse_not()]
+        while peek() in ("AND", "NOT", "term", "("):
+            if peek() == "AND":
+                pos += 1
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        nonlocal pos
+        if peek() == "NOT":
+            pos += 1
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        nonlocal pos
+        kind = peek()
+        if kind == "(":
+            pos += 1
+            node = parse_or()
+            if peek() != ")":
+                raise QueryError("Missing closing parenthesis")
+            pos += 1
+            return node
+        if kind == "term":
+            term = tokens[pos][1].lower()
+            pos += 1
+            return ("term", SKILL_ALIASES.get(term, term))
+        raise QueryError(f"Expected a skill, got {kind or 'end of query'}")
+
+    node = parse_or()
+    if pos != len(tokens):
+        raise QueryError(f"Unexpected {tokens[pos][0]} at token {pos + 1}")
+    return node
+
+
+def positive_terms(node, negated=False) -> set:
+    """Skills that contribute to confidence ranking (not under a NOT)."""
+    kind = node[0]
+    if kind == "term":
+        return set() if negated else {node[1]}
+    if kind == "not":
+        return positive_terms(node[1], not negated)
+    out = set()
+    for child in node[1]:
+        out |= positive_terms(child, negated)
+    return out
+
+
+# ------------------------------------------------------
+# INDEX
+# ------------------------------------------------------
+class CandidateIndex:
+    def __init__(self, db_path: str = CANDIDATE_DB):
+        self._lock = threading.RLock()
+        self._reset_memory()
+        self._db = None
+        self._last_seq = 0
+        self._data_version = None
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            # autocommit mode: writes take BEGIN IMMEDIATE so seq numbers are serialised across processes
+            self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                " resume_id TEXT PRIMARY KEY, seq INTEGER NOT NULL, deleted INTEGER NOT NULL DEFAULT 0,"
+                " filename TEXT, name TEXT, email TEXT, ats_score INTEGER NOT NULL, indexed_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS candidates_seq ON candidates(seq);"
+                "CREATE TABLE IF NOT EXISTS candidate_skills ("
+                " resume_id TEXT NOT NULL, skill TEXT NOT NULL, confidence INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS candidate_skills_resume ON candidate_skills(resume_id);"
+            )
+            self.refresh()
+
+    def _reset_memory(self):
+        self._resume_ids = []          # doc id -> resume_id
+        self._doc_of = {}              # resume_id -> live doc id
+        self._info = []                # doc id -> (filename, name, email)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ats = np.zeros(0, dtype=np.uint8)
+        self._postings = {}            # skill -> _Postings
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    # ---------------- in-memory mutation ----------------
+    def _grow(self, n: int):
+        if n > len(self._alive):
+            capacity = max(n, len(self._alive) * 2, 1024)
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+            self._ats = np.concatenate([self._ats, np.zeros(capacity - len(self._ats), dtype=np.uint8)])
+
+    def _insert_memory(self, resume_id, info, skills, ats_score):
+        self._delete_memory(resume_id)
+        doc_id = len(self._resume_ids)
+        self._grow(doc_id + 1)
+        self._resume_ids.append(resume_id)
+        self._info.append(info)
+        self._doc_of[resume_id] = doc_id
+        self._alive[doc_id] = True
+        self._ats[doc_id] = max(0, min(100, int(ats_score)))
+        for skill, confidence in skills.items():
+            postings = self._postings.get(skill)
+            if postings is None:
+                postings = self._postings[skill] = _Postings()
+            postings.append(doc_id, max(0, min(255, int(confidence))))
+        self._live += 1
+
+    def _delete_memory(self, resume_id) -> bool:
+        # Tombstone only; postings keep the id and queries mask it out
+        doc_id = self._doc_of.pop(resume_id, None)
+        if doc_id is None:
+            return False
+        self._alive[doc_id] = False
+        self._live -= 1
+        return True
+
+    def load_arrays(self, resume_ids, infos, ats_scores, posting_skills, posting_docs, posting_confs):
+        """
+        Bulk-load a dense snapshot: doc i is resume_ids[i]; postings are parallel arrays
+        of (skill, doc index, confidence). Used at startup and by the benchmark.
+        """
+        with self._lock:
+            self._reset_memory()
+            n = len(resume_ids)
+            self._resume_ids = list(resume_ids)
+            self._info = list(infos)
+            self._doc_of = {rid: i for i, rid in enumerate(self._resume_ids)}
+            self._grow(n)
+            self._alive[:n] = True
+            self._ats[:n] = np.clip(np.asarray(ats_scores, dtype=np.int64), 0, 100)
+            self._live = n
+
+            if len(posting_docs):
+                # factorise skill names to small ints so the sort stays numeric
+                codes = {}
+                skill_codes = np.fromiter(
+                    (codes.setdefault(skill, len(codes)) for skill in posting_skills),
+                    dtype=np.int32, count=len(posting_docs),
+                )
+                names = list(codes)
+                docs = np.asarray(posting_docs, dtype=np.uint32)
+                confs = np.clip(np.asarray(posting_confs, dtype=np.int64), 0, 255).astype(np.uint8)
+                order = np.lexsort((docs, skill_codes))
+                skill_codes, docs, confs = skill_codes[order], docs[order], confs[order]
+                bounds = np.flatnonzero(skill_codes[1:] != skill_codes[:-1]) + 1
+                starts = np.concatenate([[0], bounds])
+                ends = np.concatenate([bounds, [len(skill_codes)]])
+                for start, end in zip(starts, ends):
+                    self._postings[names[skill_codes[start]]] = _Postings(
+                        docs[start:end].copy(), confs[start:end].copy()
+                    )
+
+    # ---------------- durable API ----------------
+    def add(self, resume_id: str, filename: str, skills_list: list, entities: dict, ats_score: int):
+        """Insert or replace one analysed resume."""
+        skills = {}
+        for s in skills_list or []:
+            if isinstance(s, dict) and s.get("skill"):
+                skills[s["skill"].lower()] = s.get("confidence", 60)
+        entities = entities or {}
+        name = (entities.get("persons") or [None])[0]
+        email = (entities.get("emails") or [None])[0]
+        info = (filename, name, email)
+
+        with self._lock:
+            if self._db is not None:
+                with self._write_transaction() as seq:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO candidates"
+                        " (resume_id, seq, deleted, filename, name, email, ats_score, indexed_at)"
+                        " VALUES (?, ?, 0, ?, ?, ?, ?, ?)",
+                        (resume_id, seq, filename, name, email, int(ats_score), time.time()),
+                    )
+                    self._db.execute("DELETE FROM candidate_skills WHERE resume_id = ?", (resume_id,))
+                    self._db.executemany(
+                        "INSERT INTO candidate_skills (resume_id, skill, confidence) VALUES (?, ?, ?)",
+                        [(resume_id, k, int(v)) for k, v in skills.items()],
+                    )
+            self._insert_memory(resume_id, info, skills, ats_score)
+
+    def delete(self, resume_id: str) -> bool:
+        with self._lock:
+            if self._db is not None:
+                with self._write_transaction() as seq:
+                    self._db.execute(
+                        "UPDATE candidates SET deleted = 1, seq = ? WHERE resume_id = ? AND deleted = 0",
+                        (seq, resume_id),
+                    )
+                    self._db.execute("DELETE FROM candidate_skills WHERE resume_id = ?", (resume_id,))
+            return self._delete_memory(resume_id)
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        Hold the SQLite write lock, catch up on other writers, and yield the next seq.
+        Our own commit does not move PRAGMA data_version, so record it afterwards.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self.refresh()
+            seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM candidates").fetchone()[0]
+            yield seq
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._last_seq = seq
+        self._data_version = self._current_data_version()
+
+    def _current_data_version(self):
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self):
+        """Replay rows inserted/deleted by other processes since our last look."""
+        if self._db is None:
+            return
+        with self._lock:
+            version = self._current_data_version()
+            if version == self._data_version:
+                return
+            rows = self._db.execute(
+                "SELECT resume_id, seq, deleted, filename, name, email, ats_score"
+                " FROM candidates WHERE seq > ? ORDER BY seq",
+                (self._last_seq,),
+            ).fetchall()
+
+            if self._last_seq == 0 and rows:
+                self._load_snapshot(rows)
+            else:
+                for resume_id, seq, deleted, filename, name, email, ats in rows:
+                    if deleted:
+                        self._delete_memory(resume_id)
+                    else:
+                        skills = dict(self._db.execute(
+                            "SELECT skill, confidence FROM candidate_skills WHERE resume_id = ?", (resume_id,)
+                        ).fetchall())
+                        self._insert_memory(resume_id, (filename, name, email), skills, ats)
+            if rows:
+                self._last_seq = rows[-1][1]
+            self._data_version = version
+
+    def _load_snapshot(self, rows):
+        live = [r for r in rows if not r[2]]
+        position = {r[0]: i for i, r in enumerate(live)}
+        postings = self._db.execute(
+            "SELECT s.resume_id, s.skill, s.confidence FROM candidate_skills s"
+            " JOIN candidates c ON c.resume_id = s.resume_id WHERE c.deleted = 0"
+        ).fetchall()
+        self.load_arrays(
+            [r[0] for r in live],
+            [(r[3], r[4], r[5]) for r in live],
+            [r[6] for r in live],
+            [p[1] for p in postings],
+            [position[p[0]] for p in postings],
+            [p[2] for p in postings],
+        )
+
+    # ---------------- queries ----------------
+    def _bitmap(self, node, n: int) -> np.ndarray:
+        kind = node[0]
+        if kind == "term":
+            bitmap = np.zeros(n, dtype=bool)
+            postings = self._postings.get(node[1])
+            if postings is not None:
+                bitmap[postings.view()[0]] = True
+            return bitmap
+        if kind == "not":
+            return ~self._bitmap(node[1], n)
+        children = [self._bitmap(child, n) for child in node[1]]
+        out = children[0]
+        for child in children[1:]:
+            if kind == "and":
+                out &= child
+            else:
+                out |= child
+        return out
+
+    def search(self, query: str, rank: str = "confidence", top_k: int = 20) -> dict:
+        """
+        Evaluate a boolean skill query. rank="confidence" sums the confidences of the
+        queried (non-negated) skills; rank="ats" orders by stored ATS score.
+        Raises QueryError / ValueError on bad input.
+        """
+        if rank not in ("confidence", "ats"):
+            raise ValueError("rank must be 'confidence' or 'ats'")
+        node = parse_query(query)
+        started = time.perf_counter()
+
+        with self._lock:
+            self.refresh()
+            n = len(self._resume_ids)
+            mask = self._bitmap(node, n) & self._alive[:n]
+            matches = np.flatnonzero(mask)
+
+            if rank == "ats":
+                scores = self._ats[:n].astype(np.int32)
+            else:
+                scores = np.zeros(n, dtype=np.int32)
+                for skill in positive_terms(node):
+                    postings = self._postings.get(skill)
+                    if postings is not None:
+                        ids, confs = postings.view()
+                        scores[ids] += confs
+
+            k = max(0, min(top_k, len(matches)))
+            if k:
+                cand_scores = scores[matches]
+                if k < len(matches):
+                    part = np.argpartition(-cand_scores, k - 1)[:k]
+                else:
+                    part = np.arange(len(matches))
+                part = part[np.lexsort((matches[part], -cand_scores[part]))]
+                top = matches[part]
+            else:
+                top = np.zeros(0, dtype=np.int64)
+
+            results = []
+            for doc_id in top:
+                filename, name, email = self._info[doc_id]
+                results.append({
+                    "resume_id": self._resume_ids[doc_id],
+                    "filename": filename,
+                    "name": name,
+                    "email": email,
+                    "ats_score": int(self._ats[doc_id]),
+                    "score": int(scores[doc_id]),
+                })
+
+        return {
+            "query": query,
+            "rank": rank,
+            "total_matches": int(len(matches)),
+            "took_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            "results": results,
+        }
@@ -0,0 +1,113 @@
+"""
+Analysed-document representation shared by every feature extractor.
+
+Construction walks the raw extracted text once, line by line, producing the
+whitespace-normalised text and real line statistics. The lowercased text,
+token offsets and the entity / education scans are computed on first use and
+then reused by skills, entities and ATS scoring, so no extractor re-lowercases
+or re-scans the text.
+"""
+
+import re
+from functools import cached_property
+
+from utils.entity_scanner import scan_entities
+
+_TOKEN = re.compile(r'\S+')
+
+# Education tiers, strongest first; one search over the lowercased text
+_EDUCATION_SCAN = re.compile(
+    r'\b(?:'
+    r'(?P<degree>phd|doctorate'
+    r'|master|msc|m\.sc|mtech|m\.tech|mba'
+    r'|bachelor|bsc|b\.sc|btech|b\.tech|bachelor of technology|bachelor of science)'
+    r'|(?P<diploma>diploma|associate|certificate)'
+    r')\b'
+)
+
+_NON_ASCII = re.compile(r'[^\x00-\x7F]')
+
+SHORT_LINE_MAX_WORDS = 3
+
+
+def count_non_ascii(text: str) -> int:
+    if text.isascii():
+        return 0
+    return len(_NON_ASCII.findall(text))
+
+
+def education_level(lower: str) -> float:
+    """1.0 for a degree, 0.6 for diploma/associate/certificate, else 0 (`lower`: lowercased text)."""
+    best = 0.0
+    for m in _EDUCATION_SCAN.finditer(lower):
+        if m.group("degree"):
+            return 1.0
+        best = 0.6
+    return best
+
+
+class AnalysedDocument:
+    """
+    raw          extracted text as-is (line breaks preserved)
+    text         whitespace-collapsed text (same as normalize_text(raw))
+    word_count   number of whitespace-separated tokens
+    line_count / short_line_count   non-empty raw lines, and those with <= 3 words
+    token_spans  (start, end) of every token in `text` (lazy)
+    """
+
+    def __init__(self, raw: str):
+        raw = raw or ""
+        tokens = []
+        line_count = 0
+        short_lines = 0
+
+        # str.split / str.splitlines run in C; one walk over the lines does it all
+        for line in raw.splitlines():
+            words = line.split()
+            if words:
+                line_count += 1
+                if len(words) <= SHORT_LINE_MAX_WORDS:
+                    short_lines += 1
+                tokens.extend(words)
+
+        self.raw = raw
+        self.text = " ".join(tokens)
+        self.word_count = len(tokens)
+        self.line_count = line_count
+        self.short_line_count = short_lines
+
+    @cached_property
+    def token_spans(self) -> list:
+        return [m.span() for m in _TOKEN.finditer(self.text)]
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def non_ascii_count(self) -> int:
+        return count_non_ascii(self.text)
+
+    @cached_property
+    def education_level(self) -> float:
+        """1.0 for a degree, 0.6 for diploma/associate/certificate, else 0."""
+        return education_level(self.lower)
+
+    def seed(self, **values):
+        """
+        Fill lazy properties (non_ascii_count, education_level, ...) with values
+        already known, e.g. merged from cached per-section features.
+        """
+        self.__dict__.update(values)
+
+    @cached_property
+    def entities(self) -> dict:
+        """Emails, phones, person-like and org-like tokens, deduped in order of appearance (capped)."""
+        return scan_entities(self.text)
+
+
+def as_document(text) -> AnalysedDocument:
+    """Accept either an AnalysedDocument or plain text."""
+    if isinstance(text, AnalysedDocument):
+        return text
+    return AnalysedDocument(text)
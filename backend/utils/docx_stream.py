@@ -0,0 +1,120 @@
+"""
+Streaming DOCX text extraction.
+
+Reads the WordprocessingML parts straight from the zip with an incremental
+XML parser instead of building python-docx's object graph. Text is emitted in
+reading order - headers, body, footers - and includes what templates like to
+hide outside plain paragraphs: table cells, text boxes and header/footer
+parts. Elements are discarded as soon as
+they are consumed, so memory stays bounded by one paragraph, not the file.
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+BODY_PART = "word/document.xml"
+_HEADER = re.compile(r"^word/header(\d*)\.xml$")
+_FOOTER = re.compile(r"^word/footer(\d*)\.xml$")
+
+CELL_SEPARATOR = " | "
+
+
+def _local(tag: str) -> str:
+    # Transitional and Strict OOXML use different namespaces; match local names
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_part_lines(stream):
+    """
+    Yield the text lines of one WordprocessingML part (document, header or
+    footer) from a binary stream, in reading order.
+    """
+    paragraphs = []     # stack of run-text buffers (text boxes nest paragraphs)
+    containers = [[]]   # where finished lines go: the output, or an open row/cell
+    fallback_depth = 0  # inside mc:Fallback, which repeats mc:Choice content
+    parents = []
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        name = _local(elem.tag)
+
+        if event == "start":
+            if name == "Fallback":
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif name == "p":
+                paragraphs.append([])
+            elif name in ("tr", "tc"):
+                containers.append([])
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if name == "Fallback":
+            fallback_depth -= 1
+        elif not fallback_depth:
+            if name == "t" and paragraphs:
+                if elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif name == "tab" and paragraphs and parents and _local(parents[-1].tag) == "r":
+                # w:tab in a run is a tab character; in w:pPr/w:tabs it defines a tab stop
+                paragraphs[-1].append("\t")
+            elif name in ("br", "cr") and paragraphs:
+                paragraphs[-1].append("\n")
+            elif name == "noBreakHyphen" and paragraphs:
+                paragraphs[-1].append("-")
+            elif name == "p" and paragraphs:
+                text = "".join(paragraphs.pop())
+                if text.strip():
+                    containers[-1].append(text)
+            elif name == "tc":
+                cell = containers.pop()
+                containers[-1].append(cell)
+            elif name == "tr":
+                row = containers.pop()
+                containers[-1].extend(_row_lines(row))
+
+        # Drop consumed elements so the tree never grows past the open path
+        if parents:
+            parents[-1].remove(elem)
+        if len(containers) == 1 and containers[0]:
+            yield from containers[0]
+            containers[0].clear()
+
+
+def _row_lines(cells):
+    """
+    A row of one-line cells is a data row (skills grid): one line, cells
+    joined by CELL_SEPARATOR. Any multi-line cell makes it a layout row
+    (sidebar + main column): cells are read one after the other.
+    """
+    cells = [[line for line in cell if line.strip()] for cell in cells]
+    cells = [cell for cell in cells if cell]
+    if all(len(cell) == 1 for cell in cells):
+        return [CELL_SEPARATOR.join(cell[0].strip() for cell in cells)] if cells else []
+    return [line for cell in cells for line in cell]
+
+
+def _part_names(names):
+    def ordered(pattern):
+        found = [(int(m.group(1) or 0), n) for n in names for m in [pattern.match(n)] if m]
+        return [n for _, n in sorted(found)]
+
+    return ordered(_HEADER), ordered(_FOOTER)
+
+
+def iter_docx_lines(file):
+    """
+    Yield lines from the headers, the body and the footers of a DOCX, given a
+    path or seekable binary stream. Raises zipfile.BadZipFile / KeyError /
+    ParseError for files that are not WordprocessingML packages.
+    """
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        headers, footers = _part_names(names)
+        if BODY_PART not in names:
+            raise KeyError(f"{BODY_PART} missing from package")
+        for part in headers + [BODY_PART] + footers:
+            with archive.open(part) as stream:
+                yield from iter_part_lines(stream)
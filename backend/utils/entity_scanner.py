@@ -0,0 +1,99 @@
+"""
+Linear-time entity scanner: emails, phones, person-like and org-like names.
+
+The previous single-regex patterns backtracked over long runs of word
+characters, dots and dashes (`[\\w.-]+@...` is quadratic on a long token with
+no valid address), so one pathological upload could tie up a worker for
+seconds. Here every pass is linear with bounded constants:
+
+  emails   anchored on each '@' (str.find); the local part is read backwards
+           over at most 64 characters and the domain forwards with a
+           label-bounded pattern, so no match attempt crosses the whole text
+  phones   maximal runs of digits/spaces/dashes (a greedy run with nothing
+           after it never backtracks), split at " - " ranges
+
+Candidates are then validated cheaply (TLD, digit counts). The input is capped
+at ENTITY_SCAN_MAX_CHARS, at most ENTITY_MAX_CANDIDATES '@'s / digit runs are
+examined, and each kind keeps at most ENTITY_MAX_MATCHES distinct values.
+"""
+
+import os
+import re
+
+ENTITY_SCAN_MAX_CHARS = int(os.getenv("ENTITY_SCAN_MAX_CHARS", "100000"))
+ENTITY_MAX_CANDIDATES = int(os.getenv("ENTITY_MAX_CANDIDATES", "2000"))
+ENTITY_MAX_MATCHES = int(os.getenv("ENTITY_MAX_MATCHES", "100"))
+
+EMAIL_MAX_LOCAL = 64
+PHONE_MIN_CHARS = 10   # as the old pattern: digit, 8+ digits/separators, digit
+PHONE_MIN_DIGITS = 7
+PHONE_MAX_DIGITS = 15  # E.164
+
+_LOCAL_REVERSED = re.compile(r'[\w.-]{1,%d}' % EMAIL_MAX_LOCAL)
+_DOMAIN = re.compile(r'[\w-]{1,63}(?:\.[\w-]{1,63}){1,8}')
+_PHONE_RUN = re.compile(r'\+?\d[\d\s-]*')
+_RANGE_SEPARATOR = re.compile(r'\s+-\s+')
+_PERSON = re.compile(r'\b[A-Z][a-z]+\s[A-Z][a-z]+\b')
+_ORG = re.compile(r'\b[A-Z][A-Z]+\b')
+
+
+def _valid_domain(domain: str) -> bool:
+    tld = domain.rsplit(".", 1)[-1]
+    return len(tld) >= 2 and not tld.isdigit() and not domain.startswith("-")
+
+
+def scan_emails(text: str) -> list:
+    found = {}
+    consumed = 0  # end of the previous address: parts are not shared between matches
+    at = text.find("@")
+    examined = 0
+    while at != -1 and examined < ENTITY_MAX_CANDIDATES and len(found) < ENTITY_MAX_MATCHES:
+        examined += 1
+        window = text[max(consumed, at - EMAIL_MAX_LOCAL):at]
+        local = _LOCAL_REVERSED.match(window[::-1])
+        domain = _DOMAIN.match(text, at + 1)
+        if local and domain:
+            name = local.group()[::-1].strip(".")
+            host = domain.group()
+            if name and _valid_domain(host):
+                found.setdefault(f"{name}@{host}", None)
+                consumed = domain.end()
+        at = text.find("@", at + 1)
+    return list(found)
+
+
+def scan_phones(text: str) -> list:
+    found = {}
+    for examined, run in enumerate(_PHONE_RUN.finditer(text)):
+        if examined >= ENTITY_MAX_CANDIDATES or len(found) >= ENTITY_MAX_MATCHES:
+            break
+        for part in _RANGE_SEPARATOR.split(run.group()):
+            part = part.rstrip(" \t\r\n-")
+            if len(part) < PHONE_MIN_CHARS or not part[-1].isdigit():
+                continue
+            digits = sum(c.isdigit() for c in part)
+            if PHONE_MIN_DIGITS <= digits <= PHONE_MAX_DIGITS:
+                found.setdefault(part, None)
+    return list(found)
+
+
+def _first_distinct(matches, keep=None) -> list:
+    found = {}
+    for m in matches:
+        value = m.group()
+        if keep is None or keep(value):
+            found.setdefault(value, None)
+            if len(found) >= ENTITY_MAX_MATCHES:
+                break
+    return list(found)
+
+
+def scan_entities(text: str) -> dict:
+    """Emails, phones, person-like and org-like tokens, deduped in order of appearance."""
+    text = (text or "")[:ENTITY_SCAN_MAX_CHARS]
+    return {
+        "persons": _first_distinct(_PERSON.finditer(text)),
+        "organizations": _first_distinct(_ORG.finditer(text), keep=lambda w: len(w) > 2),
+        "emails": scan_emails(text) if "@" in text else [],
+        "phones": scan_phones(text),
+    }
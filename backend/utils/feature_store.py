@@ -0,0 +1,81 @@
+"""
+Persistent store of per-resume ATS sub-score vectors.
+
+Each analysed resume's unrounded sub-scores are written to SQLite so hiring
+teams can re-rank the whole pool under new weights (see
+utils.ats_scoring.score_matrix) without re-parsing any files. The matrix is
+loaded into NumPy once and reused until the table changes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from utils.ats_scoring import ATS_FEATURES
+
+CANDIDATE_DB = os.getenv("CANDIDATE_DB", os.path.join("data", "candidates.sqlite3"))
+
+
+class FeatureStore:
+    def __init__(self, db_path: str = CANDIDATE_DB):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{name} REAL NOT NULL" for name in ATS_FEATURES)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ats_features ("
+            f" resume_id TEXT PRIMARY KEY, filename TEXT, analysed_at REAL NOT NULL, {columns})"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._cached = None  # (cache_key, ids, filenames, matrix)
+
+    def put(self, resume_id: str, filename: str, subscores: dict):
+        names = ", ".join(ATS_FEATURES)
+        marks = ", ".join("?" for _ in ATS_FEATURES)
+        values = [float(subscores[name]) for name in ATS_FEATURES]
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO ats_features (resume_id, filename, analysed_at, {names})"
+                f" VALUES (?, ?, ?, {marks})",
+                [resume_id, filename, time.time(), *values],
+            )
+            self._db.commit()
+            self._writes += 1
+
+    def delete(self, resume_id: str) -> bool:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM ats_features WHERE resume_id = ?", (resume_id,))
+            self._db.commit()
+            self._writes += 1
+            return cur.rowcount > 0
+
+    def matrix(self):
+        """
+        Return (resume_ids, filenames, (N, F) float64 matrix) for every stored resume.
+        Reloaded only when this or another process has written since the last call.
+        """
+        with self._lock:
+            # data_version moves when *other* connections commit; _writes covers ours
+            data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+            key = (data_version, self._writes)
+            if self._cached is not None and self._cached[0] == key:
+                return self._cached[1:]
+
+            rows = self._db.execute(
+                f"SELECT resume_id, filename, {', '.join(ATS_FEATURES)} FROM ats_features ORDER BY rowid"
+            ).fetchall()
+
+        ids = [r[0] for r in rows]
+        filenames = [r[1] for r in rows]
+        matrix = np.array([r[2:] for r in rows], dtype=np.float64).reshape(len(rows), len(ATS_FEATURES))
+        self._cached = (key, ids, filenames, matrix)
+        return ids, filenames, matrix
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM ats_features").fetchone()[0]
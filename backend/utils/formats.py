@@ -0,0 +1,108 @@
+"""
+Content-based format detection for uploads.
+
+The format is decided from the bytes, not the filename: a PDF header, a ZIP
+package holding word/document.xml, or text (BOM, UTF-8, or a single-byte code
+page). Known formats we cannot read - legacy .doc, other office packages,
+images, RTF - and unrecognised binary are rejected with UnsupportedFormatError
+before any parser runs. Only the first SNIFF_BYTES (plus a ZIP's central
+directory) are read.
+"""
+
+import codecs
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Optional
+
+SNIFF_BYTES = 8192
+# Share of control characters above which undecodable bytes are treated as binary
+TEXT_MAX_CONTROL_RATIO = 0.01
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised for uploads whose content is not a format we can extract."""
+
+
+@dataclass(frozen=True)
+class DetectedFormat:
+    name: str                       # key into the extractor registry: pdf | docx | text
+    encoding: Optional[str] = None  # text only
+
+
+# (magic prefix, reason) for formats that are recognised but not supported
+_UNSUPPORTED_MAGIC = (
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "legacy Word/Office (OLE2) documents are not supported; save as DOCX or PDF"),
+    (b"{\\rtf", "RTF documents are not supported; save as DOCX or PDF"),
+    (b"\x89PNG\r\n\x1a\n", "images are not supported; upload a text-based PDF or DOCX"),
+    (b"\xff\xd8\xff", "images are not supported; upload a text-based PDF or DOCX"),
+    (b"GIF8", "images are not supported; upload a text-based PDF or DOCX"),
+    (b"\x1f\x8b", "compressed (gzip) files are not supported"),
+)
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _detect_zip(stream) -> DetectedFormat:
+    try:
+        with zipfile.ZipFile(stream) as archive:
+            names = set(archive.namelist())
+    except zipfile.BadZipFile:
+        raise UnsupportedFormatError("damaged ZIP/DOCX package")
+    if "word/document.xml" in names:
+        return DetectedFormat("docx")
+    if "xl/workbook.xml" in names or "ppt/presentation.xml" in names:
+        raise UnsupportedFormatError("spreadsheets and presentations are not supported; upload PDF or DOCX")
+    if "mimetype" in names:
+        raise UnsupportedFormatError("OpenDocument files are not supported; save as DOCX or PDF")
+    raise UnsupportedFormatError("ZIP archives are only accepted by the batch endpoint")
+
+
+def _detect_text(head: bytes) -> Optional[DetectedFormat]:
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return DetectedFormat("text", encoding)
+    if b"\x00" in head:
+        return None
+    try:
+        # incremental decoder: a multi-byte character cut off at the end is fine
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return DetectedFormat("text", "utf-8")
+    except UnicodeDecodeError:
+        pass
+    controls = sum(1 for b in head if b < 0x20 and b not in (0x09, 0x0a, 0x0c, 0x0d))
+    if controls <= TEXT_MAX_CONTROL_RATIO * len(head):
+        return DetectedFormat("text", "cp1252")
+    return None
+
+
+def detect_format(stream, filename: str = "") -> DetectedFormat:
+    """
+    Identify a seekable binary stream's format; the stream is rewound.
+    Raises UnsupportedFormatError with a user-facing reason.
+    """
+    stream.seek(0)
+    head = stream.read(SNIFF_BYTES)
+    stream.seek(0)
+    try:
+        # PDF readers accept the header anywhere in the first KiB
+        if b"%PDF-" in head[:1024]:
+            return DetectedFormat("pdf")
+        if head.startswith(b"PK\x03\x04"):
+            return _detect_zip(stream)
+        for magic, reason in _UNSUPPORTED_MAGIC:
+            if head.startswith(magic):
+                raise UnsupportedFormatError(reason)
+        detected = _detect_text(head)
+    finally:
+        stream.seek(0)
+    if detected is None:
+        ext = os.path.splitext(filename or "")[1].lower() or "no extension"
+        raise UnsupportedFormatError(f"unrecognised binary content ({ext}); upload PDF, DOCX or TXT")
+    return detected
@@ -0,0 +1,274 @@
+"""
+Durable SQLite job queue for asynchronous resume analysis.
+
+POST /jobs stores the upload under JOB_UPLOAD_DIR and inserts a `queued` row.
+A dispatcher claims jobs with a time-limited lease, renews it while the job
+runs and records progress events (one row per stage) that GET /jobs/{id} and
+the SSE stream read back. A job whose lease expires - the process died, or a
+worker crashed - is claimed again until JOB_MAX_ATTEMPTS is reached, so
+queued and running jobs survive a restart.
+
+Every method is blocking; the API calls them via asyncio.to_thread.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+JOB_DB = os.getenv("JOB_DB", os.path.join("data", "jobs.sqlite3"))
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", os.path.join("data", "job_uploads"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", "2"))
+
+TERMINAL_STATES = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,          -- queued | running | done | failed
+    stage TEXT,
+    filename TEXT,
+    upload_path TEXT,
+    sha256 TEXT,
+    size INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    at REAL NOT NULL,
+    stage TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, seq);
+"""
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    db = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def _insert_event(db, job_id: str, stage: str, detail: dict = None):
+    db.execute(
+        "INSERT INTO job_events (job_id, at, stage, detail) VALUES (?, ?, ?, ?)",
+        (job_id, time.time(), stage, json.dumps(detail) if detail else None),
+    )
+    db.execute("UPDATE jobs SET stage = ?, updated_at = ? WHERE id = ?", (stage, time.time(), job_id))
+
+
+def record_job_progress(db_path: str, job_id: str, stage: str):
+    """
+    Progress hook for worker processes (picklable via functools.partial):
+    opens its own connection and appends one stage event.
+    """
+    db = _connect(db_path)
+    try:
+        _insert_event(db, job_id, stage)
+    finally:
+        db.close()
+
+
+class JobQueue:
+    def __init__(self, db_path: str = JOB_DB, upload_dir: str = JOB_UPLOAD_DIR,
+                 lease_seconds: float = JOB_LEASE_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.upload_dir = upload_dir
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._db = _connect(db_path)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _write(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # ------------------------------------------------------
+    # SUBMISSION & STATUS
+    # ------------------------------------------------------
+    def new_upload_path(self, filename: str):
+        """(job_id, path) for storing a new upload before `create`."""
+        job_id = uuid.uuid4().hex
+        ext = os.path.splitext(filename or "")[1].lower()
+        return job_id, os.path.join(self.upload_dir, job_id + ext)
+
+    def create(self, job_id: str, filename: str, upload_path: str, sha256: str, size: int) -> dict:
+        now = time.time()
+        with self._write() as db:
+            db.execute(
+                "INSERT INTO jobs (id, status, stage, filename, upload_path, sha256, size,"
+                " available_at, created_at, updated_at) VALUES (?, 'queued', 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, filename, upload_path, sha256, size, now, now, now),
+            )
+            _insert_event(db, job_id, "queued")
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_result: bool = True):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "filename": row["filename"],
+            "size": row["size"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "error": row["error"],
+        }
+        if include_result and row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    def events(self, job_id: str, after_seq: int = 0) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, at, stage, detail FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq),
+            ).fetchall()
+        return [
+            {"seq": r["seq"], "at": r["at"], "stage": r["stage"], "detail": json.loads(r["detail"]) if r["detail"] else None}
+            for r in rows
+        ]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+    # ------------------------------------------------------
+    # WORKER SIDE (LEASES)
+    # ------------------------------------------------------
+    def claim(self, owner: str):
+        """
+        Lease the oldest runnable job: queued and due, or running with an
+        expired lease (its previous worker died). None if nothing is runnable.
+        """
+        now = time.time()
+        with self._write() as db:
+            while True:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE (status = 'queued' AND available_at <= ?)"
+                    " OR (status = 'running' AND lease_expires < ?) ORDER BY created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["status"] == "running":
+                    _insert_event(db, row["id"], "lease_expired", {"owner": row["lease_owner"]})
+                if row["attempts"] >= self.max_attempts:
+                    self._finish(db, row["id"], "failed", error="Gave up after repeated worker failures")
+                    continue
+                db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,"
+                    " lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (owner, now + self.lease_seconds, now, row["id"]),
+                )
+                _insert_event(db, row["id"], "started", {"attempt": row["attempts"] + 1})
+                job = dict(row)
+                job["attempts"] += 1
+                return job
+
+    def renew(self, job_ids, owner: str):
+        """Extend the leases this owner still holds."""
+        if not job_ids:
+            return
+        expires = time.time() + self.lease_seconds
+        with self._write() as db:
+            db.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                [(expires, job_id, owner) for job_id in job_ids],
+            )
+
+    def progress(self, job_id: str, stage: str, detail: dict = None):
+        with self._write() as db:
+            _insert_event(db, job_id, stage, detail)
+
+    def _finish(self, db, job_id, status, result=None, error=None):
+        db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, lease_owner = NULL, lease_expires = NULL,"
+            " updated_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+        )
+        _insert_event(db, job_id, status, {"error": error} if error else None)
+        path = db.execute("SELECT upload_path FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _owned(self, db, job_id, owner) -> bool:
+        row = db.execute("SELECT status, lease_owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row["status"] == "running" and row["lease_owner"] == owner
+
+    def complete(self, job_id: str, owner: str, result: dict) -> bool:
+        """Store the result; False if the lease was lost to another worker meanwhile."""
+        with self._write() as db:
+            if not self._owned(db, job_id, owner):
+                return False
+            self._finish(db, job_id, "done", result=result)
+            return True
+
+    def fail(self, job_id: str, owner: str, error: str, retry: bool) -> str:
+        """Requeue (with a delay) or fail the job; returns the new status."""
+        with self._write() as db:
+            if not self._owned(db, job_id, owner):
+                return "lost"
+            attempts = db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            if retry and attempts < self.max_attempts:
+                db.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, lease_owner = NULL,"
+                    " lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (error, time.time() + JOB_RETRY_DELAY_SECONDS * attempts, time.time(), job_id),
+                )
+                _insert_event(db, job_id, "retrying", {"error": error, "attempt": attempts})
+                return "queued"
+            self._finish(db, job_id, "failed", error=error)
+            return "failed"
+
+    def release_owned(self, owner: str) -> int:
+        """
+        Put this owner's running jobs back in the queue without using up an
+        attempt (graceful shutdown). Returns how many were released.
+        """
+        with self._write() as db:
+            ids = [r[0] for r in db.execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND lease_owner = ?", (owner,)
+            ).fetchall()]
+            for job_id in ids:
+                db.execute(
+                    "UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), available_at = ?,"
+                    " lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (time.time(), time.time(), job_id),
+                )
+                _insert_event(db, job_id, "requeued", {"reason": "shutdown"})
+            return len(ids)
@@ -0,0 +1,52 @@
+"""
+Leveled logging for the request hot path.
+
+LOG_LEVEL   DEBUG | INFO | WARNING | ERROR | OFF (default INFO)
+LOG_PREVIEW_SAMPLE_RATE   fraction of uploads whose first characters are
+                          logged (default 0, i.e. never)
+
+Errors are still written to server_errors.log by the root logger.
+"""
+
+import logging
+import os
+import random
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_PREVIEW_SAMPLE_RATE = float(os.getenv("LOG_PREVIEW_SAMPLE_RATE", "0"))
+LOG_PREVIEW_CHARS = 300
+
+# Loggers that get the console handler: the API and everything under utils/
+_APP_LOGGERS = ("resume_analyzer", "utils")
+
+
+def configure_logging():
+    """Attach one console handler to the app loggers (idempotent)."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    for name in _APP_LOGGERS:
+        logger = logging.getLogger(name)
+        if LOG_LEVEL == "OFF":
+            logger.disabled = True
+            continue
+        logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        if not any(getattr(h, "_app_console", False) for h in logger.handlers):
+            handler._app_console = True
+            logger.addHandler(handler)
+        # the root logger only keeps the error file
+        logger.propagate = False
+        file_handler = next((h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)), None)
+        if file_handler is not None and file_handler not in logger.handlers:
+            file_handler.setLevel(logging.ERROR)
+            logger.addHandler(file_handler)
+
+
+def get_logger() -> logging.Logger:
+    return logging.getLogger("resume_analyzer")
+
+
+def log_preview(logger: logging.Logger, filename: str, text: str):
+    """Log the start of an extracted resume for a sampled fraction of uploads."""
+    if LOG_PREVIEW_SAMPLE_RATE > 0 and random.random() < LOG_PREVIEW_SAMPLE_RATE:
+        logger.info("Extracted resume preview (%s): %s ...", filename, text[:LOG_PREVIEW_CHARS])
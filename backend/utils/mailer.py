@@ -0,0 +1,260 @@
+"""
+Background SMTP dispatcher for contact-form mail.
+
+The API only enqueues; one worker thread keeps a single authenticated SMTP
+connection open, sends whatever is queued in batches over it, reconnects when
+the server drops it, retries transient failures with exponential backoff and
+appends messages it gives up on to a dead-letter JSONL file.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+
+# smtplib is imported by the worker thread when it first connects, so
+# importing the API does not load it
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+MAIL_QUEUE_MAX = int(os.getenv("MAIL_QUEUE_MAX", "1000"))
+MAIL_BATCH_MAX = int(os.getenv("MAIL_BATCH_MAX", "20"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_BACKOFF_SECONDS = float(os.getenv("MAIL_BACKOFF_SECONDS", "2"))
+MAIL_BACKOFF_MAX_SECONDS = float(os.getenv("MAIL_BACKOFF_MAX_SECONDS", "300"))
+# Close the connection after this long without mail (servers drop idle sessions anyway)
+MAIL_IDLE_SECONDS = float(os.getenv("MAIL_IDLE_SECONDS", "60"))
+MAIL_DEAD_LETTER = os.getenv("MAIL_DEAD_LETTER", os.path.join("data", "mail_dead_letter.jsonl"))
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MailQueueFull(Exception):
+    """Raised by enqueue when MAIL_QUEUE_MAX messages are already waiting."""
+
+
+@dataclass
+class OutgoingMail:
+    sender: str
+    recipients: list
+    message: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    queued_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    last_error: str = None
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies and refused recipients won't succeed on retry."""
+    import smtplib
+
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # credentials may be rotated; keep retrying until attempts run out
+    code = getattr(error, "smtp_code", None)
+    return code is not None and 500 <= code < 600
+
+
+class MailDispatcher:
+    def __init__(self, username, password_provider, host: str = SMTP_HOST, port: int = SMTP_PORT,
+                 starttls: bool = SMTP_STARTTLS, dead_letter_path: str = MAIL_DEAD_LETTER,
+                 max_attempts: int = MAIL_MAX_ATTEMPTS, backoff: float = MAIL_BACKOFF_SECONDS,
+                 backoff_max: float = MAIL_BACKOFF_MAX_SECONDS, batch_max: int = MAIL_BATCH_MAX,
+                 idle_seconds: float = MAIL_IDLE_SECONDS, queue_max: int = MAIL_QUEUE_MAX):
+        self.username = username
+        self.password_provider = password_provider  # called on (re)connect only
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.dead_letter_path = dead_letter_path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.batch_max = batch_max
+        self.idle_seconds = idle_seconds
+
+        self._queue = queue.Queue(maxsize=queue_max)
+        self._retries = []  # heap of (due, seq, OutgoingMail)
+        self._seq = itertools.count()
+        self._smtp = None
+        self._last_used = 0.0
+        self._thread = None
+        self.counters = {"queued": 0, "sent": 0, "retried": 0, "dead_lettered": 0, "connections": 0}
+
+    # ------------------------------------------------------
+    # API SIDE
+    # ------------------------------------------------------
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="mail-dispatcher", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, sender: str, recipients, message: str) -> str:
+        """Queue a fully rendered message; returns its id. Never blocks."""
+        mail = OutgoingMail(sender=sender, recipients=list(recipients), message=message)
+        try:
+            self._queue.put_nowait(mail)
+        except queue.Full:
+            raise MailQueueFull(f"{self._queue.maxsize} messages already waiting")
+        self.counters["queued"] += 1
+        return mail.id
+
+    def stop(self, timeout: float = 10.0):
+        """Send what is already queued (no further retries), then close the connection."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {**self.counters, "waiting": self._queue.qsize(), "retry_pending": len(self._retries)}
+
+    # ------------------------------------------------------
+    # WORKER SIDE
+    # ------------------------------------------------------
+    def _connect(self):
+        import smtplib
+
+        smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password_provider())
+        except Exception:
+            smtp.close()
+            raise
+        self.counters["connections"] += 1
+        return smtp
+
+    def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+
+    def _send_one(self, mail: OutgoingMail):
+        """Send over the open connection; a session the server dropped is reopened once."""
+        import smtplib
+
+        try:
+            self._smtp.sendmail(mail.sender, mail.recipients, mail.message)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = self._connect()
+            self._smtp.sendmail(mail.sender, mail.recipients, mail.message)
+        self._last_used = time.monotonic()
+
+    def _fail(self, mail: OutgoingMail, error: Exception, final: bool = False):
+        mail.attempts += 1
+        mail.last_error = f"{type(error).__name__}: {error}"
+        if final or _is_permanent(error) or mail.attempts >= self.max_attempts:
+            self._dead_letter(mail)
+            return
+        delay = min(self.backoff_max, self.backoff * (2 ** (mail.attempts - 1)))
+        heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), mail))
+        self.counters["retried"] += 1
+        log.warning("Mail %s failed (%s); retry %d in %.1fs", mail.id, mail.last_error, mail.attempts, delay)
+
+    def _dead_letter(self, mail: OutgoingMail):
+        self.counters["dead_lettered"] += 1
+        log.error("Mail %s dead-lettered after %d attempts: %s", mail.id, mail.attempts, mail.last_error)
+        try:
+            os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({**asdict(mail), "dead_lettered_at": time.time()}) + "\n")
+        except OSError as e:
+            log.error("Could not write dead letter for %s: %s", mail.id, e)
+
+    def _send_batch(self, batch, final: bool = False):
+        import smtplib
+
+        for i, mail in enumerate(batch):
+            if self._smtp is None:
+                try:
+                    self._smtp = self._connect()
+                except Exception as e:
+                    # no session: the rest of the batch would fail the same way
+                    for waiting in batch[i:]:
+                        self._fail(waiting, e, final)
+                    return
+            try:
+                self._send_one(mail)
+                self.counters["sent"] += 1
+            except Exception as e:
+                if not isinstance(e, smtplib.SMTPResponseException) or e.smtp_code == 421:
+                    # connection-level trouble: start the next message on a fresh session
+                    self._disconnect()
+                self._fail(mail, e, final)
+
+    def _next_batch(self):
+        """Block until mail is due; returns (batch, stop_requested)."""
+        while True:
+            now = time.monotonic()
+            batch = []
+            while self._retries and self._retries[0][0] <= now and len(batch) < self.batch_max:
+                batch.append(heapq.heappop(self._retries)[2])
+
+            timeout = None
+            if self._retries:
+                timeout = max(0.0, self._retries[0][0] - now)
+            if self._smtp is not None:
+                idle_left = self._last_used + self.idle_seconds - now
+                if idle_left <= 0:
+                    self._disconnect()
+                else:
+                    timeout = idle_left if timeout is None else min(timeout, idle_left)
+
+            stop = False
+            try:
+                item = self._queue.get(block=not batch, timeout=timeout)
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_max:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch or stop:
+                return batch, stop
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            self._send_batch(batch, final=stop)
+            if stop:
+                # flush: whatever is still waiting gets one attempt, pending retries are dead-lettered
+                rest = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        rest.append(item)
+                self._send_batch(rest, final=True)
+                for _, _, mail in self._retries:
+                    mail.last_error = (mail.last_error or "") + " (dispatcher stopped)"
+                    self._dead_letter(mail)
+                self._retries.clear()
+                self._disconnect()
+                return
@@ -0,0 +1,269 @@
+"""
+Minimal Prometheus-style metrics (text exposition format, no dependency).
+
+Counters, gauges and histograms live in one process-wide REGISTRY and are
+rendered by the /metrics endpoint. Pipeline stages run in worker processes,
+so they time themselves with a StageTimer whose durations travel back with
+the result and are observed here in the API process.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, labels, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("_total", key, (), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self._function = function  # unlabelled gauges may be read on demand
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self):
+        if self._function is not None:
+            return [("", (), (), float(self._function()))]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", key, (), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        out = []
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                out.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            out.append(("_sum", key, (), total))
+            out.append(("_count", key, (), count))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# ------------------------------------------------------
+# PIPELINE METRICS
+# ------------------------------------------------------
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resume_stage_duration_seconds", "Time spent in each analysis pipeline stage.",
+    ("stage",), SECONDS_BUCKETS,
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route", "status"), SECONDS_BUCKETS,
+))
+INPUT_BYTES = REGISTRY.register(Histogram(
+    "resume_input_bytes", "Size of uploaded resume files.",
+    ("file_type",), (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7),
+))
+PAGES = REGISTRY.register(Histogram(
+    "resume_pages", "PDF pages processed per resume.",
+    ("file_type",), (1, 2, 3, 5, 10, 20, 30, 50, 100),
+))
+EXTRACTED_CHARS = REGISTRY.register(Histogram(
+    "resume_extracted_chars", "Characters of text extracted per resume.",
+    ("file_type",), (500, 1e3, 2500, 5e3, 1e4, 2.5e4, 5e4, 1e5, 2e5),
+))
+ANALYSES = REGISTRY.register(Counter(
+    "resume_analyses", "Resumes analysed, by file type and outcome.",
+    ("file_type", "outcome"),
+))
+ERRORS = REGISTRY.register(Counter(
+    "resume_errors", "Analysis failures by pipeline stage and file type.",
+    ("stage", "file_type"),
+))
+SECTIONS = REGISTRY.register(Counter(
+    "resume_sections", "Resume sections analysed, by whether their features were computed or cached.",
+    ("outcome",),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+))
+
+
+def file_type(filename: str) -> str:
+    """Bounded label value for a filename's extension."""
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return ext if ext in ("pdf", "docx", "doc", "txt", "zip") else "other"
+
+
+class StageTimer:
+    """
+    Collects {stage: seconds} inside a worker. An exception escaping a stage
+    is tagged with `pipeline_stage` so the API process can count it.
+    `listener(stage)` is called as each stage starts (e.g. job progress).
+    """
+
+    def __init__(self, listener=None):
+        self.durations = {}
+        self.listener = listener
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.listener is not None:
+            try:
+                self.listener(name)
+            except Exception:
+                pass  # progress reporting must never fail an analysis
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            if not hasattr(e, "pipeline_stage"):
+                e.pipeline_stage = name
+            raise
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - started
+
+
+def observe_stages(durations: dict):
+    for stage, seconds in (durations or {}).items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+def observe_sections(section_cache: dict):
+    """Count a result's `section_cache` report ({"sections", "computed"})."""
+    if not section_cache:
+        return
+    SECTIONS.inc(section_cache["computed"], outcome="computed")
+    SECTIONS.inc(section_cache["sections"] - section_cache["computed"], outcome="cached")
+
+
+def observe_extraction(filename: str, size: int, extraction: dict):
+    kind = file_type(filename)
+    INPUT_BYTES.observe(size, file_type=kind)
+    if extraction.get("pages_processed") is not None:
+        PAGES.observe(extraction["pages_processed"], file_type=kind)
+    EXTRACTED_CHARS.observe(extraction.get("chars", 0), file_type=kind)
+    if extraction.get("stop_reason") == "error":
+        ERRORS.inc(stage="extract", file_type=kind)
+
+
+def record_error(filename: str, error: BaseException = None, stage: str = None):
+    """Count a failed analysis against the stage it failed in (tagged by StageTimer)."""
+    stage = stage or getattr(error, "pipeline_stage", None) or "unknown"
+    ERRORS.inc(stage=stage, file_type=file_type(filename))
+    ANALYSES.inc(file_type=file_type(filename), outcome="error")
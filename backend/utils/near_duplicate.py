@@ -0,0 +1,215 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Text is normalised (lowercased, whitespace-collapsed, punctuation trimmed),
+cut into overlapping word shingles and reduced to a fixed-size uint32 MinHash
+signature. Signatures are split into bands; two resumes become candidates
+when any band hashes identically, and candidates are confirmed by the
+estimated Jaccard similarity. Lookup cost depends on bucket sizes, not on the
+number of indexed resumes.
+
+The index is persisted in SQLite (CANDIDATE_DB) and each process replays rows
+added, and tombstones of resumes removed, by other workers before answering a
+query.
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from utils.feature_store import CANDIDATE_DB
+
+# off | flag (store and mark) | collapse (mark, don't store the copy again)
+NEAR_DUP_ACTION = os.getenv("NEAR_DUP_ACTION", "flag").lower()
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.85"))
+# Return the earlier resume's cached analysis instead of re-analysing the copy
+NEAR_DUP_REUSE = os.getenv("NEAR_DUP_REUSE", "0") == "1"
+NEAR_DUP_NUM_PERM = 128
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures must be comparable across processes and restarts
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NEAR_DUP_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NEAR_DUP_NUM_PERM, dtype=np.uint64)
+
+_PUNCT = ".,;:!?()[]{}<>\"'|*•-–—"
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-bit hashes of the distinct k-word shingles of `text`."""
+    tokens = [t.strip(_PUNCT) for t in text.lower().split()]
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    if len(tokens) < k:
+        return np.array([zlib.crc32(" ".join(tokens).encode("utf-8"))], dtype=np.uint64)
+    shingles = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """Fixed-size (NEAR_DUP_NUM_PERM,) uint32 MinHash signature."""
+    hashes = shingle_hashes(text)
+    if len(hashes) == 0:
+        return np.full(NEAR_DUP_NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+    # (a * h + b) mod p, truncated to 32 bits; uint64 wrap-around is part of the hash family
+    with np.errstate(over="ignore"):
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def lsh_params(threshold: float, num_perm: int = NEAR_DUP_NUM_PERM) -> tuple:
+    """
+    (bands, rows) with bands * rows == num_perm whose S-curve midpoint
+    (1/bands)^(1/rows) is the highest one not above `threshold`, so true
+    near-duplicates are rarely missed; candidates are verified afterwards.
+    """
+    best = (num_perm, 1)
+    best_point = 0.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        point = (1.0 / bands) ** (1.0 / rows)
+        if best_point < point <= threshold:
+            best, best_point = (bands, rows), point
+    return best
+
+
+class NearDuplicateIndex:
+    def __init__(self, db_path: str = CANDIDATE_DB, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold)
+        self._buckets = [dict() for _ in range(self.bands)]  # band -> {band bytes: [resume_id]}
+        self._signatures = {}                                # resume_id -> (signature, cache_key)
+        self._lock = threading.RLock()
+        self._db = None
+        self._last_rowid = 0
+        self._last_delete_seq = 0
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS minhash_signatures ("
+                " resume_id TEXT PRIMARY KEY, signature BLOB NOT NULL, cache_key TEXT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS minhash_deletes ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT NOT NULL,"
+                " signature_rowid INTEGER NOT NULL)"
+            )
+            self._db.commit()
+            self.refresh()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray):
+        raw = signature.astype(np.uint32).tobytes()
+        width = self.rows * 4
+        return [raw[i * width:(i + 1) * width] for i in range(self.bands)]
+
+    def _insert_memory(self, resume_id, signature, cache_key):
+        if resume_id in self._signatures:
+            return
+        self._signatures[resume_id] = (signature, cache_key)
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(resume_id)
+
+    def _remove_memory(self, resume_id):
+        entry = self._signatures.pop(resume_id, None)
+        if entry is not None:
+            for band, key in zip(self._buckets, self._band_keys(entry[0])):
+                ids = band.get(key)
+                if ids and resume_id in ids:
+                    ids.remove(resume_id)
+
+    def refresh(self):
+        """Pick up signatures other workers have added and removed."""
+        if self._db is None:
+            return
+        with self._lock:
+            # One snapshot: a re-added resume's row is never seen without the
+            # tombstone of its earlier copy, and tombstones apply first
+            self._db.execute("BEGIN")
+            try:
+                deletes = self._db.execute(
+                    "SELECT seq, resume_id FROM minhash_deletes WHERE seq > ? ORDER BY seq",
+                    (self._last_delete_seq,),
+                ).fetchall()
+                rows = self._db.execute(
+                    "SELECT rowid, resume_id, signature, cache_key FROM minhash_signatures"
+                    " WHERE rowid > ? ORDER BY rowid",
+                    (self._last_rowid,),
+                ).fetchall()
+            finally:
+                self._db.execute("COMMIT")
+            for seq, resume_id in deletes:
+                self._remove_memory(resume_id)
+                self._last_delete_seq = seq
+            for rowid, resume_id, blob, cache_key in rows:
+                self._insert_memory(resume_id, np.frombuffer(blob, dtype=np.uint32).copy(), cache_key)
+                self._last_rowid = rowid
+
+    def add(self, resume_id: str, signature: np.ndarray, cache_key: str = None):
+        signature = np.asarray(signature, dtype=np.uint32)
+        with self._lock:
+            if self._db is not None:
+                # Explicit rowid: SQLite would reuse a removed maximum, which
+                # workers past that rowid would never replay
+                self._db.execute(
+                    "INSERT OR IGNORE INTO minhash_signatures (rowid, resume_id, signature, cache_key)"
+                    " VALUES (1 + MAX((SELECT COALESCE(MAX(rowid), 0) FROM minhash_signatures),"
+                    " (SELECT COALESCE(MAX(signature_rowid), 0) FROM minhash_deletes)), ?, ?, ?)",
+                    (resume_id, signature.tobytes(), cache_key),
+                )
+                self._db.commit()
+            self._insert_memory(resume_id, signature, cache_key)
+
+    def remove(self, resume_id: str):
+        """Forget a resume here and on disk; other processes drop it on their next refresh."""
+        with self._lock:
+            self._remove_memory(resume_id)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT rowid FROM minhash_signatures WHERE resume_id = ?", (resume_id,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("DELETE FROM minhash_signatures WHERE resume_id = ?", (resume_id,))
+                    self._db.execute(
+                        "INSERT INTO minhash_deletes (resume_id, signature_rowid) VALUES (?, ?)",
+                        (resume_id, row[0]),
+                    )
+                    self._db.commit()
+
+    def query(self, signature: np.ndarray, exclude: str = None):
+        """
+        Best indexed match at or above the threshold as
+        {"resume_id", "similarity", "cache_key"}, or None.
+        """
+        signature = np.asarray(signature, dtype=np.uint32)
+        with self._lock:
+            self.refresh()
+            candidates = set()
+            for band, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            candidates.discard(exclude)
+
+            best = None
+            for resume_id in candidates:
+                other, cache_key = self._signatures[resume_id]
+                similarity = estimated_jaccard(signature, other)
+                if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                    best = {"resume_id": resume_id, "similarity": round(similarity, 4), "cache_key": cache_key}
+            return best
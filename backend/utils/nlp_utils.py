@@ -6,8 +6,12 @@ Everything uses regex + TF-IDF + heuristics.
 """
 
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+
+from utils.document import as_document
+from utils.job_catalog import load_catalog
+from utils.role_index import load_or_build, RoleIndex
+from utils.skill_matcher import SkillMatcher
 
 # ---------------------------------------
 # COMMON SKILLS LIST
@@ -24,6 +28,21 @@ COMMON_SKILLS = [
     "tableau", "power bi", "excel"
 ]
 
+# Alternate spellings -> canonical entry in COMMON_SKILLS
+SKILL_ALIASES = {
+    "node.js": "node", "nodejs": "node",
+    "react.js": "react", "reactjs": "react",
+    "vue.js": "vue", "vuejs": "vue",
+    "golang": "go",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "sklearn": "scikit-learn",
+    "powerbi": "power bi",
+}
+
+# Compiled once at import; matching cost no longer grows with the taxonomy
+SKILL_MATCHER = SkillMatcher(COMMON_SKILLS, SKILL_ALIASES)
+
 # ---------------------------------------
 # JOB ROLES
 # ---------------------------------------
@@ -52,53 +71,38 @@ def normalize_text(text: str) -> str:
 # ---------------------------------------
 # ENTITY EXTRACTION (NO SPACY)
 # ---------------------------------------
-def extract_basic_entities(text: str) -> dict:
-    """Extract emails, phones, and some name-like patterns."""
-    
-    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-    phones = re.findall(r'\+?\d[\d\s\-]{8,}\d', text)
-
-    # "Persons" extracted using simple capitalized word heuristics
-    persons = re.findall(r'\b[A-Z][a-z]+\s[A-Z][a-z]+\b', text)
-
-    # ORG using uppercase tokens (e.g., GOOGLE, MICROSOFT)
-    organizations = [
-        w for w in re.findall(r'\b[A-Z][A-Z]+\b', text)
-        if len(w) > 2
-    ]
-
-    # remove duplicates
-    def dedupe(lst):
-        return list(dict.fromkeys(lst))
-
-    return {
-        "persons": dedupe(persons),
-        "organizations": dedupe(organizations),
-        "emails": dedupe(emails),
-        "phones": dedupe(phones),
-    }
+def extract_basic_entities(text) -> dict:
+    """
+    Extract emails, phones, and some name-like patterns.
+    Accepts text or an AnalysedDocument (whose single fused scan is reused).
+    """
+    entities = as_document(text).entities
+    return {kind: list(values) for kind, values in entities.items()}
 
 
 # ---------------------------------------
 # SKILL EXTRACTION WITHOUT SPACY
 # ---------------------------------------
-def extract_skills(text: str) -> list:
-    """Keyword matching with scoring heuristics."""
-    text_l = text.lower()
+def extract_skills(text) -> list:
+    """Keyword matching with scoring heuristics (single automaton pass)."""
+    return score_skill_hits(SKILL_MATCHER.scan(as_document(text).lower))
+
+
+def score_skill_hits(hits: dict) -> list:
+    """Confidence-scored skill list from SKILL_MATCHER.scan-style {skill: {"count", "first"}}."""
     results = []
 
-    for skill in COMMON_SKILLS:
-        count = text_l.count(skill)
-        if count > 0:
-            base = 40
-            freq_bonus = min(30, count * 10)
-            early_bonus = 10 if text_l.find(skill) < 300 else 0
-            confidence = min(100, base + freq_bonus + early_bonus)
-            results.append({
-                "skill": skill,
-                "confidence": confidence,
-                "count": count
-            })
+    for skill, hit in hits.items():
+        count = hit["count"]
+        base = 40
+        freq_bonus = min(30, count * 10)
+        early_bonus = 10 if hit["first"] < 300 else 0
+        confidence = min(100, base + freq_bonus + early_bonus)
+        results.append({
+            "skill": skill,
+            "confidence": confidence,
+            "count": count
+        })
 
     results.sort(key=lambda x: (x["confidence"], x["count"]), reverse=True)
     return results
@@ -131,25 +135,70 @@ def compute_ats_score(skills: list, text: str) -> int:
 # ---------------------------------------
 # JOB RECOMMENDATIONS
 # ---------------------------------------
+@lru_cache(maxsize=1)
+def get_role_index() -> RoleIndex:
+    """Default role index: loaded from the artifact or fitted once per process."""
+    return load_or_build(JOB_ROLES)
+
+
+@lru_cache(maxsize=16)
+def _custom_role_index(roles: tuple) -> RoleIndex:
+    return RoleIndex.build(list(roles))
+
+
+@lru_cache(maxsize=1)
+def get_job_catalog():
+    """The job-posting catalog (utils.job_catalog), or None when none is built."""
+    return load_catalog()
+
+
+def get_job_matcher():
+    """
+    What resumes are matched against by default: the posting catalog when
+    one is built, else the role index. Both provide `version` and `term_counts`.
+    """
+    return get_job_catalog() or get_role_index()
+
+
 def recommend_jobs_via_embeddings(text, job_roles=None, top_k=5):
-    """TF-IDF + cosine similarity job role ranking."""
+    """
+    Job ranking: nearest postings in the LSA catalog when one is built,
+    otherwise TF-IDF + cosine similarity against a fit-once role index.
+    Explicit `job_roles` are always ranked with a role index.
+    """
     roles = job_roles or JOB_ROLES
-    corpus = [text] + roles
 
     try:
-        vectorizer = TfidfVectorizer(stop_words="english")
-        tfidf = vectorizer.fit_transform(corpus)
+        catalog = get_job_catalog() if job_roles is None else None
+        if catalog is not None:
+            return catalog.recommend(catalog.embed_text(text), top_k)
 
-        resume_vec = tfidf[0:1]
-        role_vecs = tfidf[1:]
+        if roles is JOB_ROLES or list(roles) == JOB_ROLES:
+            index = get_role_index()
+        else:
+            index = _custom_role_index(tuple(roles))
 
-        sims = cosine_similarity(resume_vec, role_vecs).flatten()
-        results = [
+        return [
             {"role": r, "score": int(s * 100)}
-            for r, s in zip(roles, sims)
+            for r, s in index.top_k(text, top_k)
         ]
 
-        return sorted(results, key=lambda x: x["score"], reverse=True)[:top_k]
-
     except Exception:
         return [{"role": r, "score": 50} for r in roles][:top_k]
+
+
+def recommend_jobs_from_counts(term_counts: dict, top_k=5):
+    """recommend_jobs_via_embeddings for a document given as get_job_matcher() term counts."""
+    try:
+        catalog = get_job_catalog()
+        if catalog is not None:
+            return catalog.recommend(catalog.embed_counts(term_counts), top_k)
+
+        index = get_role_index()
+        return [
+            {"role": r, "score": int(s * 100)}
+            for r, s in index.rank(index.similarities_from_counts(term_counts), top_k)
+        ]
+
+    except Exception:
+        return [{"role": r, "score": 50} for r in JOB_ROLES][:top_k]
@@ -0,0 +1,132 @@
+"""
+Deadline budgets and overload control for interactive analysis.
+
+Every /analyze_resume call gets a Deadline: ANALYSIS_DEADLINE_SECONDS, or
+less when the client sends `X-Deadline-Ms`. Before a worker slot is taken
+the OverloadController predicts when the request would finish: the analyses
+already in flight, spread over the workers, times the recent per-analysis
+latency (EWMAs of the stage timings the workers report, per mode).
+
+  normal    the full pipeline fits within OVERLOAD_HEADROOM of the deadline
+            and fewer than OVERLOAD_DEGRADE_QUEUE analyses are in flight
+  degraded  extraction is capped (DEGRADED_MAX_PAGES / DEGRADED_MAX_CHARS),
+            job matching is skipped and the response carries `degraded: true`
+  reject    not even the degraded path fits in the deadline (503)
+
+A normal request whose extraction ran long is also switched to degraded
+before analysis when the remaining stages no longer fit.
+"""
+
+import os
+import time
+
+from utils.text_extraction import ExtractionBudget
+
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "20"))
+# Client deadlines (X-Deadline-Ms) are clamped to [min, ANALYSIS_DEADLINE_SECONDS]
+ANALYSIS_MIN_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_MIN_DEADLINE_SECONDS", "1"))
+DEADLINE_HEADER = "x-deadline-ms"
+
+# In-flight analyses from which new requests are degraded (0: twice the workers)
+OVERLOAD_DEGRADE_QUEUE = int(os.getenv("OVERLOAD_DEGRADE_QUEUE", "0"))
+# Full analysis only while its predicted completion is within this share of the deadline
+OVERLOAD_HEADROOM = float(os.getenv("OVERLOAD_HEADROOM", "0.5"))
+OVERLOAD_EWMA_ALPHA = float(os.getenv("OVERLOAD_EWMA_ALPHA", "0.2"))
+
+DEGRADED_MAX_PAGES = int(os.getenv("DEGRADED_MAX_PAGES", "5"))
+DEGRADED_MAX_CHARS = int(os.getenv("DEGRADED_MAX_CHARS", "30000"))
+# Extraction always gets at least this long, however little of the deadline is left
+MIN_EXTRACT_SECONDS = 0.25
+
+NORMAL = "normal"
+DEGRADED = "degraded"
+REJECT = "reject"
+
+# Stages run by prepare_source; the rest belong to the analysis phase
+EXTRACTION_STAGES = ("extract", "signature")
+
+
+class Deadline:
+    """Absolute point in time (monotonic clock) a request must answer by."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+def request_deadline(header_value=None) -> Deadline:
+    """Deadline from an `X-Deadline-Ms` header value (clamped), else the default."""
+    seconds = ANALYSIS_DEADLINE_SECONDS
+    if header_value:
+        try:
+            seconds = float(header_value) / 1000.0
+        except ValueError:
+            pass
+    return Deadline(min(max(seconds, ANALYSIS_MIN_DEADLINE_SECONDS), ANALYSIS_DEADLINE_SECONDS))
+
+
+class OverloadController:
+    """
+    Admission decisions from queue depth and recent stage latencies.
+    Used from the event loop thread only.
+    """
+
+    def __init__(self, workers: int, degrade_queue: int = OVERLOAD_DEGRADE_QUEUE,
+                 headroom: float = OVERLOAD_HEADROOM, alpha: float = OVERLOAD_EWMA_ALPHA):
+        self.workers = max(1, workers)
+        self.degrade_queue = degrade_queue or self.workers * 2
+        self.headroom = headroom
+        self.alpha = alpha
+        self.stage_seconds = {NORMAL: {}, DEGRADED: {}}
+        self.decisions = {NORMAL: 0, DEGRADED: 0, REJECT: 0}
+
+    def observe(self, mode: str, timings: dict):
+        """Fold one analysis's {stage: seconds} into the EWMAs for `mode`."""
+        averages = self.stage_seconds[mode]
+        for stage, seconds in (timings or {}).items():
+            previous = averages.get(stage)
+            averages[stage] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+
+    def expected_seconds(self, mode: str, skip=()) -> float:
+        """Recent latency of one analysis in `mode` (0 until measured), without the `skip` stages."""
+        averages = self.stage_seconds[mode] or self.stage_seconds[NORMAL]
+        return sum(seconds for stage, seconds in averages.items() if stage not in skip)
+
+    def predicted_seconds(self, mode: str, in_flight: int) -> float:
+        """When a request admitted now would finish, queueing behind `in_flight` others."""
+        return (in_flight // self.workers + 1) * self.expected_seconds(mode)
+
+    def decide(self, in_flight: int, deadline: Deadline) -> str:
+        remaining = deadline.remaining()
+        if in_flight < self.degrade_queue and \
+                self.predicted_seconds(NORMAL, in_flight) <= remaining * self.headroom:
+            mode = NORMAL
+        elif self.predicted_seconds(DEGRADED, in_flight) <= remaining:
+            mode = DEGRADED
+        else:
+            mode = REJECT
+        self.decisions[mode] += 1
+        return mode
+
+    def downgrade(self, mode: str, deadline: Deadline) -> str:
+        """After extraction: switch to degraded if the full analysis stages no longer fit."""
+        if mode == NORMAL and self.expected_seconds(NORMAL, EXTRACTION_STAGES) > deadline.remaining():
+            return DEGRADED
+        return mode
+
+    def extraction_budget(self, mode: str, deadline: Deadline) -> ExtractionBudget:
+        """Extraction limits for `mode`, with time left over for the analysis stages."""
+        seconds = deadline.remaining() - self.expected_seconds(mode, EXTRACTION_STAGES)
+        budget = ExtractionBudget()
+        budget.max_seconds = max(MIN_EXTRACT_SECONDS, min(budget.max_seconds, seconds))
+        if mode == DEGRADED:
+            budget.max_pages = min(budget.max_pages, DEGRADED_MAX_PAGES)
+            budget.max_chars = min(budget.max_chars, DEGRADED_MAX_CHARS)
+        return budget
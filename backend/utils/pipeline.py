@@ -0,0 +1,256 @@
+"""
+Resume analysis pipeline shared by the single-upload and batch endpoints.
+
+Everything here is plain, picklable module-level functions so the same code
+runs in the API process or inside a worker process.
+"""
+
+from utils.text_extraction import extract_document, ExtractionBudget
+from utils.document import AnalysedDocument, as_document, count_non_ascii, education_level
+from utils.nlp_utils import (
+    SKILL_MATCHER,
+    get_job_matcher,
+    score_skill_hits,
+    recommend_jobs_from_counts
+)
+from utils.ats_scoring import calculate_ats_score, ats_subscores
+from utils.entity_scanner import ENTITY_MAX_MATCHES, ENTITY_SCAN_MAX_CHARS, scan_entities
+from utils.near_duplicate import minhash_signature
+from utils.metrics import StageTimer
+from utils.result_cache import pipeline_version
+from utils.section_store import get_section_store
+from utils.sections import segment_sections
+
+SUMMARY_TEXT = (
+    "This resume has been analyzed locally. Consider optimizing your formatting "
+    "and ensuring relevant keywords are present for better ATS compatibility."
+)
+
+
+class EmptyResumeError(ValueError):
+    """Raised when no text could be extracted from an upload."""
+
+
+# ------------------------------------------------------
+# PER-SECTION FEATURES
+# ------------------------------------------------------
+def section_features(text: str, index) -> dict:
+    """
+    Everything cacheable about one section's normalised text: skill hits
+    (offsets relative to the section), entities, job-matcher term counts and
+    the text-derived ATS inputs ([non-ASCII characters, education level]).
+    Line statistics depend on line breaks the section text no longer has;
+    they come from the document's single construction pass instead.
+    """
+    lower = text.lower()
+    return {
+        "skills": {skill: [hit["count"], hit["first"]] for skill, hit in SKILL_MATCHER.scan(lower).items()},
+        "entities": scan_entities(text),
+        "terms": list(index.term_counts(text).items()),
+        "ats": [count_non_ascii(text), education_level(lower)],
+    }
+
+
+def sections_features(sections, store=None) -> tuple:
+    """
+    Features for each section, from `store` where the content hash is known.
+    Returns (features in section order, number of sections computed).
+    """
+    index = get_job_matcher()
+    version = f"{pipeline_version()}:{index.version}"
+    keys = [f"{version}:{section.digest}" for section in sections]
+    cached = store.get_features(keys) if store is not None else {}
+
+    computed = {}
+    features = []
+    for section, key in zip(sections, keys):
+        value = cached.get(key) or computed.get(key)
+        if value is None:
+            value = computed[key] = section_features(section.text, index)
+        features.append(value)
+    if store is not None:
+        store.put_features(computed)
+    return features, len(computed)
+
+
+def merge_sections(sections, features) -> tuple:
+    """
+    Combine per-section features into whole-document (skill hits, entities,
+    term counts, ATS inputs), as if the joined text had been scanned in one
+    go (matches never span a section boundary). The ATS inputs are the
+    AnalysedDocument properties they replace: non-ASCII counts add up and
+    the education level is the best one found.
+    """
+    hits = {}
+    entities = {"persons": {}, "organizations": {}, "emails": {}, "phones": {}}
+    terms = {}
+    non_ascii = 0
+    education = 0.0
+    offset = 0
+    for section, feature in zip(sections, features):
+        for skill, (count, first) in feature["skills"].items():
+            hit = hits.get(skill)
+            if hit is None:
+                hits[skill] = {"count": count, "first": offset + first}
+            else:
+                hit["count"] += count
+        if offset < ENTITY_SCAN_MAX_CHARS:
+            for kind, values in feature["entities"].items():
+                merged = entities[kind]
+                for value in values:
+                    if len(merged) >= ENTITY_MAX_MATCHES:
+                        break
+                    merged.setdefault(value, None)
+        for column, count in feature["terms"]:
+            terms[column] = terms.get(column, 0) + count
+        non_ascii += feature["ats"][0]
+        education = max(education, feature["ats"][1])
+        offset += len(section.text) + 1
+    return (
+        SKILL_MATCHER.in_taxonomy_order(hits),
+        {kind: list(values) for kind, values in entities.items()},
+        terms,
+        {"non_ascii_count": non_ascii, "education_level": education},
+    )
+
+
+def analyze_text(raw_text, timer: StageTimer = None, store=None, degraded: bool = False) -> dict:
+    """
+    Run entities, skills, job matching and ATS scoring on extracted text.
+    The text is split into sections whose features are cached by content
+    hash (in `store`, default: this process's SectionStore), so an edited
+    resume only re-extracts the sections that changed (store=False disables
+    the cache); the merged features feed the whole-document scores. Pass a
+    StageTimer to collect per-stage durations; `section_cache` in the
+    response says how many sections were computed vs reused (callers pop it
+    before caching the result).
+    ATS sub-scores are merged too: the text scans behind them are cached
+    per section, and the line statistics come from building the document.
+    `degraded` (overload) skips job matching and marks the response.
+    """
+    timer = timer or StageTimer()
+    store = get_section_store() if store is None else store
+    with timer.stage("normalize"):
+        doc = as_document(raw_text)
+        sections = segment_sections(doc.raw)
+
+    # 1. Entities, skill hits and term counts per section (cached), merged
+    with timer.stage("sections"):
+        features, computed = sections_features(sections, store or None)
+        skill_hits, entities, terms, ats_inputs = merge_sections(sections, features)
+        doc.seed(**ats_inputs)
+
+    # 2. Extract Skills
+    with timer.stage("skills"):
+        skills_list = score_skill_hits(skill_hits)
+
+    # 3. Job Recommendations (skipped under overload)
+    job_recs = []
+    if not degraded:
+        with timer.stage("job_match"):
+            job_recs = recommend_jobs_from_counts(terms, top_k=5)
+
+    # 4. ATS Score
+    with timer.stage("ats_score"):
+        ats_score, breakdown = calculate_ats_score(skills_list, doc, entities)
+        ats_features = ats_subscores(skills_list, doc, entities)
+
+    # 5. Build JSON Response
+    return {
+        "overall_score": ats_score,
+        "ats_score": ats_score,
+        "ats_breakdown": breakdown,
+        "key_metrics": {
+            "keyword_density": breakdown.get("keyword_coverage", 0),
+            "formatting_clarity": breakdown.get("formatting_score", 0)
+        },
+        "skills_proficiency": skills_list,
+        "job_recommendations": job_recs,
+        "entities": entities,
+        "summary": SUMMARY_TEXT,
+        # unrounded sub-scores, kept for re-ranking under other weights
+        "ats_features": ats_features,
+        "sections": [section.summary() for section in sections],
+        "section_cache": {"sections": len(sections), "computed": computed},
+        "degraded": degraded,
+    }
+
+
+def prepare_source(source, filename: str, budget: ExtractionBudget = None, progress=None,
+                   executor=None, plan=None) -> dict:
+    """
+    First stage: extract text within the budget and compute its MinHash
+    signature, so the caller can look for a near-duplicate before paying for
+    the analysis. Returns {"text", "extraction", "signature", "timings"};
+    raises EmptyResumeError / UnsupportedFormatError. `progress(stage)` is
+    called as each stage starts. With an `executor` (run from the API
+    process), large PDFs are extracted as page ranges across it. `plan`
+    (plan_extraction's result, if the caller has one) saves detecting the
+    format and counting pages again.
+    """
+    timer = StageTimer(progress)
+    with timer.stage("extract"):
+        extraction = extract_document(source, filename or "", budget, executor=executor, plan=plan)
+        # Built from the raw text so line structure survives for formatting checks
+        doc = AnalysedDocument(extraction.text)
+        if not doc.text:
+            raise EmptyResumeError("Could not extract resume text")
+
+    with timer.stage("signature"):
+        signature = minhash_signature(doc.text)
+
+    return {
+        "text": extraction.text,
+        "extraction": extraction.summary(),
+        "signature": signature,
+        "timings": timer.durations,
+    }
+
+
+def analyze_prepared(prepared: dict, progress=None, degraded: bool = False) -> dict:
+    """
+    Second stage: analyse the text returned by prepare_source (`degraded`:
+    see analyze_text). Stage durations are returned under `timings` for the
+    caller to record.
+    """
+    timer = StageTimer(progress)
+    response = analyze_text(prepared["text"], timer, degraded=degraded)
+    response["extraction"] = prepared["extraction"]
+    response["timings"] = timer.durations
+    return response
+
+
+def analyze_source(source, filename: str, budget: ExtractionBudget = None) -> dict:
+    """
+    Extract text from upload content (bytes, or a path for spilled/offline files)
+    within the extraction budget and analyse it. Raises EmptyResumeError.
+    The response's `extraction` block says how much of the document was read.
+    """
+    return analyze_prepared(prepare_source(source, filename, budget))
+
+
+def analyze_batch_item(index: int, filename: str, data: bytes) -> dict:
+    """
+    Analyse one batch member; failures become a per-item error record.
+    Successful items also carry the text's MinHash `signature` and both
+    stages' `timings` for the caller; failures name the failing `stage`.
+    """
+    try:
+        prepared = prepare_source(data, filename)
+        result = analyze_prepared(prepared)
+        return {
+            "index": index,
+            "filename": filename,
+            "status": "ok",
+            "result": result,
+            "signature": prepared["signature"],
+            "timings": {**prepared["timings"], **result.pop("timings")},
+        }
+    except Exception as e:
+        return {
+            "index": index,
+            "filename": filename,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "stage": getattr(e, "pipeline_stage", "unknown"),
+        }
@@ -0,0 +1,209 @@
+"""
+Opt-in cProfile captures of individual analyses.
+
+A request is profiled when it carries `X-Profile: <PROFILE_TOKEN>` or is
+picked by PROFILE_SAMPLE_RATE; unprofiled requests never touch this module
+beyond `should_profile`. Each profiled stage (run in a worker or in this
+process) is saved to PROFILE_DIR as `<profile_id>-<stage>.prof` (pstats
+format, e.g. for snakeviz) plus a `.json` summary with its top functions by
+self time. Only the newest PROFILE_KEEP stages are kept.
+
+GET /profiles (and the .prof downloads) need the same `X-Profile` token and
+answer 404 while PROFILE_TOKEN is unset.
+
+The same hooks serve the bulk CLI (--profile-rate) and the benchmark suite
+(--profile). List recent captures with:
+    python -m utils.profiling [--dir DIR] [--limit N]
+"""
+
+import argparse
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+# Header value that enables profiling for one request; empty disables the header
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "15"))
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+_NAME = re.compile(r"^[0-9TZ]+-[0-9a-f]+-[\w.\[\]-]+$")
+
+
+@dataclass(frozen=True)
+class Profile:
+    """One profiled run: its stages are saved under `profile_id` in `directory`."""
+    profile_id: str
+    label: str = ""
+    directory: Optional[str] = None
+
+
+def is_trusted(header_value: Optional[str]) -> bool:
+    """True when PROFILE_TOKEN is configured and `header_value` matches it."""
+    return bool(header_value and PROFILE_TOKEN) and hmac.compare_digest(
+        header_value.encode(), PROFILE_TOKEN.encode()
+    )
+
+
+def should_profile(header_value: Optional[str] = None, rate: float = None) -> bool:
+    """True when the header carries the trusted token, or this call is sampled."""
+    if is_trusted(header_value):
+        return True
+    rate = PROFILE_SAMPLE_RATE if rate is None else rate
+    return rate > 0 and random.random() < rate
+
+
+def start_profile(label: str = "", directory: Optional[str] = None) -> Profile:
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{secrets.token_hex(4)}"
+    return Profile(profile_id, label, directory)
+
+
+# ------------------------------------------------------
+# CAPTURE
+# ------------------------------------------------------
+def top_functions(stats: pstats.Stats, limit: int = PROFILE_TOP) -> list:
+    """The `limit` functions with the most self time."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    top = []
+    for (filename, line, name), (_, calls, self_time, cumulative, _) in rows:
+        where = "/".join(filename.replace("\\", "/").split("/")[-2:])
+        top.append({
+            "function": f"{where}:{line}({name})" if line else name,
+            "calls": calls,
+            "self_ms": round(self_time * 1000.0, 3),
+            "cumulative_ms": round(cumulative * 1000.0, 3),
+        })
+    return top
+
+
+def _summaries(directory: str) -> list:
+    """Summary file names, oldest first."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".json"):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.name))
+            except FileNotFoundError:
+                continue
+    return [name for _, name in sorted(entries)]
+
+
+def _prune(directory: str, keep: int):
+    summaries = _summaries(directory)
+    for name in summaries[:max(0, len(summaries) - keep)]:
+        for path in (name, name[:-5] + ".prof"):
+            try:
+                os.remove(os.path.join(directory, path))
+            except FileNotFoundError:
+                pass  # pruned by another process
+
+
+def save_profile(profiler: cProfile.Profile, profile: Profile, stage: str, seconds: float) -> dict:
+    """Write the .prof and .json summary for one stage and rotate the directory."""
+    directory = profile.directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    name = f"{profile.profile_id}-{stage}"
+    summary = {
+        "name": name,
+        "profile_id": profile.profile_id,
+        "stage": stage,
+        "label": profile.label,
+        "seconds": round(seconds, 6),
+        "created_at": time.time(),
+        "pid": os.getpid(),
+        "top": top_functions(pstats.Stats(profiler)),
+    }
+    profiler.dump_stats(os.path.join(directory, name + ".prof"))
+    tmp = os.path.join(directory, f".{name}.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+    os.replace(tmp, os.path.join(directory, name + ".json"))
+    _prune(directory, PROFILE_KEEP)
+    return summary
+
+
+@contextmanager
+def profiled(profile: Profile, stage: str):
+    """Profile the calling thread for the duration of the block."""
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        save_profile(profiler, profile, stage, time.perf_counter() - started)
+
+
+def run_profiled(profile: Profile, stage: str, fn, *args):
+    """fn(*args) under the profiler; picklable, so it can be submitted to a pool."""
+    with profiled(profile, stage):
+        return fn(*args)
+
+
+def profiled_call(profile: Optional[Profile], stage: str, fn, *args) -> tuple:
+    """(callable, *args) to submit: unchanged when `profile` is None."""
+    if profile is None:
+        return (fn, *args)
+    return (run_profiled, profile, stage, fn, *args)
+
+
+# ------------------------------------------------------
+# LISTING
+# ------------------------------------------------------
+def list_profiles(limit: int = 20, directory: Optional[str] = None) -> list:
+    """Summaries of the newest `limit` saved stages, newest first."""
+    directory = directory or PROFILE_DIR
+    try:
+        names = _summaries(directory)[::-1]
+    except FileNotFoundError:
+        return []
+    summaries = []
+    for name in names[:limit]:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                summaries.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # pruned or half-written
+    return summaries
+
+
+def profile_path(name: str, directory: Optional[str] = None) -> Optional[str]:
+    """Path of a saved .prof by summary `name`, or None (names are validated)."""
+    if not _NAME.match(name):
+        return None
+    path = os.path.join(directory or PROFILE_DIR, name + ".prof")
+    return path if os.path.exists(path) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List saved analysis profiles.")
+    parser.add_argument("--dir", default=PROFILE_DIR)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--top", type=int, default=5, help="functions shown per profile")
+    args = parser.parse_args()
+
+    summaries = list_profiles(args.limit, args.dir)
+    if not summaries:
+        print(f"No profiles in {args.dir}")
+    for summary in summaries:
+        print(f"{summary['name']}  {summary['seconds'] * 1000:.1f} ms  {summary['label']}")
+        for row in summary["top"][:args.top]:
+            print(f"    {row['self_ms']:>9.3f} ms self {row['cumulative_ms']:>9.3f} ms cum "
+                  f"{row['calls']:>7}  {row['function']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Analysis response models and the fast JSON path.
+
+The models declare the /analyze_resume schema for OpenAPI and clients; the
+results themselves are already plain JSON-ready dicts, so they are not run
+through FastAPI's jsonable_encoder / model validation but dumped directly -
+with orjson when it is installed, otherwise stdlib json with compact
+separators.
+
+`?fields=skills,ats` returns only the named groups (or top-level fields)
+plus `resume_id`, `degraded` and any near-duplicate / revision block; the
+legacy duplicates (`overall_score`, `key_metrics`) appear only in the full
+response. Entity lists are capped at RESPONSE_MAX_ENTITIES per kind.
+Bodies of at least RESPONSE_COMPRESS_MIN_BYTES are compressed with br
+(when the brotli package is installed) or gzip, as the client accepts.
+"""
+
+import gzip
+import json
+import os
+from typing import Dict, List, Optional
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+RESPONSE_MAX_ENTITIES = int(os.getenv("RESPONSE_MAX_ENTITIES", "20"))
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+# ------------------------------------------------------
+# RESPONSE MODELS
+# ------------------------------------------------------
+class SkillProficiency(BaseModel):
+    skill: str
+    confidence: int
+    count: int
+
+
+class JobRecommendation(BaseModel):
+    role: str
+    score: int
+    # set when matched against the job-posting catalog
+    posting_id: Optional[str] = None
+    company: Optional[str] = None
+
+
+class Entities(BaseModel):
+    persons: List[str] = []
+    organizations: List[str] = []
+    emails: List[str] = []
+    phones: List[str] = []
+
+
+class KeyMetrics(BaseModel):
+    keyword_density: float
+    formatting_clarity: float
+
+
+class Extraction(BaseModel):
+    pages_processed: Optional[int] = None
+    pages_total: Optional[int] = None
+    chars: int
+    stop_reason: str
+    seconds: float
+    truncated: bool
+
+
+class SectionSummary(BaseModel):
+    name: str
+    hash: str
+    words: int
+
+
+class NearDuplicate(BaseModel):
+    resume_id: str
+    similarity: float
+    collapsed: bool
+    analysis_reused: bool
+
+
+class Revision(BaseModel):
+    previous_id: str
+    changed_sections: List[str]
+    added_sections: List[str]
+    removed_sections: List[str]
+    unchanged_sections: List[str]
+    previous_score: int
+    score_delta: int
+    sub_score_deltas: Dict[str, float]
+    skills_added: List[str]
+    skills_removed: List[str]
+
+
+class AnalysisResponse(BaseModel):
+    """Every field is optional: `?fields=` responses carry a subset."""
+    resume_id: Optional[str] = None
+    degraded: bool = False
+    ats_score: Optional[int] = None
+    ats_breakdown: Optional[Dict[str, float]] = None
+    skills_proficiency: Optional[List[SkillProficiency]] = None
+    job_recommendations: Optional[List[JobRecommendation]] = None
+    entities: Optional[Entities] = None
+    summary: Optional[str] = None
+    ats_features: Optional[Dict[str, float]] = None
+    sections: Optional[List[SectionSummary]] = None
+    extraction: Optional[Extraction] = None
+    near_duplicate: Optional[NearDuplicate] = None
+    revision: Optional[Revision] = None
+    # legacy duplicates of ats_score / ats_breakdown, full responses only
+    overall_score: Optional[int] = None
+    key_metrics: Optional[KeyMetrics] = None
+
+
+# ------------------------------------------------------
+# FIELD SELECTION
+# ------------------------------------------------------
+FIELD_GROUPS = {
+    "ats": ("ats_score", "ats_breakdown"),
+    "skills": ("skills_proficiency",),
+    "jobs": ("job_recommendations",),
+    "entities": ("entities",),
+    "features": ("ats_features",),
+    "sections": ("sections",),
+    "extraction": ("extraction",),
+    "summary": ("summary",),
+}
+ALWAYS_INCLUDED = ("resume_id", "degraded", "near_duplicate", "revision")
+# pydantic 2 / 1
+RESPONSE_FIELDS = tuple(getattr(AnalysisResponse, "model_fields", None) or AnalysisResponse.__fields__)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple]:
+    """
+    Top-level keys selected by a `fields` parameter ("skills,ats"), or None
+    for the full response. Raises ValueError naming unknown entries.
+    """
+    if not fields:
+        return None
+    selected = list(ALWAYS_INCLUDED)
+    unknown = []
+    for name in (part.strip().lower() for part in fields.split(",")):
+        if not name:
+            continue
+        if name in FIELD_GROUPS:
+            selected.extend(FIELD_GROUPS[name])
+        elif name in RESPONSE_FIELDS:
+            selected.append(name)
+        else:
+            unknown.append(name)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)} (groups: {', '.join(FIELD_GROUPS)})"
+        )
+    return tuple(dict.fromkeys(selected))
+
+
+def shape_response(result: dict, selected: Optional[tuple] = None) -> dict:
+    """The wire form of an analysis: selected fields only, entity lists capped."""
+    if selected is None:
+        shaped = {key: value for key, value in result.items() if key in RESPONSE_FIELDS}
+    else:
+        shaped = {key: result[key] for key in selected if key in result}
+    entities = shaped.get("entities")
+    if entities:
+        shaped["entities"] = {kind: values[:RESPONSE_MAX_ENTITIES] for kind, values in entities.items()}
+    return shaped
+
+
+# ------------------------------------------------------
+# SERIALISATION & COMPRESSION
+# ------------------------------------------------------
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred encoding from an Accept-Encoding header ("br", "gzip" or None); q=0 refuses."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def json_response(payload, accept_encoding: Optional[str] = None, status_code: int = 200) -> Response:
+    """Serialise `payload` once and compress it when large and accepted."""
+    body = dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is not None:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
@@ -0,0 +1,286 @@
+"""
+Content-addressed cache for analysis results.
+
+Keys combine the SHA-256 of the uploaded bytes, the file extension (it picks
+the parser) and a pipeline version derived from the skill taxonomy, job roles,
+job catalog and ATS weights, so changing any of those naturally misses old
+entries.
+
+Two tiers:
+  - in-memory LRU bounded by entry count and TTL (per process)
+  - optional SQLite file shared by every uvicorn worker on the host; it also
+    carries an invalidation generation, so `invalidate` in one worker drops
+    the memory tier of the others (within RESULT_CACHE_SYNC_SECONDS).
+    Without it, invalidation is per process.
+Concurrent requests for the same key inside one process share a single
+computation (single-flight). It runs in its own task, so a caller that goes
+away (client disconnect) does not cancel it for the others.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.nlp_utils import COMMON_SKILLS, SKILL_ALIASES, JOB_ROLES
+from utils.job_catalog import catalog_version
+from utils.ats_scoring import ATS_WEIGHTS
+
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "3600"))
+RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB", "")  # empty disables the disk tier
+# How often a worker checks the disk tier for invalidations made elsewhere
+RESULT_CACHE_SYNC_SECONDS = float(os.getenv("RESULT_CACHE_SYNC_SECONDS", "1"))
+
+# Bump when extraction/analysis code changes in a way that alters results
+PIPELINE_REVISION = 11
+
+
+def pipeline_version() -> str:
+    """Stamp covering everything that changes an analysis result."""
+    payload = json.dumps({
+        "revision": PIPELINE_REVISION,
+        "skills": COMMON_SKILLS,
+        "aliases": SKILL_ALIASES,
+        "roles": JOB_ROLES,
+        "ats_weights": ATS_WEIGHTS,
+        "job_catalog": catalog_version(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def content_key(digest: str, filename: str, version: str) -> str:
+    """Cache key for an upload whose SHA-256 hex digest is `digest`."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    return f"{version}:{digest}:{ext}"
+
+
+class _Flight:
+    """One shared computation and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class ResultCache:
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, ttl=RESULT_CACHE_TTL, db_path=RESULT_CACHE_DB):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = pipeline_version()
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._inflight = {}           # key -> _Flight
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._generation = 0
+        self._synced_at = time.monotonic()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, version TEXT NOT NULL,"
+                " stored_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+            self._db.commit()
+            self._generation = self._read_generation()
+
+    def key_for(self, data: bytes, filename: str) -> str:
+        return self.key_for_digest(hashlib.sha256(data).hexdigest(), filename)
+
+    def key_for_digest(self, digest: str, filename: str) -> str:
+        return content_key(digest, filename, self.version)
+
+    # ---------------- cross-process invalidation ----------------
+    def _read_generation(self) -> int:
+        with self._db_lock:
+            return self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def _sync_generation(self):
+        """Drop the memory tier once another process has invalidated the shared cache."""
+        if self._db is None:
+            return
+        now = time.monotonic()
+        if now - self._synced_at < RESULT_CACHE_SYNC_SECONDS:
+            return
+        self._synced_at = now
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.version = pipeline_version()
+            self._memory.clear()
+
+    # ---------------- memory tier ----------------
+    def _memory_get(self, key):
+        self._sync_generation()
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if time.time() - stored_at > self.ttl:
+            del self._memory[key]
+            self.counters["evictions"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key, value, stored_at=None):
+        self._memory[key] = (stored_at or time.time(), value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    # ---------------- disk tier ----------------
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT stored_at, value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        stored_at, value = row
+        if time.time() - stored_at > self.ttl:
+            return None
+        return stored_at, json.loads(value)
+
+    def _disk_put(self, key, value):
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, version, stored_at, value) VALUES (?, ?, ?, ?)",
+                (key, self.version, time.time(), json.dumps(value)),
+            )
+            self._db.commit()
+
+    # ---------------- public API ----------------
+    def get(self, key):
+        """Look up both tiers; returns a shallow copy or None."""
+        value = self._memory_get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return dict(value)
+        hit = self._disk_get(key)
+        if hit is not None:
+            stored_at, value = hit
+            self._memory_put(key, value, stored_at)
+            self.counters["disk_hits"] += 1
+            return dict(value)
+        self.counters["misses"] += 1
+        return None
+
+    def put(self, key, value: dict):
+        self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    async def get_or_compute(self, key, compute, cacheable=None):
+        """
+        Return the cached value for `key`, or await `compute()` once and cache it
+        (unless `cacheable(value)` says otherwise, e.g. a degraded result).
+        Concurrent callers with the same key wait on the same computation and
+        share its outcome, including an error or a degraded result decided
+        under the first caller's deadline (the load that caused it applies to
+        them as well). The computation is cancelled only once every caller
+        has gone; a caller still waiting then starts a fresh one.
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return dict(value)
+
+        while True:
+            flight = self._inflight.get(key)
+            if flight is None:
+                task = asyncio.ensure_future(self._fill(key, compute, cacheable))
+                flight = self._inflight[key] = _Flight(task)
+                task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            else:
+                self.counters["shared"] += 1
+            flight.waiters += 1
+            try:
+                # wait() (unlike awaiting the task) never cancels it on our behalf
+                await asyncio.wait({flight.task})
+            except asyncio.CancelledError:
+                if flight.waiters == 1 and not flight.task.done():
+                    self._forget(key, flight.task)
+                    flight.task.cancel()
+                raise
+            finally:
+                flight.waiters -= 1
+            if not flight.task.cancelled():
+                return dict(flight.task.result())
+
+    async def _fill(self, key, compute, cacheable):
+        hit = await asyncio.to_thread(self._disk_get, key)
+        if hit is not None:
+            stored_at, value = hit
+            self._memory_put(key, value, stored_at)
+            self.counters["disk_hits"] += 1
+            return value
+        self.counters["misses"] += 1
+        value = await compute()
+        if cacheable is None or cacheable(value):
+            self._memory_put(key, value)
+            await asyncio.to_thread(self._disk_put, key, value)
+        return value
+
+    def _forget(self, key, task: asyncio.Task):
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if task.done() and not task.cancelled():
+            # mark retrieved so an unshared failure doesn't log "exception never retrieved"
+            task.exception()
+
+    def invalidate(self, everything: bool = False) -> dict:
+        """
+        Drop cached results. By default only entries from other pipeline
+        versions are purged from disk; `everything=True` clears it all.
+        The version is recomputed, so edits to the taxonomy or weights made
+        at runtime take effect. With the disk tier, other processes clear
+        their memory tier on their next lookup (see _sync_generation);
+        without it only this process is affected.
+        """
+        self.version = pipeline_version()
+        dropped_memory = len(self._memory)
+        self._memory.clear()
+        dropped_disk = 0
+        if self._db is not None:
+            with self._db_lock:
+                if everything:
+                    cur = self._db.execute("DELETE FROM results")
+                else:
+                    cur = self._db.execute("DELETE FROM results WHERE version != ?", (self.version,))
+                dropped_disk = cur.rowcount
+                self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                self._db.commit()
+                self._generation = self._db.execute(
+                    "SELECT value FROM meta WHERE key = 'generation'"
+                ).fetchone()[0]
+        return {"version": self.version, "memory_dropped": dropped_memory, "disk_dropped": dropped_disk}
+
+    def stats(self) -> dict:
+        lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+        return {
+            "version": self.version,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk_enabled": self._db is not None,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            **self.counters,
+        }
@@ -0,0 +1,206 @@
+"""
+Fit-once TF-IDF index over job-role documents.
+
+The original scoring fitted a TfidfVectorizer on [resume] + roles for every
+request. The only thing the resume changes in that fit is document
+frequency: each of its terms occurs in one more document. So the index
+keeps the role term counts and their document frequencies from a single
+fit, and per request applies that +1 in closed form (role terms the resume
+shares get `idf_in`, the rest `idf_out`, resume-only terms `idf_unseen`).
+Scores are the same cosine similarities the per-request fit produced, with
+one sparse product per request. Resume terms outside the role vocabulary
+still count towards the resume's norm, so `term_counts` keeps them too.
+
+Rebuild the serialized artifact after changing JOB_ROLES:
+    python -m utils.role_index --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+from importlib.metadata import version as package_version
+
+import numpy as np
+
+# scikit-learn itself is imported only when an index is fitted or unpickled,
+# so importing this module (and the API) stays cheap
+
+ROLE_INDEX_PATH = os.getenv("ROLE_INDEX_PATH", os.path.join("artifacts", "role_index.pkl"))
+
+# Bump when the vectorizer settings or scoring below change
+ROLE_INDEX_REVISION = 2
+VECTORIZER_PARAMS = {"stop_words": "english"}
+
+log = logging.getLogger(__name__)
+
+
+def role_index_version(roles) -> str:
+    """Stable stamp for a set of roles + vectorizer settings."""
+    payload = json.dumps({
+        "roles": list(roles),
+        "params": VECTORIZER_PARAMS,
+        "revision": ROLE_INDEX_REVISION,
+        "sklearn": package_version("scikit-learn"),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def count_terms(analyzer, vocabulary: dict, text: str) -> dict:
+    """{vocabulary column: count} of the in-vocabulary terms `analyzer` finds in `text`."""
+    counts = {}
+    for term in analyzer(text):
+        column = vocabulary.get(term)
+        if column is not None:
+            counts[column] = counts.get(column, 0) + 1
+    return counts
+
+
+class RoleIndex:
+    """Role term counts plus the vocabulary they were counted with."""
+
+    def __init__(self, roles, vectorizer, role_counts, version):
+        self.roles = list(roles)
+        self.vectorizer = vectorizer
+        role_counts = role_counts.tocsr().astype(np.float64)
+        # (n_terms, n_roles) CSR, transposed once for the per-request products
+        self.role_counts_t = role_counts.T.tocsr()
+        self.role_squares_t = role_counts.multiply(role_counts).T.tocsr()
+        df = np.bincount(role_counts.indices, minlength=role_counts.shape[1])
+        # Smoothed IDF over the roles plus the resume: ln((1 + n) / (1 + df)) + 1
+        n = len(self.roles) + 2
+        self.idf_in = np.log(n / (df + 2.0)) + 1.0
+        self.idf_out = np.log(n / (df + 1.0)) + 1.0
+        self.idf_unseen = np.log(n / 2.0) + 1.0
+        # Squared role norms when the resume shares none of their terms
+        self.role_norms2 = np.asarray(role_counts.multiply(role_counts) @ self.idf_out ** 2).ravel()
+        self.version = version
+        self._analyzer = None  # built on first term_counts call
+
+    @classmethod
+    def build(cls, roles):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(**VECTORIZER_PARAMS)
+        role_counts = vectorizer.fit_transform(roles)
+        return cls(roles, vectorizer, role_counts, role_index_version(roles))
+
+    def save(self, path: str = ROLE_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({
+                "version": self.version,
+                "roles": self.roles,
+                "vectorizer": self.vectorizer,
+                "role_counts": self.role_counts_t.T.tocsr(),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = ROLE_INDEX_PATH):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["roles"], data["vectorizer"], data["role_counts"], data["version"])
+
+    def similarities(self, text: str) -> np.ndarray:
+        """Cosine similarity of `text` against every role."""
+        return self.similarities_from_counts(self.term_counts(text))
+
+    def term_counts(self, text: str) -> dict:
+        """
+        {vocabulary column: count} for `text`, plus {term: count} for terms
+        outside the role vocabulary. Counts of texts joined by whitespace add
+        up (tokens never span the join), so a document's vector can be
+        assembled from cached per-section counts.
+        """
+        if self._analyzer is None:
+            self._analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        counts = {}
+        for term in self._analyzer(text):
+            key = vocabulary.get(term, term)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def similarities_from_counts(self, counts: dict) -> np.ndarray:
+        """Same as `similarities` for the text whose term_counts are `counts`."""
+        unseen = sum(count * count for key, count in counts.items() if isinstance(key, str))
+        shared = {key: count for key, count in counts.items() if not isinstance(key, str)}
+        columns = np.fromiter(shared.keys(), dtype=np.int64, count=len(shared))
+        weights = np.fromiter(shared.values(), dtype=np.float64, count=len(shared))
+        idf2 = self.idf_in[columns] ** 2
+        resume_norm = np.sqrt(weights ** 2 @ idf2 + unseen * self.idf_unseen ** 2)
+        sims = np.zeros(len(self.roles))
+        if resume_norm == 0:
+            return sims
+        dots = np.asarray(self.role_counts_t[columns].T @ (weights * idf2)).ravel()
+        role_norms = np.sqrt(
+            self.role_norms2
+            + np.asarray(self.role_squares_t[columns].T @ (idf2 - self.idf_out[columns] ** 2)).ravel()
+        )
+        np.divide(dots, resume_norm * role_norms, out=sims, where=role_norms > 0)
+        return sims
+
+    def top_k(self, text: str, top_k: int = 5) -> list:
+        """[(role, similarity)] best first; ties keep role order."""
+        return self.rank(self.similarities(text), top_k)
+
+    def rank(self, sims: np.ndarray, top_k: int = 5) -> list:
+        """[(role, similarity)] for precomputed similarities, best first; ties keep role order."""
+        n = len(sims)
+        k = max(0, min(top_k, n))
+        if k == 0:
+            return []
+        if k < n:
+            candidates = np.argpartition(-sims, k - 1)[:k]
+            # argpartition may cut through a tie; widen to every role at the cutoff
+            cutoff = sims[candidates].min()
+            candidates = np.flatnonzero(sims >= cutoff)
+        else:
+            candidates = np.arange(n)
+        order = sorted(candidates, key=lambda i: (-sims[i], i))[:k]
+        return [(self.roles[i], float(sims[i])) for i in order]
+
+
+def load_or_build(roles, path: str = ROLE_INDEX_PATH) -> RoleIndex:
+    """Load the serialized index if its version matches `roles`, else fit in memory."""
+    expected = role_index_version(roles)
+    if os.path.exists(path):
+        try:
+            index = RoleIndex.load(path)
+            if index.version == expected:
+                return index
+            log.warning("Role index at %s is stale (%s != %s); refitting", path, index.version, expected)
+        except Exception as e:
+            log.warning("Could not load role index from %s: %s", path, e)
+    return RoleIndex.build(roles)
+
+
+def main():
+    from utils.nlp_utils import JOB_ROLES
+
+    parser = argparse.ArgumentParser(description="Build or inspect the job-role TF-IDF index.")
+    parser.add_argument("--rebuild", action="store_true", help="refit and write the artifact")
+    parser.add_argument("--path", default=ROLE_INDEX_PATH)
+    args = parser.parse_args()
+
+    if args.rebuild:
+        index = RoleIndex.build(JOB_ROLES)
+        index.save(args.path)
+        print(f"Wrote role index {index.version} ({len(index.roles)} roles) to {args.path}")
+        return
+
+    expected = role_index_version(JOB_ROLES)
+    if not os.path.exists(args.path):
+        print(f"No artifact at {args.path}; expected version {expected}")
+        return
+    index = RoleIndex.load(args.path)
+    status = "current" if index.version == expected else f"stale (expected {expected})"
+    print(f"Role index {index.version} at {args.path}: {len(index.roles)} roles, {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Per-section feature cache and per-resume section records.
+
+`section_features` maps a section's content hash (plus the pipeline and role
+index versions) to its extracted features, so a re-uploaded resume only pays
+for the sections that changed. Worker processes share the SQLite file; each
+keeps a small in-memory LRU in front of it.
+
+`resume_sections` remembers, per analysed resume, its section hashes, ATS
+score, sub-scores and skills, so a later upload can be diffed against it
+(`previous_id`).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SECTION_DB = os.getenv("SECTION_DB", os.path.join("data", "sections.sqlite3"))
+SECTION_CACHE = os.getenv("SECTION_CACHE", "1") == "1"
+SECTION_MEMORY_ENTRIES = int(os.getenv("SECTION_MEMORY_ENTRIES", "4096"))
+# Oldest cached section features beyond this many rows are pruned
+SECTION_DB_MAX_ROWS = int(os.getenv("SECTION_DB_MAX_ROWS", "200000"))
+_PRUNE_EVERY = 1000
+
+
+class SectionStore:
+    def __init__(self, db_path: str = SECTION_DB, memory_entries: int = SECTION_MEMORY_ENTRIES,
+                 max_rows: int = SECTION_DB_MAX_ROWS):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS section_features ("
+            " key TEXT PRIMARY KEY, stored_at REAL NOT NULL, features TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS section_features_age ON section_features (stored_at)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resume_sections ("
+            " resume_id TEXT PRIMARY KEY, analysed_at REAL NOT NULL, ats_score INTEGER NOT NULL,"
+            " ats_features TEXT, skills TEXT, sections TEXT NOT NULL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+        self._writes = 0
+
+    # ------------------------------------------------------
+    # SECTION FEATURES
+    # ------------------------------------------------------
+    def get_features(self, keys) -> dict:
+        """{key: features} for the keys found in memory or on disk."""
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._memory.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                self._memory.move_to_end(key)
+                found[key] = value
+        if missing:
+            marks = ", ".join("?" for _ in missing)
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT key, features FROM section_features WHERE key IN ({marks})", missing
+                ).fetchall()
+            for key, features in rows:
+                found[key] = json.loads(features)
+                self._remember(key, found[key])
+        return found
+
+    def put_features(self, items: dict):
+        if not items:
+            return
+        for key, features in items.items():
+            self._remember(key, features)
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO section_features (key, stored_at, features) VALUES (?, ?, ?)",
+                [(key, now, json.dumps(features)) for key, features in items.items()],
+            )
+            self._writes += len(items)
+            if self._writes >= _PRUNE_EVERY:
+                self._writes = 0
+                self._db.execute(
+                    "DELETE FROM section_features WHERE key IN (SELECT key FROM section_features"
+                    " ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+            self._db.commit()
+
+    def _remember(self, key, features):
+        self._memory[key] = features
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------
+    # RESUME RECORDS (FOR previous_id DIFFS)
+    # ------------------------------------------------------
+    def record_resume(self, resume_id: str, result: dict):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resume_sections"
+                " (resume_id, analysed_at, ats_score, ats_features, skills, sections) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    resume_id,
+                    time.time(),
+                    result["ats_score"],
+                    json.dumps(result.get("ats_features")),
+                    json.dumps([s["skill"] for s in result.get("skills_proficiency", [])]),
+                    json.dumps(result.get("sections", [])),
+                ),
+            )
+            self._db.commit()
+
+    def get_resume(self, resume_id: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ats_score, ats_features, skills, sections FROM resume_sections WHERE resume_id = ?",
+                (resume_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "resume_id": resume_id,
+            "ats_score": row[0],
+            "ats_features": json.loads(row[1]) if row[1] else None,
+            "skills": json.loads(row[2]) if row[2] else [],
+            "sections": json.loads(row[3]),
+        }
+
+    def delete_resume(self, resume_id: str) -> bool:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM resume_sections WHERE resume_id = ?", (resume_id,))
+            self._db.commit()
+            return cur.rowcount > 0
+
+
+_worker_store = (None, None)  # (pid, SectionStore): never share a connection across fork
+
+
+def get_section_store():
+    """This process's SectionStore, or None when SECTION_CACHE is off."""
+    global _worker_store
+    if not SECTION_CACHE:
+        return None
+    pid, store = _worker_store
+    if pid != os.getpid():
+        store = SectionStore()
+        _worker_store = (os.getpid(), store)
+    return store
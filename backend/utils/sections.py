@@ -0,0 +1,129 @@
+"""
+Resume section segmentation and revision diffs.
+
+A heading is a short line (optionally followed by ':' and content) matching a
+known heading such as "Work Experience" or "Technical Skills". Lines before
+the first heading form the `contact` section. Every line belongs to exactly
+one section, so the sections' whitespace-normalised texts joined by single
+spaces reproduce AnalysedDocument.text - which lets per-section features be
+cached by content hash and merged back into a whole-document analysis.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+
+CONTACT = "contact"
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "personal statement"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"),
+    "projects": ("projects", "personal projects", "key projects", "academic projects", "selected projects"),
+    "education": ("education", "academic background", "qualifications", "academic qualifications",
+                  "education and training"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "technologies", "tools and technologies", "skills and tools"),
+    "certifications": ("certifications", "certificates", "licenses and certifications", "courses"),
+    "activities": ("leadership", "activities", "volunteering", "volunteer experience",
+                   "extracurricular activities"),
+    "awards": ("awards", "achievements", "honors", "honours", "awards and achievements", "publications"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+}
+
+HEADING_MAX_WORDS = 4
+
+_HEADINGS = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_CLEAN = re.compile(r"[^a-z ]+")
+
+
+@dataclass
+class Section:
+    name: str    # kind, with _2, _3 ... for repeated kinds
+    kind: str
+    text: str    # whitespace-normalised, heading included
+    digest: str  # content hash of `text`
+
+    def summary(self) -> dict:
+        return {"name": self.name, "hash": self.digest, "words": len(self.text.split())}
+
+
+def heading_kind(line: str):
+    """Section kind if `line` is (or starts with "<heading>:") a known heading, else None."""
+    head = line.split(":", 1)[0]
+    if len(head.split()) > HEADING_MAX_WORDS:
+        return None
+    key = " ".join(_HEADING_CLEAN.sub(" ", head.lower().replace("&", " and ")).split())
+    return _HEADINGS.get(key)
+
+
+def section_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def segment_sections(raw: str) -> list:
+    """Split extracted text into Sections, in document order."""
+    sections = []
+    seen = {}
+    kind = CONTACT
+    tokens = []
+
+    def close():
+        if not tokens:
+            return
+        seen[kind] = seen.get(kind, 0) + 1
+        name = kind if seen[kind] == 1 else f"{kind}_{seen[kind]}"
+        text = " ".join(tokens)
+        sections.append(Section(name, kind, text, section_digest(text)))
+
+    for line in (raw or "").splitlines():
+        words = line.split()
+        if not words:
+            continue
+        heading = heading_kind(line)
+        if heading is not None:
+            close()
+            kind = heading
+            tokens = []
+        tokens.extend(words)
+    close()
+    return sections
+
+
+def diff_analyses(previous: dict, current: dict) -> dict:
+    """
+    Compare two analyses' sections (by content hash, so moved sections count as
+    unchanged), ATS scores and skills.
+    """
+    before = {s["name"]: s["hash"] for s in previous["sections"]}
+    after = {s["name"]: s["hash"] for s in current["sections"]}
+    before_hashes = set(before.values())
+
+    unchanged = [name for name, digest in after.items() if digest in before_hashes]
+    changed = [name for name, digest in after.items() if name in before and digest not in before_hashes]
+    added = [name for name, digest in after.items() if name not in before and digest not in before_hashes]
+    after_hashes = set(after.values())
+    removed = [name for name, digest in before.items() if name not in after and digest not in after_hashes]
+
+    before_features = previous.get("ats_features") or {}
+    after_features = current.get("ats_features") or {}
+    before_skills = previous.get("skills") or []
+    after_skills = [s["skill"] for s in current.get("skills_proficiency", [])]
+
+    return {
+        "previous_id": previous["resume_id"],
+        "changed_sections": changed,
+        "added_sections": added,
+        "removed_sections": removed,
+        "unchanged_sections": unchanged,
+        "previous_score": previous["ats_score"],
+        "score_delta": current["ats_score"] - previous["ats_score"],
+        "sub_score_deltas": {
+            name: round(after_features[name] - before_features[name], 4)
+            for name in after_features if name in before_features
+        },
+        "skills_added": [s for s in after_skills if s not in before_skills],
+        "skills_removed": [s for s in before_skills if s not in after_skills],
+    }
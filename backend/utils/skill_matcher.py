@@ -0,0 +1,126 @@
+"""
+Single-pass multi-pattern skill matcher.
+
+Builds an Aho-Corasick automaton over every skill and alias once, then finds
+all occurrences in one linear scan of the lowercased text. Matches must sit on
+token boundaries, so "r" does not fire inside "regression" and "java" does not
+fire inside "javascript".
+"""
+
+from collections import deque
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """Compiled automaton over a skill taxonomy (canonical names + aliases)."""
+
+    def __init__(self, skills, aliases=None):
+        # pattern (lowercased) -> canonical skill name
+        patterns = {}
+        for skill in skills:
+            patterns[skill.lower()] = skill
+        for alias, canonical in (aliases or {}).items():
+            patterns.setdefault(alias.lower(), canonical)
+
+        self.skills = list(dict.fromkeys(skills))
+        self.patterns = patterns
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        # goto[state] = {char: next_state}; fail[state]; out[state] = [(len, canonical)]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for pattern, canonical in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), canonical))
+
+        # Breadth-first pass to wire failure links and merge suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find_all(self, text_l: str) -> list:
+        """
+        Return boundary-respecting, non-overlapping matches as
+        (start, end, canonical) tuples, leftmost-longest first.
+        `text_l` must already be lowercased.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        n = len(text_l)
+
+        candidates = []
+        state = 0
+        for i, ch in enumerate(text_l):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for length, canonical in out[state]:
+                start = end - length
+                # token boundaries: a word character may not touch either edge
+                if start > 0 and _is_word_char(text_l[start]) and _is_word_char(text_l[start - 1]):
+                    continue
+                if end < n and _is_word_char(text_l[end - 1]) and _is_word_char(text_l[end]):
+                    continue
+                candidates.append((start, end, canonical))
+
+        if not candidates:
+            return []
+
+        # Resolve overlaps (e.g. "node" inside alias "node.js"): leftmost, then longest
+        candidates.sort(key=lambda m: (m[0], -m[1]))
+        matches = []
+        last_end = -1
+        for start, end, canonical in candidates:
+            if start >= last_end:
+                matches.append((start, end, canonical))
+                last_end = end
+        return matches
+
+    def scan(self, text_l: str) -> dict:
+        """
+        Return {canonical: {"count": int, "first": int}} in one pass,
+        ordered as the skills were given (so ties sort the same way as before).
+        """
+        found = {}
+        for start, _end, canonical in self.find_all(text_l):
+            hit = found.get(canonical)
+            if hit is None:
+                found[canonical] = {"count": 1, "first": start}
+            else:
+                hit["count"] += 1
+        return self.in_taxonomy_order(found)
+
+    def in_taxonomy_order(self, hits: dict) -> dict:
+        """Reorder {canonical: ...} as the skills were given (e.g. after merging scans)."""
+        order = self._order
+        return {skill: hits[skill] for skill in sorted(hits, key=lambda k: order.get(k, len(order)))}
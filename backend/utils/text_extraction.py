@@ -1,70 +1,469 @@
-# backend/utils/text_extraction.py
 """
-Text extraction utilities for PDF and DOCX files
+Text extraction utilities for PDF, DOCX and TXT files
+
+The extractor is chosen from the content (utils.formats), not the filename,
+through a small registry that also holds each format's time budget.
+
+Every extractor accepts a filesystem path, raw bytes (bytes / bytearray /
+memoryview) or a binary file-like object (BytesIO, SpooledTemporaryFile,
+an UploadFile's `.file`), so uploads can be parsed straight from memory.
 """
 
+import io
+import logging
 import os
-import PyPDF2
-from docx import Document
+import time
+from concurrent.futures import BrokenExecutor, TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, replace
+from typing import Callable, Optional
+
+from utils.docx_stream import iter_docx_lines
+from utils.formats import DetectedFormat, UnsupportedFormatError, detect_format
+
+# PyPDF2 is imported on first use (worker warm-up does it ahead of traffic),
+# keeping it off the API's import path. DOCX is parsed with the stdlib only.
+
+log = logging.getLogger(__name__)
+
+
+@contextmanager
+def open_binary(source):
+    """Yield a seekable binary stream for a path, bytes-like or file-like source."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+
+# Default extraction budgets (every scored signal comes from the first pages)
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "30"))
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "200000"))
+EXTRACT_MAX_SECONDS = float(os.getenv("EXTRACT_MAX_SECONDS", "10"))
+# Per-format caps on the time budget
+EXTRACT_MAX_SECONDS_PDF = float(os.getenv("EXTRACT_MAX_SECONDS_PDF", str(EXTRACT_MAX_SECONDS)))
+EXTRACT_MAX_SECONDS_DOCX = float(os.getenv("EXTRACT_MAX_SECONDS_DOCX", "5"))
+EXTRACT_MAX_SECONDS_TXT = float(os.getenv("EXTRACT_MAX_SECONDS_TXT", "2"))
+
+# PDFs with at least this many pages to read are split across workers when an executor is given
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+# Smallest page range per worker task
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+
+
+@dataclass
+class ExtractionBudget:
+    """Limits for one extraction; None disables a limit."""
+    max_pages: Optional[int] = EXTRACT_MAX_PAGES
+    max_chars: Optional[int] = EXTRACT_MAX_CHARS
+    max_seconds: Optional[float] = EXTRACT_MAX_SECONDS
+
+
+UNLIMITED = ExtractionBudget(max_pages=None, max_chars=None, max_seconds=None)
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text plus how much of the document it covers and why it stopped."""
+    text: str
+    pages_processed: Optional[int] = None
+    pages_total: Optional[int] = None
+    chars: int = 0
+    stop_reason: str = "complete"   # complete | max_pages | max_chars | time_budget | caller | error
+    seconds: float = 0.0
+
+    @property
+    def truncated(self) -> bool:
+        return self.stop_reason not in ("complete", "error")
+
+    def summary(self) -> dict:
+        """JSON-ready report (without the text itself)."""
+        info = asdict(self)
+        del info["text"]
+        info["seconds"] = round(self.seconds, 4)
+        info["truncated"] = self.truncated
+        return info
+
+
+def iter_pdf_pages(source):
+    """
+    Yield (page_number, page_count, text) one page at a time, so callers can
+    stop as soon as they have enough. Pages that fail to extract yield "".
+    """
+    import PyPDF2
+
+    with open_binary(source) as file:
+        reader = PyPDF2.PdfReader(file)
+        pages = reader.pages
+        total = len(pages)
+        for number in range(total):
+            try:
+                page_text = pages[number].extract_text() or ""
+            except Exception:
+                # ignore page extraction problems
+                page_text = ""
+            yield number + 1, total, page_text
+
+
+def extract_pdf_with_budget(source, budget: ExtractionBudget = None, enough=None) -> ExtractionResult:
+    """
+    Stream PDF pages until the document ends or a budget is hit.
+    `enough(chars_so_far)` lets the caller stop once it has collected enough text.
+    Budgets are checked between pages; a single slow page is not interrupted.
+    """
+    budget = budget or ExtractionBudget()
+    started = time.perf_counter()
+    parts = []
+    chars = 0
+    pages_processed = 0
+    pages_total = None
+    stop_reason = "complete"
+
+    try:
+        for number, total, page_text in iter_pdf_pages(source):
+            pages_total = total
+            pages_processed = number
+            if page_text:
+                parts.append(page_text)
+                chars += len(page_text) + 1
+
+            if budget.max_chars is not None and chars >= budget.max_chars:
+                stop_reason = "max_chars"
+            elif budget.max_pages is not None and number >= budget.max_pages and number < total:
+                stop_reason = "max_pages"
+            elif budget.max_seconds is not None and time.perf_counter() - started >= budget.max_seconds \
+                    and number < total:
+                stop_reason = "time_budget"
+            elif enough is not None and number < total and enough(chars):
+                stop_reason = "caller"
+            if stop_reason != "complete":
+                break
+    except Exception as e:
+        log.warning("Error extracting PDF: %s", e)
+        stop_reason = "error"
+
+    text = "\n".join(parts).strip()
+    if budget.max_chars is not None and len(text) > budget.max_chars:
+        text = text[:budget.max_chars]
+    return ExtractionResult(
+        text=text,
+        pages_processed=pages_processed,
+        pages_total=pages_total,
+        chars=len(text),
+        stop_reason=stop_reason,
+        seconds=time.perf_counter() - started,
+    )
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_pdf(source) -> str:
     """Extract text from PDF file."""
+    return extract_pdf_with_budget(source, UNLIMITED).text
+
+
+# ------------------------------------------------------
+# PARALLEL PDF (PAGE RANGES ACROSS WORKER PROCESSES)
+# ------------------------------------------------------
+def pdf_page_count(source) -> int:
+    import PyPDF2
+
+    with open_binary(source) as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_pdf_pages(source, start: int, stop: int, deadline: float = None) -> list:
+    """
+    Text of pages [start, stop) (0-based), for one worker task. Stops early,
+    returning fewer pages, once the wall-clock `deadline` (time.time()) passes.
+    """
+    import PyPDF2
+
+    texts = []
+    with open_binary(source) as file:
+        pages = PyPDF2.PdfReader(file).pages
+        for number in range(start, min(stop, len(pages))):
+            if deadline is not None and time.time() >= deadline:
+                break
+            try:
+                texts.append(pages[number].extract_text() or "")
+            except Exception:
+                texts.append("")
+    return texts
+
+
+def extract_pdf_parallel(source, executor, budget: ExtractionBudget = None, enough=None,
+                         pages_total: int = None, tasks: int = None) -> ExtractionResult:
+    """
+    Split page extraction into about `tasks` ranges (default: one per
+    executor worker) of at least PDF_PAGES_PER_TASK pages on `executor` and
+    merge the results in page order. Every range re-opens the PDF, so ranges
+    are kept few. Budgets apply as in the sequential path; ranges still
+    running when a budget stops the merge are cancelled or ignored.
+    `source` must be a path or bytes (it is sent to the workers).
+    """
+    budget = budget or ExtractionBudget()
+    started = time.perf_counter()
+    if not isinstance(source, (str, os.PathLike, bytes)):
+        with open_binary(source) as file:
+            source = file.read()
+    if pages_total is None:
+        pages_total = pdf_page_count(source)
+    last = pages_total if budget.max_pages is None else min(pages_total, budget.max_pages)
+    deadline = None if budget.max_seconds is None else time.time() + budget.max_seconds
+    # More ranges than workers only re-parse the PDF more often
+    tasks = tasks or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+    per_task = max(PDF_PAGES_PER_TASK, -(-last // tasks))
+
+    futures = [
+        (start, min(start + per_task, last),
+         executor.submit(extract_pdf_pages, source, start, min(start + per_task, last), deadline))
+        for start in range(0, last, per_task)
+    ]
+    parts = []
+    chars = 0
+    pages_processed = 0
+    stop_reason = "complete" if last == pages_total else "max_pages"
     try:
-        text_parts = []
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-                except Exception:
-                    # ignore page extraction problems
-                    continue
-        return "\n".join(text_parts).strip()
+        for start, stop, future in futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                texts = future.result(timeout=timeout)
+            except FuturesTimeout:
+                stop_reason = "time_budget"
+                break
+            pages_processed += len(texts)
+            for page_text in texts:
+                if page_text:
+                    parts.append(page_text)
+                    chars += len(page_text) + 1
+            if len(texts) < stop - start:
+                stop_reason = "time_budget"
+            elif budget.max_chars is not None and chars >= budget.max_chars:
+                stop_reason = "max_chars"
+            elif enough is not None and stop < pages_total and enough(chars):
+                stop_reason = "caller"
+            if stop_reason not in ("complete", "max_pages"):
+                break
+    except BrokenExecutor:
+        raise  # a dead worker is the caller's problem (retry / reset the pool), not an empty PDF
     except Exception as e:
-        print(f"❌ Error extracting PDF: {e}")
-        return ""
+        log.warning("Error extracting PDF: %s", e)
+        stop_reason = "error"
+    finally:
+        for _, _, future in futures:
+            future.cancel()
 
+    text = "\n".join(parts).strip()
+    if budget.max_chars is not None and len(text) > budget.max_chars:
+        text = text[:budget.max_chars]
+    return ExtractionResult(
+        text=text,
+        pages_processed=pages_processed,
+        pages_total=pages_total,
+        chars=len(text),
+        stop_reason=stop_reason,
+        seconds=time.perf_counter() - started,
+    )
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file."""
+
+# ------------------------------------------------------
+# DOCX & TXT
+# ------------------------------------------------------
+def extract_docx_with_budget(source, budget: ExtractionBudget = None, enough=None) -> ExtractionResult:
+    """
+    Stream DOCX lines (headers, body incl. tables and text boxes, footers)
+    until the document ends or a budget is hit.
+    """
+    budget = budget or ExtractionBudget()
+    started = time.perf_counter()
+    lines = []
+    chars = 0
+    stop_reason = "complete"
     try:
-        doc = Document(file_path)
-        text = []
-        for para in doc.paragraphs:
-            if para.text:
-                text.append(para.text)
-        return "\n".join(text).strip()
+        with open_binary(source) as file:
+            for line in iter_docx_lines(file):
+                lines.append(line)
+                chars += len(line) + 1
+                if budget.max_chars is not None and chars > budget.max_chars:
+                    stop_reason = "max_chars"
+                elif budget.max_seconds is not None and time.perf_counter() - started >= budget.max_seconds:
+                    stop_reason = "time_budget"
+                elif enough is not None and enough(chars):
+                    stop_reason = "caller"
+                if stop_reason != "complete":
+                    break
     except Exception as e:
-        print(f"❌ Error extracting DOCX: {e}")
-        return ""
+        log.warning("Error extracting DOCX: %s", e)
+        lines, stop_reason = [], "error"
+    text = "\n".join(lines).strip()
+    if budget.max_chars is not None:
+        text = text[:budget.max_chars]
+    return ExtractionResult(
+        text=text,
+        chars=len(text),
+        stop_reason=stop_reason,
+        seconds=time.perf_counter() - started,
+    )
 
 
-def extract_text_from_txt(file_path: str) -> str:
-    """Extract text from TXT file."""
+def extract_text_from_docx(source) -> str:
+    """Extract text from DOCX file."""
+    return extract_docx_with_budget(source, UNLIMITED).text
+
+
+def extract_txt_with_budget(source, budget: ExtractionBudget = None, encoding: str = "utf-8") -> ExtractionResult:
+    """
+    Decode a text file; with `budget.max_chars` set only the bytes that can
+    hold that many characters are read. Undecodable bytes become U+FFFD.
+    """
+    budget = budget or ExtractionBudget()
+    started = time.perf_counter()
+    stop_reason = "complete"
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        with open_binary(source) as file:
+            # 4 bytes per character covers every supported encoding (+ BOM)
+            data = file.read() if budget.max_chars is None else file.read(budget.max_chars * 4 + 4)
+        text = data.decode(encoding, errors="replace")
+        if budget.max_chars is not None and len(text) > budget.max_chars:
+            text = text[:budget.max_chars]
+            stop_reason = "max_chars"
     except Exception as e:
-        print(f"❌ Error extracting TXT: {e}")
-        return ""
+        log.warning("Error extracting TXT: %s", e)
+        text, stop_reason = "", "error"
+    return ExtractionResult(
+        text=text,
+        chars=len(text),
+        stop_reason=stop_reason,
+        seconds=time.perf_counter() - started,
+    )
+
 
+def extract_text_from_txt(source) -> str:
+    """Extract text from TXT file."""
+    return extract_txt_with_budget(source, UNLIMITED).text
 
-def extract_text_from_file(file_path: str, filename: str) -> str:
+
+# ------------------------------------------------------
+# EXTRACTOR REGISTRY
+# ------------------------------------------------------
+@dataclass
+class Extractor:
     """
-    Extract text from file based on extension.
-    Supports: PDF, DOCX, TXT
+    `extract(source, budget, enough, detected) -> ExtractionResult`; paged
+    formats may add `count_pages(source)` and
+    `extract_parallel(source, executor, budget, enough, pages_total)`.
+    `max_seconds` caps the caller's time budget for this format.
+    """
+    name: str
+    extract: Callable
+    max_seconds: Optional[float] = None
+    count_pages: Optional[Callable] = None
+    extract_parallel: Optional[Callable] = None
+
+    def budget_for(self, budget: ExtractionBudget) -> ExtractionBudget:
+        if self.max_seconds is None:
+            return budget
+        if budget.max_seconds is None or budget.max_seconds > self.max_seconds:
+            return replace(budget, max_seconds=self.max_seconds)
+        return budget
+
+
+EXTRACTORS = {}
+
+
+def register_extractor(name: str, extract, max_seconds: float = None, count_pages=None, extract_parallel=None):
+    """Add or replace the extractor used for content detected as `name` (see utils.formats)."""
+    EXTRACTORS[name] = Extractor(name, extract, max_seconds, count_pages, extract_parallel)
+
+
+def resolve_extractor(source, filename: str):
+    """(DetectedFormat, Extractor); raises UnsupportedFormatError without parsing."""
+    with open_binary(source) as file:
+        detected = detect_format(file, filename)
+    extractor = EXTRACTORS.get(detected.name)
+    if extractor is None:
+        raise UnsupportedFormatError(f"no extractor registered for {detected.name}")
+    return detected, extractor
+
+
+register_extractor(
+    "pdf",
+    lambda source, budget, enough, detected: extract_pdf_with_budget(source, budget, enough),
+    EXTRACT_MAX_SECONDS_PDF,
+    count_pages=pdf_page_count,
+    extract_parallel=extract_pdf_parallel,
+)
+register_extractor(
+    "docx",
+    lambda source, budget, enough, detected: extract_docx_with_budget(source, budget, enough),
+    EXTRACT_MAX_SECONDS_DOCX,
+)
+register_extractor(
+    "text",
+    lambda source, budget, enough, detected: extract_txt_with_budget(source, budget, detected.encoding),
+    EXTRACT_MAX_SECONDS_TXT,
+)
+
+
+@dataclass
+class ExtractionPlan:
+    format: DetectedFormat
+    pages_total: Optional[int] = None
+    parallel: bool = False
+
+
+def plan_extraction(source, filename: str, budget: ExtractionBudget = None) -> ExtractionPlan:
     """
-    file_ext = os.path.splitext(filename)[1].lower()
+    Detect the format (raises UnsupportedFormatError without parsing) and, for
+    PDFs, count pages to decide whether page ranges should run in parallel.
+    """
+    budget = budget or ExtractionBudget()
+    detected, extractor = resolve_extractor(source, filename)
+    plan = ExtractionPlan(detected)
+    if extractor.count_pages is not None and extractor.extract_parallel is not None:
+        try:
+            plan.pages_total = extractor.count_pages(source)
+        except Exception:
+            return plan  # let the sequential extractor report the damage
+        pages = plan.pages_total if budget.max_pages is None else min(plan.pages_total, budget.max_pages)
+        plan.parallel = pages >= PDF_PARALLEL_MIN_PAGES
+    return plan
+
 
-    if file_ext == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif file_ext in ['.docx', '.doc']:
-        return extract_text_from_docx(file_path)
-    elif file_ext == '.txt':
-        return extract_text_from_txt(file_path)
+def extract_document(source, filename: str, budget: ExtractionBudget = None, enough=None,
+                     executor=None, plan: ExtractionPlan = None) -> ExtractionResult:
+    """
+    Budgeted extraction with the extractor matching the content (not the
+    extension): PDFs are streamed page by page and DOCX line by line, both may
+    stop early; TXT is decoded up to `budget.max_chars`. Each format's time
+    budget is capped by its registry entry. With an `executor`, large PDFs are
+    split into page ranges across it. A `plan` from plan_extraction skips
+    sniffing the format (and counting pages) again. Raises UnsupportedFormatError.
+    """
+    if plan is not None:
+        detected = plan.format
+        extractor = EXTRACTORS[detected.name]
     else:
-        # try pdf fallback
-        return extract_text_from_pdf(file_path)
+        detected, extractor = resolve_extractor(source, filename)
+    budget = extractor.budget_for(budget or ExtractionBudget())
+    if executor is not None and extractor.extract_parallel is not None:
+        pages_total = plan.pages_total if plan is not None else None
+        return extractor.extract_parallel(source, executor, budget, enough, pages_total)
+    return extractor.extract(source, budget, enough, detected)
+
+
+def extract_text_from_file(source, filename: str) -> str:
+    """
+    Extract text from file based on its content.
+    Supports: PDF, DOCX, TXT
+    `source` may be a path (offline use) or in-memory upload content.
+    """
+    try:
+        detected, extractor = resolve_extractor(source, filename)
+        return extractor.extract(source, UNLIMITED, None, detected).text
+    except UnsupportedFormatError as e:
+        log.warning("Unsupported file %s: %s", filename, e)
+        return ""
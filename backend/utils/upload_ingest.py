@@ -0,0 +1,205 @@
+"""
+Upload ingestion without temp-file churn.
+
+Uploads are read in chunks and hashed as they stream in. Anything up to
+UPLOAD_SPOOL_MAX_BYTES stays in memory and is handed to the extractors as
+bytes; only larger uploads spill to a file in UPLOAD_DIR, which is always
+removed when the request finishes.
+
+UploadSizeLimit caps request bodies while they stream in, before the
+multipart parser has spooled an oversized file anywhere.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
+# Spill directory for oversized uploads
+UPLOAD_DIR = "uploaded_files"
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Request body limits (multipart framing included)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# POST /jobs streams straight to disk and exists for large documents
+MAX_JOB_UPLOAD_BYTES = int(os.getenv("MAX_JOB_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+
+class IngestedUpload:
+    """Upload content held either in memory (`data`) or in a spill file (`path`)."""
+
+    def __init__(self, filename: str):
+        self.filename = filename or ""
+        self.sha256 = None
+        self.size = 0
+        self.data = None
+        self.path = None
+
+    @property
+    def source(self):
+        """What to pass to `extract_text_from_file`: bytes or a path."""
+        return self.path if self.path is not None else self.data
+
+    def cleanup(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self.data = None
+
+
+async def _read_upload(upload, spool_max: int) -> IngestedUpload:
+    ingested = IngestedUpload(upload.filename)
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    spill = None
+
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            ingested.size += len(chunk)
+
+            if spill is None and ingested.size > spool_max:
+                os.makedirs(UPLOAD_DIR, exist_ok=True)
+                spill = tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, prefix="upload_", delete=False)
+                ingested.path = spill.name
+                await asyncio.to_thread(spill.write, bytes(buffer))
+                buffer = None
+
+            if spill is None:
+                buffer.extend(chunk)
+            else:
+                await asyncio.to_thread(spill.write, chunk)
+    except BaseException:
+        if spill is not None:
+            spill.close()
+        ingested.cleanup()
+        raise
+
+    if spill is not None:
+        spill.close()
+    else:
+        ingested.data = bytes(buffer)
+    ingested.sha256 = digest.hexdigest()
+    return ingested
+
+
+@asynccontextmanager
+async def ingest_upload(upload, spool_max: int = UPLOAD_SPOOL_MAX_BYTES):
+    """
+    Read an UploadFile into an IngestedUpload; any spill file is deleted on exit,
+    whether or not the analysis succeeded.
+    """
+    ingested = await _read_upload(upload, spool_max)
+    try:
+        yield ingested
+    finally:
+        ingested.cleanup()
+
+
+async def store_upload(upload, path: str):
+    """
+    Stream an UploadFile to `path` for later processing (e.g. a queued job).
+    Written to a temporary name first so a crash never leaves a partial file.
+    Returns (sha256, size).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    partial = path + ".part"
+    try:
+        with open(partial, "wb") as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(out.write, chunk)
+        os.replace(partial, path)
+    except BaseException:
+        try:
+            os.remove(partial)
+        except FileNotFoundError:
+            pass
+        raise
+    return digest.hexdigest(), size
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware answering 413 for request bodies over the limit for their
+    path (`limits`, else `default`). A declared Content-Length is refused
+    before any of the body is read; otherwise bytes are counted as they
+    arrive and, once the limit is passed, the app sees a client disconnect
+    and whatever response it produces for that is replaced by the 413.
+    """
+
+    def __init__(self, app, default: int = MAX_UPLOAD_BYTES, limits: dict = None):
+        self.app = app
+        self.default = default
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+        limit = self.limits.get(scope["path"], self.default)
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded and not started:
+                return  # the 413 goes out instead
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not (exceeded and not started):
+                raise
+        if exceeded and not started:
+            await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int):
+        body = json.dumps({"detail": f"Upload exceeds {limit} bytes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,82 @@
+"""
+Process pool for CPU-bound resume analysis.
+
+Workers are pre-initialised (PyPDF2, scikit-learn and the role
+index are loaded once per process) so the event loop only awaits results.
+A small in-flight limiter lets the API shed load with 503 + Retry-After
+instead of queueing without bound.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0")) or (os.cpu_count() or 1)
+ANALYSIS_MAX_IN_FLIGHT = int(os.getenv("ANALYSIS_MAX_IN_FLIGHT", "0")) or ANALYSIS_WORKERS * 4
+ANALYSIS_RETRY_AFTER = int(os.getenv("ANALYSIS_RETRY_AFTER", "2"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Import heavy dependencies and build shared indexes once per worker process."""
+    import PyPDF2  # noqa: F401
+    from utils.nlp_utils import get_role_index, get_job_catalog, SKILL_MATCHER  # noqa: F401
+
+    get_role_index()
+    get_job_catalog()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Create the shared pool on first use (safe to call from several threads)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, initializer=_init_worker)
+        return _pool
+
+
+def warm_process_pool(timeout: float = 60.0):
+    """Start every worker now (running the initializer) rather than on the first request."""
+    pool = get_process_pool()
+    wait([pool.submit(_ping) for _ in range(ANALYSIS_WORKERS)], timeout=timeout)
+
+
+def reset_process_pool():
+    """Drop a broken pool (e.g. a worker was killed) so the next call starts fresh."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class InFlightLimiter:
+    """
+    Non-blocking admission counter for the event loop thread.
+    `try_acquire` fails immediately once `limit` requests are in flight.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)